@@ -0,0 +1,204 @@
+"""
+Learning Activity Ingestion
+Streams LMS activity events into `learning_activities`:
+- JSONL or CSV input, read incrementally
+- Idempotent: each event maps to a deterministic row id, duplicates are ignored;
+  events without a key are identified by their file and line
+- `employee_id` validated against a cached id set
+- Batched inserts through `EmployeeDashboardDB.add_learning_activities`, one
+  transaction per batch (group-committed when write-behind is enabled)
+- Sustained rows-per-second reporting
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from employee_data_manager import EmployeeDashboardDB
+
+# Namespace for turning idempotency keys into learning_activities ids
+ACTIVITY_NAMESPACE = uuid.UUID('5b0f7c1e-3d5a-4f0e-9a57-2f1c8e6d4b21')
+
+class ActivityIngestor:
+    def __init__(self, db: EmployeeDashboardDB, batch_size: int = 5000, id_refresh_interval: float = 30.0):
+        self.db = db
+        self.batch_size = batch_size
+        self.id_refresh_interval = id_refresh_interval
+        self._employee_ids = set()
+        self._ids_loaded_at = None
+
+    def refresh_employee_ids(self):
+        """Reload the set of valid employee ids"""
+        conn = self.db._read_connection()
+        self._employee_ids = {row[0] for row in conn.execute('SELECT id FROM employees')}
+        conn.close()
+        self._ids_loaded_at = time.monotonic()
+
+    def ingest(self, events: Iterable[Dict]) -> Dict:
+        """Insert activity events and return throughput and outcome counts.
+
+        Every event needs an `idempotency_key` or `event_id`; two real
+        sessions can look identical otherwise.
+        """
+        return self._ingest(((None, event) for event in events), None)
+
+    def _ingest(self, events: Iterable[Tuple[Optional[int], Dict]], source: Optional[str]) -> Dict:
+        if self._ids_loaded_at is None:
+            self.refresh_employee_ids()
+
+        stats = {'received': 0, 'inserted': 0, 'duplicates': 0, 'rejected': 0, 'batches': 0, 'errors': []}
+        started = time.perf_counter()
+
+        batch = []
+        for line, event in events:
+            stats['received'] += 1
+            row, error = self._to_row(event, source, line)
+            if error:
+                stats['rejected'] += 1
+                if len(stats['errors']) < 20:
+                    stats['errors'].append({'event': stats['received'], 'error': error})
+                continue
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self._flush(batch, stats)
+                batch = []
+        if batch:
+            self._flush(batch, stats)
+
+        elapsed = time.perf_counter() - started
+        stats['seconds'] = round(elapsed, 3)
+        stats['rows_per_second'] = round(stats['received'] / elapsed) if elapsed > 0 else 0
+        stats['inserted_per_second'] = round(stats['inserted'] / elapsed) if elapsed > 0 else 0
+        return stats
+
+    def ingest_file(self, path: str, file_format: str = None) -> Dict:
+        """Ingest a JSONL or CSV file ('-' reads stdin).
+
+        Events without an `idempotency_key` or `event_id` are keyed by the
+        file's absolute path and their line number, so re-ingesting the same
+        file skips them while identical sessions on other lines are kept.
+        """
+        if file_format is None:
+            file_format = 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+        handle = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+        source = 'stdin' if path == '-' else os.path.abspath(path)
+        try:
+            events = _numbered_csv(handle) if file_format == 'csv' else _numbered_jsonl(handle)
+            return self._ingest(events, source)
+        finally:
+            if handle is not sys.stdin:
+                handle.close()
+
+    def _flush(self, batch: List[Tuple], stats: Dict):
+        inserted = self.db.add_learning_activities(batch)
+        stats['batches'] += 1
+        stats['inserted'] += inserted
+        stats['duplicates'] += len(batch) - inserted
+
+    def _to_row(self, event: Dict, source: str = None, line: int = None) -> Tuple[Optional[Tuple], Optional[str]]:
+        employee_id = event.get('employee_id')
+        activity_type = event.get('activity_type')
+        activity_name = event.get('activity_name')
+        if not employee_id or not activity_type or not activity_name:
+            return None, "employee_id, activity_type and activity_name are required"
+
+        if not self._is_known_employee(employee_id):
+            return None, f"Unknown employee_id: {employee_id}"
+
+        activity_date = _parse_date(event.get('date'))
+        if activity_date is None:
+            return None, f"Invalid date: {event.get('date')!r}"
+
+        try:
+            hours_spent = float(event.get('hours_spent') or 0)
+        except (TypeError, ValueError):
+            return None, f"Invalid hours_spent: {event.get('hours_spent')!r}"
+        if hours_spent < 0:
+            return None, "hours_spent must not be negative"
+
+        key = event.get('idempotency_key') or event.get('event_id')
+        if not key:
+            if line is None:
+                return None, "idempotency_key or event_id is required"
+            # Identical sessions on the same day are distinct events
+            key = f"{source}:{line}|{employee_id}|{activity_type}|{activity_name}|{activity_date}|{hours_spent}"
+        row_id = str(uuid.uuid5(ACTIVITY_NAMESPACE, str(key)))
+
+        return (row_id, employee_id, activity_type, activity_name, hours_spent, activity_date,
+                event.get('notes') or None), None
+
+    def _is_known_employee(self, employee_id: str) -> bool:
+        if employee_id in self._employee_ids:
+            return True
+        # New hires show up between refreshes; re-read at most once per interval
+        if time.monotonic() - self._ids_loaded_at >= self.id_refresh_interval:
+            self.refresh_employee_ids()
+            return employee_id in self._employee_ids
+        return False
+
+def _parse_date(value) -> Optional[str]:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()[:10]
+    if not value:
+        return None
+    try:
+        # Accepts dates as well as full ISO timestamps
+        return datetime.fromisoformat(str(value).strip().replace('Z', '+00:00')).date().isoformat()
+    except ValueError:
+        return None
+
+def read_jsonl(handle) -> Iterator[Dict]:
+    """Yield one event per non-blank JSON line (invalid lines yield {})"""
+    for _, event in _numbered_jsonl(handle):
+        yield event
+
+def read_csv(handle) -> Iterator[Dict]:
+    """Yield one event per CSV row, using the header row as field names"""
+    for _, event in _numbered_csv(handle):
+        yield event
+
+def _numbered_jsonl(handle) -> Iterator[Tuple[int, Dict]]:
+    for number, line in enumerate(handle, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            event = {}
+        yield number, event if isinstance(event, dict) else {}
+
+def _numbered_csv(handle) -> Iterator[Tuple[int, Dict]]:
+    # line_num is the physical line the row ended on (quoted fields can span lines)
+    reader = csv.DictReader(handle)
+    for event in reader:
+        yield reader.line_num, event
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Ingest LMS learning activity events")
+    parser.add_argument('path', help="JSONL or CSV file, or '-' for stdin")
+    parser.add_argument('--db', default="employee_dashboard.db", help="SQLite database path")
+    parser.add_argument('--format', choices=['jsonl', 'csv'], help="Input format (default: from extension)")
+    parser.add_argument('--batch-size', type=int, default=5000, help="Rows per transaction")
+    args = parser.parse_args(argv)
+
+    ingestor = ActivityIngestor(EmployeeDashboardDB(args.db), batch_size=args.batch_size)
+    stats = ingestor.ingest_file(args.path, args.format)
+
+    print(f"[v0] Received {stats['received']} events in {stats['seconds']}s "
+          f"({stats['rows_per_second']} rows/s)")
+    print(f"[v0] Inserted {stats['inserted']}, duplicates {stats['duplicates']}, "
+          f"rejected {stats['rejected']} in {stats['batches']} batches")
+    for error in stats['errors']:
+        print(f"[v0]   event {error['event']}: {error['error']}")
+    return 0 if stats['rejected'] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
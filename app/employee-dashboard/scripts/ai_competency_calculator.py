@@ -7,16 +7,65 @@ Calculates employee competency scores using various factors:
 - Industry benchmarks and trends
 """
 
+import argparse
+import csv
+import os
 import sqlite3
 import json
 import math
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Export columns; NDJSON rows also carry the recommendations
+EXPORT_FIELDS = ['employee_id', 'name', 'department', 'overall_score', 'performance_level',
+                 'skill_proficiency', 'certifications', 'learning_velocity', 'practical_application',
+                 'industry_relevance', 'peer_collaboration']
+
+# Demand multipliers for categories the `industry_demand` table does not cover
+DEFAULT_INDUSTRY_DEMAND = {
+    'AI/ML': 1.3,
+    'Cloud': 1.25,
+    'Programming': 1.1,
+    'Frontend': 1.05,
+    'Backend': 1.1,
+    'DevOps': 1.2,
+    'Design': 1.0,
+    'Management': 1.15,
+    'Leadership': 1.2
+}
+
+# Inputs of `calculate_competency_score`, grouped by the tables they are read
+# from. Each group is memoized per employee and recomputed only when the
+# version of one of its tables (see `table_versions`) has moved.
+FACTOR_GROUPS = {
+    'profile': ('employees',),                    # practical application, collaboration
+    'skills': ('employee_skills', 'skills'),      # skill proficiency, industry relevance
+    'certifications': ('certifications',),
+    'learning': ('learning_activities', 'course_enrollments'),
+}
+
+def _utc_today() -> str:
+    """Today's date in UTC, the one clock for every "today" in a score"""
+    return time.strftime('%Y-%m-%d', time.gmtime())
 
 class AICompetencyCalculator:
-    def __init__(self, db_path: str = "employee_dashboard.db"):
+    def __init__(self, db_path: str = "employee_dashboard.db", memo_size: int = 16384):
         self.db_path = db_path
         
+        # (employee id, factor group) -> (table versions, group inputs), LRU
+        self.memo_size = memo_size
+        self._memo = OrderedDict()
+        self._memo_lock = threading.Lock()
+        self._memo_stats = {group: {'hits': 0, 'misses': 0} for group in FACTOR_GROUPS}
+        
+        # Per-thread connection of `calculate_competency_score`; opening one
+        # (and parsing the schema) costs more than a fully memoized score
+        self._local = threading.local()
+        
         # Weights for different competency factors
         self.weights = {
             'skill_proficiency': 0.35,      # 35% - Current skill levels
@@ -27,106 +76,420 @@ class AICompetencyCalculator:
             'peer_collaboration': 0.05      # 5% - Teamwork and mentoring
         }
         
-        # Industry demand multipliers for different skill categories
-        self.industry_demand = {
-            'AI/ML': 1.3,
-            'Cloud': 1.25,
-            'Programming': 1.1,
-            'Frontend': 1.05,
-            'Backend': 1.1,
-            'DevOps': 1.2,
-            'Design': 1.0,
-            'Management': 1.15,
-            'Leadership': 1.2
+        # Industry demand multipliers per skill category: the values stored
+        # in `industry_demand` (see industry_demand.py) over the defaults
+        self.industry_demand = self.load_industry_demand()
+    
+    def load_industry_demand(self) -> Dict[str, float]:
+        """Read the demand multipliers, falling back to the defaults"""
+        demand = dict(DEFAULT_INDUSTRY_DEMAND)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            demand.update(conn.execute('SELECT category, multiplier FROM industry_demand').fetchall())
+        except sqlite3.OperationalError:
+            pass  # never computed for this database
+        finally:
+            conn.close()
+        return demand
+    
+    def reload_industry_demand(self) -> bool:
+        """Re-read the demand multipliers; returns whether any changed"""
+        demand = self.load_industry_demand()
+        changed = demand != self.industry_demand
+        self.industry_demand = demand
+        return changed
+    
+    def calculate_competency_score(self, employee_id: str, as_of=None) -> Optional[Dict]:
+        """Calculate comprehensive AI-powered competency score.
+        
+        With `as_of` (a date or 'YYYY-MM-DD') the score is evaluated against
+        the state on that day: the learning window ends on it, certifications
+        count if they were valid then, enrollments and completions after it
+        are ignored and experience is reduced by the time since. Skill levels
+        and positions keep no history, so their current values are used.
+        Returns None if the employee does not exist or had not been hired by
+        `as_of`.
+        
+        Current-state scores reuse the memoized inputs of every factor group
+        whose tables this employee has not written since (see
+        FACTOR_GROUPS), so after a new learning activity only learning
+        velocity is read again before the total is recomputed.
+        """
+        as_of = self._as_of_date(as_of)
+        today = _utc_today()
+        conn = self._connection()
+        versions = self._table_versions(conn, employee_id) if as_of is None else None
+        factors = {}
+        for group, tables in FACTOR_GROUPS.items():
+            key = None
+            if versions is not None:
+                key = tuple(versions.get((scope, table), 0) for table in tables for scope in ('', employee_id))
+                if group == 'learning':
+                    # The window is relative to today and rolls daily
+                    key += (today,)
+                inputs = self._memo_get(employee_id, group, key)
+                if inputs is not None:
+                    factors.update(inputs)
+                    continue
+            inputs = self._load_factor_group(conn, group, employee_id, as_of, today)
+            if inputs is None:
+                return None
+            if key is not None:
+                self._memo_put(employee_id, group, key, inputs)
+            factors.update(inputs)
+        
+        return self._build_result(employee_id, self.score_factors(factors))
+    
+    def memo_stats(self) -> Dict:
+        """Memo hits and misses per factor group"""
+        with self._memo_lock:
+            stats = {group: dict(counts) for group, counts in self._memo_stats.items()}
+            stats['entries'] = len(self._memo)
+        return stats
+    
+    def _connection(self) -> sqlite3.Connection:
+        # Only ever reads, so no transaction stays open between calls and
+        # every call sees the latest committed data
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.db_path)
+        return conn
+    
+    def _table_versions(self, conn: sqlite3.Connection, employee_id: str) -> Optional[Dict]:
+        """{(scope, table): version} for the employee and table-wide scopes"""
+        try:
+            rows = conn.execute('''
+                SELECT employee_id, table_name, version FROM table_versions WHERE employee_id IN ('', ?)
+            ''', (employee_id,)).fetchall()
+        except sqlite3.OperationalError:
+            return None  # no version counters: nothing can be memoized
+        return {(scope, table): version for scope, table, version in rows}
+    
+    def _memo_get(self, employee_id: str, group: str, key: Tuple) -> Optional[Dict]:
+        with self._memo_lock:
+            entry = self._memo.get((employee_id, group))
+            if entry is not None and entry[0] == key:
+                self._memo.move_to_end((employee_id, group))
+                self._memo_stats[group]['hits'] += 1
+                return entry[1]
+            self._memo_stats[group]['misses'] += 1
+            return None
+    
+    def _memo_put(self, employee_id: str, group: str, key: Tuple, inputs: Dict):
+        if self.memo_size <= 0:
+            return
+        with self._memo_lock:
+            self._memo[(employee_id, group)] = (key, inputs)
+            self._memo.move_to_end((employee_id, group))
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+    
+    def _load_factor_group(self, conn: sqlite3.Connection, group: str, employee_id: str,
+                           as_of: str = None, today: str = None) -> Optional[Dict]:
+        """One employee's factor-matrix inputs for a factor group (see `load_factor_matrix`)"""
+        today = today or _utc_today()
+        if group == 'profile':
+            return self._load_profile_inputs(conn, employee_id, as_of, today)
+        if group == 'skills':
+            return {'skill_categories': self._load_skill_categories(conn, employee_id)}
+        if group == 'certifications':
+            return {'certifications': self._calculate_certification_score(conn, employee_id, as_of)}
+        return {'learning_velocity': self._calculate_learning_velocity(conn, employee_id, as_of, today)}
+    
+    def calculate_all_scores(self, employee_ids: List[str] = None, as_of=None) -> Dict[str, Dict]:
+        """Calculate competency scores for many employees with set-based queries.
+        
+        See `calculate_competency_score` for `as_of`; employees hired after it
+        are left out.
+        """
+        factor_matrix = self.load_factor_matrix(employee_ids, as_of)
+        return {
+            employee_id: self._build_result(employee_id, self.score_factors(factors))
+            for employee_id, factors in factor_matrix.items()
         }
     
-    def calculate_competency_score(self, employee_id: str) -> Dict:
-        """Calculate comprehensive AI-powered competency score"""
+    def iter_scores(self, department: str = None, employee_ids: List[str] = None, after_id: str = None,
+                    as_of=None, chunk_size: int = 500) -> Iterator[Tuple[str, str, Dict]]:
+        """Yield (employee_id, name, result) for every matching employee, in id order.
+        
+        Employees are read with `fetchmany` and scored one chunk at a time, so
+        memory use does not grow with the number of employees. `after_id`
+        resumes after the last id of an earlier run.
+        """
+        conditions = []
+        params = []
+        if department:
+            conditions.append('department = ?')
+            params.append(department)
+        if employee_ids is not None:
+            conditions.append(f"id IN ({', '.join('?' * len(employee_ids))})")
+            params.extend(employee_ids)
+        if after_id is not None:
+            conditions.append('id > ?')
+            params.append(after_id)
+        
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT id, name
+            FROM employees
+            {'WHERE ' + ' AND '.join(conditions) if conditions else ''}
+            ORDER BY id
+        ''', params)
+        try:
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                names = dict(rows)
+                matrix = self.load_factor_matrix(list(names), as_of)
+                for employee_id, name in rows:
+                    factors = matrix.get(employee_id)
+                    if factors is not None:  # not hired yet as of `as_of`
+                        result = self._build_result(employee_id, self.score_factors(factors))
+                        result['department'] = factors['department']
+                        yield employee_id, name, result
+        finally:
+            conn.close()
+    
+    def load_factor_matrix(self, employee_ids: List[str] = None, as_of=None) -> Dict[str, Dict]:
+        """Load every employee's factor inputs in a handful of grouped queries.
+        
+        Skill proficiency and industry relevance depend on the demand table, so
+        they are kept as per-category (level_sum, skill_count) pairs; the other
+        four factors do not depend on weights or demand and are stored as final
+        factor scores. Use `score_factors` to turn an entry into a breakdown.
+        
+        With `as_of`, every date-dependent input is evaluated on that day (see
+        `calculate_competency_score`) through date-range index scans.
+        """
+        as_of = self._as_of_date(as_of)
+        today = _utc_today()
+        hired = 'hire_date <= ?' if as_of is not None else '1=1'
+        hired_params = [as_of] if as_of is not None else []
+        expiring, expiring_params, valid, valid_params = self._certification_conditions(as_of)
+        window, window_params = self._learning_window(as_of, today)
+        enrollment_columns, enrollment_params, enrolled, enrolled_params = self._enrollment_conditions(as_of)
+        
         conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
         
-        # Get all competency factors
-        skill_score = self._calculate_skill_proficiency(conn, employee_id)
-        cert_score = self._calculate_certification_score(conn, employee_id)
-        learning_score = self._calculate_learning_velocity(conn, employee_id)
-        application_score = self._calculate_practical_application(conn, employee_id)
-        relevance_score = self._calculate_industry_relevance(conn, employee_id)
-        collaboration_score = self._calculate_peer_collaboration(conn, employee_id)
-        
-        # Calculate weighted total
-        total_score = (
-            skill_score * self.weights['skill_proficiency'] +
-            cert_score * self.weights['certifications'] +
-            learning_score * self.weights['learning_velocity'] +
-            application_score * self.weights['practical_application'] +
-            relevance_score * self.weights['industry_relevance'] +
-            collaboration_score * self.weights['peer_collaboration']
-        )
+        matrix = {}
+        for chunk in self._id_chunks(employee_ids):
+            condition, params = self._employee_filter('id', chunk)
+            cursor.execute(f'''
+                SELECT id, department, position, years_experience
+                FROM employees
+                WHERE {hired}{condition}
+            ''', hired_params + params)
+            chunk_ids = []
+            for employee_id, department, position, years_exp in cursor.fetchall():
+                chunk_ids.append(employee_id)
+                matrix[employee_id] = {
+                    'department': department,
+                    'skill_categories': {},
+                    'certifications': 0,
+                    'learning_velocity': 0,
+                    'practical_application': self._practical_application_from_experience(
+                        self._years_experience_as_of(years_exp, as_of, today)),
+                    'peer_collaboration': self._collaboration_from_position(position)
+                }
+            
+            condition, params = self._employee_filter('es.employee_id', chunk)
+            cursor.execute(f'''
+                SELECT es.employee_id, s.category, SUM(es.current_level), COUNT(*)
+                FROM employee_skills es
+                JOIN skills s ON es.skill_id = s.id
+                WHERE 1=1{condition}
+                GROUP BY es.employee_id, s.category
+            ''', params)
+            for employee_id, category, level_sum, skill_count in cursor.fetchall():
+                if employee_id in matrix:
+                    matrix[employee_id]['skill_categories'][category] = (level_sum, skill_count)
+            
+            condition, params = self._employee_filter('employee_id', chunk)
+            cursor.execute(f'''
+                SELECT employee_id, COUNT(*), {expiring}
+                FROM certifications
+                WHERE {valid}{condition}
+                GROUP BY employee_id
+            ''', expiring_params + valid_params + params)
+            for employee_id, active_certs, expiring_certs in cursor.fetchall():
+                if employee_id in matrix:
+                    matrix[employee_id]['certifications'] = self._certification_score_from_counts(
+                        active_certs, expiring_certs)
+            
+            cursor.execute(f'''
+                SELECT employee_id, SUM(hours_spent)
+                FROM learning_activities
+                WHERE {window}{condition}
+                GROUP BY employee_id
+            ''', window_params + params)
+            recent_hours = dict(cursor.fetchall())
+            
+            cursor.execute(f'''
+                SELECT employee_id, {enrollment_columns}
+                FROM course_enrollments
+                WHERE {enrolled}{condition}
+                GROUP BY employee_id
+            ''', enrollment_params + enrolled_params + params)
+            enrollments = {row[0]: row[1:] for row in cursor.fetchall()}
+            
+            for employee_id in chunk_ids:
+                matrix[employee_id]['learning_velocity'] = self._learning_velocity_from_activity(
+                    recent_hours.get(employee_id) or 0, *enrollments.get(employee_id, (0, 0, None)))
         
         conn.close()
+        return matrix
+    
+    def score_factors(self, factors: Dict, industry_demand: Dict[str, float] = None) -> Dict[str, float]:
+        """Turn a factor-matrix entry into the six factor scores"""
+        demand = self.industry_demand if industry_demand is None else industry_demand
+        
+        weighted_sum = 0
+        demand_weight = 0
+        skill_count = 0
+        for category, (level_sum, count) in factors['skill_categories'].items():
+            multiplier = demand.get(category, 1.0)
+            weighted_sum += level_sum * multiplier
+            demand_weight += count * multiplier
+            skill_count += count
         
+        return {
+            'skill_proficiency': weighted_sum / demand_weight if demand_weight > 0 else 0,
+            'certifications': factors['certifications'],
+            'learning_velocity': factors['learning_velocity'],
+            'practical_application': factors['practical_application'],
+            'industry_relevance': weighted_sum / skill_count if skill_count > 0 else 0,
+            'peer_collaboration': factors['peer_collaboration']
+        }
+    
+    def weighted_total(self, scores: Dict[str, float], weights: Dict[str, float] = None) -> float:
+        """Combine factor scores into the (unclamped) weighted total"""
+        weights = self.weights if weights is None else weights
+        return sum(scores[factor] * weight for factor, weight in weights.items())
+    
+    def _build_result(self, employee_id: str, scores: Dict[str, float]) -> Dict:
         # Ensure score is between 0-100
-        final_score = max(0, min(100, int(total_score)))
+        final_score = max(0, min(100, int(self.weighted_total(scores))))
         
         return {
             'overall_score': final_score,
-            'breakdown': {
-                'skill_proficiency': round(skill_score, 1),
-                'certifications': round(cert_score, 1),
-                'learning_velocity': round(learning_score, 1),
-                'practical_application': round(application_score, 1),
-                'industry_relevance': round(relevance_score, 1),
-                'peer_collaboration': round(collaboration_score, 1)
-            },
+            'breakdown': {factor: round(score, 1) for factor, score in scores.items()},
             'performance_level': self._get_performance_level(final_score),
-            'recommendations': self._generate_recommendations(employee_id, {
-                'skill_proficiency': skill_score,
-                'certifications': cert_score,
-                'learning_velocity': learning_score,
-                'practical_application': application_score,
-                'industry_relevance': relevance_score,
-                'peer_collaboration': collaboration_score
-            })
+            'recommendations': self._generate_recommendations(employee_id, scores)
         }
     
-    def _calculate_skill_proficiency(self, conn: sqlite3.Connection, employee_id: str) -> float:
-        """Calculate score based on current skill levels"""
+    def _id_chunks(self, employee_ids: List[str] = None, chunk_size: int = 500):
+        if employee_ids is None:
+            yield None
+            return
+        employee_ids = list(employee_ids)
+        for start in range(0, len(employee_ids), chunk_size):
+            yield employee_ids[start:start + chunk_size]
+    
+    def _employee_filter(self, column: str, chunk: List[str] = None) -> Tuple[str, List[str]]:
+        if chunk is None:
+            return '', []
+        return f" AND {column} IN ({', '.join('?' * len(chunk))})", list(chunk)
+    
+    def _as_of_date(self, as_of) -> Optional[str]:
+        if as_of is None:
+            return None
+        if isinstance(as_of, (date, datetime)):
+            return as_of.isoformat()[:10]
+        return date.fromisoformat(str(as_of).strip()[:10]).isoformat()
+    
+    # The helpers below return SQL fragments with their parameters, so the
+    # per-employee and set-based paths evaluate `as_of` identically. Without
+    # `as_of` they reproduce the current-state queries.
+    
+    def _certification_conditions(self, as_of: str = None) -> Tuple[str, List, str, List]:
+        """(expiring-count column, params, validity condition, params)"""
+        if as_of is None:
+            return ("COUNT(CASE WHEN status = 'expiring_soon' THEN 1 END)", [],
+                    "status IN ('active', 'expiring_soon')", [])
+        # Valid on the day; "expiring soon" means within 90 days of it
+        return ("COUNT(CASE WHEN expiry_date < date(?, '+90 days') THEN 1 END)", [as_of],
+                "issue_date <= ? AND (expiry_date IS NULL OR expiry_date >= ?)", [as_of, as_of])
+    
+    def _learning_window(self, as_of: str = None, today: str = None) -> Tuple[str, List]:
+        """Condition selecting the three-month learning window"""
+        if as_of is None:
+            return "date >= date(?, '-3 months')", [today or _utc_today()]
+        return "date >= date(?, '-3 months') AND date <= ?", [as_of, as_of]
+    
+    def _enrollment_conditions(self, as_of: str = None) -> Tuple[str, List, str, List]:
+        """(enrollment/completed/average-progress columns, params, enrolled condition, params)"""
+        if as_of is None:
+            return ("COUNT(*), COUNT(CASE WHEN status = 'completed' THEN 1 END), AVG(progress_percentage)", [],
+                    "1=1", [])
+        # Completed by the day counts as 100%; anything else was still open
+        # then, so its progress is capped below completion.
+        completed = "status = 'completed' AND COALESCE(completion_date, enrollment_date) < date(?, '+1 day')"
+        return (f"COUNT(*), COUNT(CASE WHEN {completed} THEN 1 END), "
+                f"AVG(CASE WHEN {completed} THEN 100 ELSE MIN(progress_percentage, 99) END)", [as_of, as_of],
+                "enrollment_date < date(?, '+1 day')", [as_of])
+    
+    def _years_experience_as_of(self, years_exp: float, as_of: str = None, today: str = None) -> float:
+        if as_of is None or years_exp is None:
+            return years_exp
+        elapsed = (date.fromisoformat(today or _utc_today()) - date.fromisoformat(as_of)).days / 365.25
+        return max(0, years_exp - elapsed)
+    
+    def _load_profile_inputs(self, conn: sqlite3.Connection, employee_id: str,
+                             as_of: str = None, today: str = None) -> Optional[Dict]:
+        """Department, practical application and collaboration from the employee row"""
         cursor = conn.cursor()
         cursor.execute('''
-            SELECT es.current_level, s.category
+            SELECT department, position, years_experience, hire_date FROM employees WHERE id = ?
+        ''', (employee_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        department, position, years_exp, hire_date = row
+        if as_of is not None and not (hire_date is not None and hire_date <= as_of):
+            return None
+        
+        return {
+            'department': department,
+            'practical_application': self._practical_application_from_experience(
+                self._years_experience_as_of(years_exp, as_of, today)),
+            'peer_collaboration': self._collaboration_from_position(position)
+        }
+    
+    def _load_skill_categories(self, conn: sqlite3.Connection, employee_id: str) -> Dict[str, Tuple[int, int]]:
+        """(level sum, skill count) per category; skill proficiency and industry
+        relevance are both derived from it by `score_factors`"""
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT s.category, SUM(es.current_level), COUNT(*)
             FROM employee_skills es
             JOIN skills s ON es.skill_id = s.id
             WHERE es.employee_id = ?
+            GROUP BY s.category
         ''', (employee_id,))
         
-        skills = cursor.fetchall()
-        
-        if not skills:
-            return 0
-        
-        # Calculate weighted average based on industry demand
-        total_weighted_score = 0
-        total_weight = 0
-        
-        for level, category in skills:
-            weight = self.industry_demand.get(category, 1.0)
-            total_weighted_score += level * weight
-            total_weight += weight
-        
-        return total_weighted_score / total_weight if total_weight > 0 else 0
+        return {category: (level_sum, count) for category, level_sum, count in cursor.fetchall()}
     
-    def _calculate_certification_score(self, conn: sqlite3.Connection, employee_id: str) -> float:
+    def _calculate_certification_score(self, conn: sqlite3.Connection, employee_id: str,
+                                       as_of: str = None) -> float:
         """Calculate score based on professional certifications"""
+        expiring, expiring_params, valid, valid_params = self._certification_conditions(as_of)
         cursor = conn.cursor()
-        cursor.execute('''
+        cursor.execute(f'''
             SELECT COUNT(*) as active_certs,
-                   COUNT(CASE WHEN status = 'expiring_soon' THEN 1 END) as expiring_certs
+                   {expiring} as expiring_certs
             FROM certifications
-            WHERE employee_id = ? AND status IN ('active', 'expiring_soon')
-        ''', (employee_id,))
+            WHERE employee_id = ? AND {valid}
+        ''', expiring_params + [employee_id] + valid_params)
         
         cert_data = cursor.fetchone()
         active_certs, expiring_certs = cert_data
         
+        return self._certification_score_from_counts(active_certs, expiring_certs)
+    
+    def _certification_score_from_counts(self, active_certs: int, expiring_certs: int) -> float:
         # Base score from number of certifications
         base_score = min(100, active_certs * 15)  # 15 points per cert, max 100
         
@@ -135,31 +498,36 @@ class AICompetencyCalculator:
         
         return max(0, base_score - expiry_penalty)
     
-    def _calculate_learning_velocity(self, conn: sqlite3.Connection, employee_id: str) -> float:
+    def _calculate_learning_velocity(self, conn: sqlite3.Connection, employee_id: str,
+                                     as_of: str = None, today: str = None) -> float:
         """Calculate score based on learning activity and progress"""
         cursor = conn.cursor()
         
-        # Get learning hours in last 3 months
-        cursor.execute('''
+        # Get learning hours in the 3 months up to today (or `as_of`)
+        window, window_params = self._learning_window(as_of, today)
+        cursor.execute(f'''
             SELECT SUM(hours_spent) as total_hours
             FROM learning_activities
-            WHERE employee_id = ? AND date >= date('now', '-3 months')
-        ''', (employee_id,))
+            WHERE employee_id = ? AND {window}
+        ''', [employee_id] + window_params)
         
         recent_hours = cursor.fetchone()[0] or 0
         
-        # Get course completion rate
-        cursor.execute('''
-            SELECT 
-                COUNT(*) as total_enrollments,
-                COUNT(CASE WHEN status = 'completed' THEN 1 END) as completed_courses,
-                AVG(progress_percentage) as avg_progress
+        # Get course completion rate (total enrollments, completed courses, average progress)
+        columns, column_params, enrolled, enrolled_params = self._enrollment_conditions(as_of)
+        cursor.execute(f'''
+            SELECT {columns}
             FROM course_enrollments
-            WHERE employee_id = ?
-        ''', (employee_id,))
+            WHERE employee_id = ? AND {enrolled}
+        ''', column_params + [employee_id] + enrolled_params)
         
         course_data = cursor.fetchone()
         total_enrollments, completed_courses, avg_progress = course_data
+        
+        return self._learning_velocity_from_activity(recent_hours, total_enrollments, completed_courses, avg_progress)
+    
+    def _learning_velocity_from_activity(self, recent_hours: float, total_enrollments: int,
+                                         completed_courses: int, avg_progress: float) -> float:
         avg_progress = avg_progress or 0
         
         # Calculate learning velocity score
@@ -169,13 +537,8 @@ class AICompetencyCalculator:
         
         return (hours_score * 0.4 + completion_rate * 0.3 + progress_score * 0.3)
     
-    def _calculate_practical_application(self, conn: sqlite3.Connection, employee_id: str) -> float:
-        """Calculate score based on practical experience and project work"""
-        cursor = conn.cursor()
-        
-        # Get employee experience
-        cursor.execute('SELECT years_experience FROM employees WHERE id = ?', (employee_id,))
-        years_exp = cursor.fetchone()[0] or 0
+    def _practical_application_from_experience(self, years_exp: float) -> float:
+        years_exp = years_exp or 0
         
         # Experience score (logarithmic scale to prevent over-weighting)
         exp_score = min(100, 20 * math.log(years_exp + 1))
@@ -185,43 +548,14 @@ class AICompetencyCalculator:
         
         return (exp_score * 0.6 + project_score * 0.4)
     
-    def _calculate_industry_relevance(self, conn: sqlite3.Connection, employee_id: str) -> float:
-        """Calculate score based on how relevant skills are to current market"""
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT s.category, es.current_level
-            FROM employee_skills es
-            JOIN skills s ON es.skill_id = s.id
-            WHERE es.employee_id = ?
-        ''', (employee_id,))
-        
-        skills = cursor.fetchall()
-        
-        if not skills:
-            return 0
-        
-        # Calculate relevance score based on industry demand
-        relevance_scores = []
-        for category, level in skills:
-            demand_multiplier = self.industry_demand.get(category, 1.0)
-            relevance_score = level * demand_multiplier
-            relevance_scores.append(relevance_score)
-        
-        return sum(relevance_scores) / len(relevance_scores)
-    
-    def _calculate_peer_collaboration(self, conn: sqlite3.Connection, employee_id: str) -> float:
-        """Calculate score based on collaboration and mentoring activities"""
+    def _collaboration_from_position(self, position: str) -> float:
         # In a real implementation, this would analyze:
         # - Code review participation
         # - Mentoring activities
         # - Team collaboration metrics
         # - Knowledge sharing contributions
         
-        # For now, return a simulated score based on seniority
-        cursor = conn.cursor()
-        cursor.execute('SELECT position FROM employees WHERE id = ?', (employee_id,))
-        position = cursor.fetchone()[0]
-        
+        # For now, return a simulated score based on seniority.
         # Senior positions get higher collaboration scores
         if 'Senior' in position:
             return 80
@@ -273,37 +607,161 @@ class AICompetencyCalculator:
         
         return recommendations
 
-# Test the AI competency calculator
-if __name__ == "__main__":
-    print("[v0] Testing AI Competency Calculator...")
+def export_scores(calculator: AICompetencyCalculator, output, file_format: str = 'ndjson',
+                  write_header: bool = True, progress_every: int = 100000, **filters) -> Dict:
+    """Stream scores to `output` row by row; returns row count and throughput"""
+    writer = None
+    if file_format == 'csv':
+        writer = csv.writer(output)
+        if write_header:
+            writer.writerow(EXPORT_FIELDS)
+    
+    started = time.perf_counter()
+    rows = 0
+    last_id = None
+    for employee_id, name, result in calculator.iter_scores(**filters):
+        record = [employee_id, name, result['department'], result['overall_score'], result['performance_level']]
+        record.extend(result['breakdown'].values())
+        if writer is not None:
+            writer.writerow(record)
+        else:
+            entry = dict(zip(EXPORT_FIELDS, record))
+            entry['recommendations'] = result['recommendations']
+            output.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        rows += 1
+        last_id = employee_id
+        if progress_every and rows % progress_every == 0:
+            elapsed = time.perf_counter() - started
+            print(f"[v0] {rows} rows ({round(rows / elapsed)} rows/s), last id {last_id}", file=sys.stderr)
     
-    calculator = AICompetencyCalculator()
+    elapsed = time.perf_counter() - started
+    return {
+        'rows': rows,
+        'last_id': last_id,
+        'seconds': round(elapsed, 3),
+        'rows_per_second': round(rows / elapsed) if elapsed > 0 else 0
+    }
+
+def _last_exported_id(path: str, file_format: str) -> Optional[str]:
+    """Employee id of the last complete row in an earlier export"""
+    with open(path, 'rb') as handle:
+        handle.seek(0, os.SEEK_END)
+        size = handle.tell()
+        handle.seek(max(0, size - 65536))
+        tail = handle.read().decode('utf-8', errors='ignore')
     
-    # Get employee ID for testing
-    conn = sqlite3.connect("employee_dashboard.db")
+    # A run that was killed mid-row leaves a partial last line; skip it
+    lines = tail.split('\n')
+    complete = [line for line in lines[:-1] if line.strip()]
+    for line in reversed(complete):
+        if file_format == 'csv':
+            row = next(csv.reader([line]), None)
+            if row and row[0] != EXPORT_FIELDS[0]:
+                return row[0]
+        else:
+            try:
+                return json.loads(line)['employee_id']
+            except (ValueError, KeyError):
+                continue
+    return None
+
+def _truncate_partial_line(path: str):
+    with open(path, 'rb+') as handle:
+        handle.seek(0, os.SEEK_END)
+        size = handle.tell()
+        handle.seek(max(0, size - 65536))
+        tail = handle.read()
+        if tail and not tail.endswith(b'\n'):
+            handle.truncate(size - (len(tail) - tail.rfind(b'\n') - 1))
+
+def _show(calculator: AICompetencyCalculator, employee_id: str = None, as_of: str = None) -> int:
+    conn = sqlite3.connect(calculator.db_path)
     cursor = conn.cursor()
-    cursor.execute("SELECT id, name FROM employees LIMIT 1")
+    if employee_id:
+        cursor.execute("SELECT id, name FROM employees WHERE id = ?", (employee_id,))
+    else:
+        cursor.execute("SELECT id, name FROM employees ORDER BY id LIMIT 1")
     employee_data = cursor.fetchone()
     conn.close()
     
-    if employee_data:
-        employee_id, employee_name = employee_data
-        
-        print(f"[v0] Calculating competency score for {employee_name}...")
-        result = calculator.calculate_competency_score(employee_id)
-        
-        print(f"\n[v0] === COMPETENCY ANALYSIS RESULTS ===")
-        print(f"[v0] Overall Score: {result['overall_score']}/100")
-        print(f"[v0] Performance Level: {result['performance_level']}")
-        
-        print(f"\n[v0] Score Breakdown:")
-        for factor, score in result['breakdown'].items():
-            print(f"[v0]   {factor.replace('_', ' ').title()}: {score}/100")
-        
-        print(f"\n[v0] Recommendations:")
-        for i, rec in enumerate(result['recommendations'], 1):
-            print(f"[v0]   {i}. {rec}")
-        
-        print(f"\n[v0] AI Competency Calculator test completed successfully!")
-    else:
+    if not employee_data:
         print("[v0] No employee data found. Please run employee_data_manager.py first.")
+        return 1
+    
+    employee_id, employee_name = employee_data
+    print(f"[v0] Calculating competency score for {employee_name}...")
+    result = calculator.calculate_competency_score(employee_id, as_of)
+    if result is None:
+        print(f"[v0] {employee_name} had not joined by {as_of}")
+        return 1
+    
+    print(f"\n[v0] === COMPETENCY ANALYSIS RESULTS ===")
+    print(f"[v0] Overall Score: {result['overall_score']}/100")
+    print(f"[v0] Performance Level: {result['performance_level']}")
+    
+    print(f"\n[v0] Score Breakdown:")
+    for factor, score in result['breakdown'].items():
+        print(f"[v0]   {factor.replace('_', ' ').title()}: {score}/100")
+    
+    print(f"\n[v0] Recommendations:")
+    for i, rec in enumerate(result['recommendations'], 1):
+        print(f"[v0]   {i}. {rec}")
+    return 0
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="AI competency scores")
+    parser.add_argument('--db', default="employee_dashboard.db", help="SQLite database path")
+    scoring = argparse.ArgumentParser(add_help=False)
+    scoring.add_argument('--as-of', help="Score against the state on this date (YYYY-MM-DD)")
+    # No subcommand runs `show` on the first employee, as the script always did
+    commands = parser.add_subparsers(dest='command')
+    
+    show = commands.add_parser('show', parents=[scoring], help="Print one employee's score breakdown")
+    show.add_argument('employee_id', nargs='?', help="Employee id (default: first employee)")
+    
+    export = commands.add_parser('export', parents=[scoring], help="Stream scores as NDJSON or CSV")
+    export.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson')
+    export.add_argument('--output', default='-', help="Output file, or '-' for stdout")
+    export.add_argument('--department', help="Only this department")
+    export.add_argument('--employee', action='append', dest='employee_ids', help="Only this employee (repeatable)")
+    resume = export.add_mutually_exclusive_group()
+    resume.add_argument('--after-id', help="Start after this employee id")
+    resume.add_argument('--resume', action='store_true',
+                        help="Append to --output, continuing after its last complete row")
+    export.add_argument('--chunk-size', type=int, default=500, help="Employees scored per batch")
+    args = parser.parse_args(argv)
+    
+    calculator = AICompetencyCalculator(args.db)
+    if args.command is None:
+        return _show(calculator, None, None)
+    if args.command == 'show':
+        return _show(calculator, args.employee_id, args.as_of)
+    
+    after_id = args.after_id
+    mode = 'w'
+    write_header = True
+    if args.resume:
+        if args.output == '-':
+            parser.error("--resume needs an --output file")
+        if os.path.exists(args.output) and os.path.getsize(args.output) > 0:
+            _truncate_partial_line(args.output)
+            after_id = _last_exported_id(args.output, args.format)
+            mode = 'a'
+            write_header = after_id is None and os.path.getsize(args.output) == 0
+    
+    output = sys.stdout if args.output == '-' else open(args.output, mode, newline='', encoding='utf-8')
+    try:
+        stats = export_scores(calculator, output, args.format, write_header,
+                              department=args.department, employee_ids=args.employee_ids,
+                              after_id=after_id, as_of=args.as_of, chunk_size=args.chunk_size)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    
+    resumed = f" after {after_id}" if after_id else ""
+    print(f"[v0] Exported {stats['rows']} rows{resumed} in {stats['seconds']}s "
+          f"({stats['rows_per_second']} rows/s), last id {stats['last_id']}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Training Course Catalog Cache
+Serves repeated catalog queries without touching SQLite:
+- Entries keyed by normalized (category, search_term)
+- Time-to-live bound for writes made by other processes
+- Catalog version counter: any local write to `training_courses` invalidates every entry at once
+- Size-bounded LRU eviction and hit/miss stats
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+class CatalogCache:
+    def __init__(self, max_entries: int = 256, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version = 0
+
+        self._entries = OrderedDict()  # key -> (version, expires_at, value)
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0}
+
+    @staticmethod
+    def key(category: str = None, search_term: str = None) -> Tuple[Optional[str], Optional[str]]:
+        """Normalize filters so equivalent queries share an entry"""
+        if category == 'all':
+            category = None
+        search_term = (search_term or '').strip() or None
+        return category or None, search_term
+
+    def get(self, key, build: Callable[[], object]):
+        """Return the cached value for `key`, calling `build` on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                version, expires_at, value = entry
+                if version == self.version and expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return value
+                del self._entries[key]
+                self._stats['expired'] += 1
+            self._stats['misses'] += 1
+            version = self.version
+
+        value = build()
+
+        with self._lock:
+            # A write during the build bumped the version; the value may
+            # predate it, so it is returned but not stored.
+            if version == self.version and self.max_entries > 0:
+                self._entries[key] = (version, time.monotonic() + self.ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._stats['evictions'] += 1
+        return value
+
+    def bump(self):
+        """Advance the catalog version, invalidating every entry"""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters, the hit rate and the current catalog version"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['version'] = self.version
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
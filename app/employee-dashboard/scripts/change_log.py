@@ -0,0 +1,560 @@
+"""
+Change Data Capture Log
+Records every insert, update and delete on the dashboard tables for
+incremental downstream sync (e.g. the hosted Postgres mirror):
+- Filled by triggers installed by `enable`, so every write path and process
+  is captured; opening the log leaves capture as it is
+- Monotonically increasing sequence numbers that are never reused
+- Full row images: a consumer applies each change as an upsert or delete;
+  REAL values are stored with 17 significant digits, so they round-trip
+- Batched pulls since a sequence, with named consumer offsets
+- Compaction merges each row's changes between consumer offsets, keeping
+  rows in first-seen order; retention drops changes every consumer has
+  acknowledged or that are older than a cutoff
+- SQLite mirror and JSONL file sinks
+"""
+
+import argparse
+import json
+import logging
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List, Tuple
+
+from employee_data_manager import TABLES, EmployeeDashboardDB
+
+logger = logging.getLogger(__name__)
+
+OPERATIONS = {'I': 'insert', 'U': 'update', 'D': 'delete'}
+
+# Changes returned per pull unless a limit is given
+BATCH_SIZE = 1000
+
+# Name prefix of the capture triggers installed by `ChangeLog.enable`
+TRIGGER_PREFIX = 'trg_change_log_'
+
+class StaleOffsetError(ValueError):
+    """Changes after the requested sequence were already purged.
+
+    The consumer has to re-copy the tables and continue from `current_seq()`.
+    """
+
+class ChangeLog:
+    def __init__(self, db: EmployeeDashboardDB, tables: Iterable[str] = TABLES):
+        self.db = db
+        self.tables = list(tables)
+        self._stop = threading.Event()
+        self._thread = None
+        self.ensure_schema()
+
+    def ensure_schema(self):
+        """Create the log tables if they do not exist; capture is left as is"""
+        conn = self.db._connect()
+        cursor = conn.cursor()
+
+        # AUTOINCREMENT: sequence numbers stay unique after old rows are removed
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS change_log (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                table_name TEXT NOT NULL,
+                row_id TEXT NOT NULL,
+                op TEXT NOT NULL, -- I, U or D
+                row_data TEXT, -- JSON row image, NULL for deletes
+                changed_at INTEGER NOT NULL -- unix seconds
+            )
+        ''')
+
+        # Compaction looks for later changes to the same row
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_change_log_row
+            ON change_log (table_name, row_id, seq)
+        ''')
+
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_change_log_changed_at
+            ON change_log (changed_at)
+        ''')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS change_log_consumers (
+                name TEXT PRIMARY KEY,
+                last_seq INTEGER NOT NULL,
+                updated_at INTEGER NOT NULL
+            )
+        ''')
+
+        # Highest sequence removed by retention; older offsets have a gap
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS change_log_state (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        ''')
+
+        conn.commit()
+        conn.close()
+
+    def enable(self):
+        """Start capturing changes: create the log and (re)create the triggers.
+
+        Triggers list every column of their table, so they are rebuilt from
+        the current schema each time.
+        """
+        self.ensure_schema()
+        conn = self.db._connect()
+        cursor = conn.cursor()
+        for table in self.tables:
+            columns = [(row[1], row[2]) for row in cursor.execute(f'PRAGMA table_info({table})')]
+            for name, body in _capture_triggers(table, columns).items():
+                cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+                cursor.execute(f'CREATE TRIGGER {name} {body}')
+        conn.commit()
+        conn.close()
+
+    def disable(self):
+        """Drop the capture triggers; the log and consumer offsets are kept"""
+        conn = self.db._connect()
+        for table in self.tables:
+            for name in _trigger_names(table):
+                conn.execute(f'DROP TRIGGER IF EXISTS {name}')
+        conn.commit()
+        conn.close()
+
+    def current_seq(self) -> int:
+        """Sequence number of the latest change (0 before the first)"""
+        conn = self.db._read_connection()
+        row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'").fetchone()
+        conn.close()
+        return row[0] if row else 0
+
+    def changes_since(self, since: int, limit: int = BATCH_SIZE, tables: Iterable[str] = None) -> List[Dict]:
+        """Up to `limit` changes with a sequence above `since`, oldest first.
+
+        Raises StaleOffsetError when changes after `since` have been purged.
+        """
+        conn = self.db._read_connection()
+        try:
+            purged = self._purged_through(conn)
+            if since < purged:
+                raise StaleOffsetError(f"Changes after {since} were purged (through {purged})")
+
+            query = 'SELECT seq, table_name, row_id, op, row_data, changed_at FROM change_log WHERE seq > ?'
+            params = [since]
+            if tables is not None:
+                tables = list(tables)
+                query += f" AND table_name IN ({', '.join('?' * len(tables))})"
+                params += tables
+            query += ' ORDER BY seq LIMIT ?'
+            params.append(limit)
+            rows = conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+
+        return [
+            {'seq': seq, 'table': table, 'id': row_id, 'op': OPERATIONS[op],
+             'row': json.loads(row_data) if row_data is not None else None, 'changed_at': changed_at}
+            for seq, table, row_id, op, row_data, changed_at in rows
+        ]
+
+    def register(self, consumer: str, since: int = None) -> int:
+        """Add a consumer, positioned at `since` (default: the latest change).
+
+        A new consumer normally copies the tables first and then follows the
+        log from the sequence it was registered at. Returns that sequence.
+        """
+        since = self.current_seq() if since is None else since
+        conn = self.db._connect()
+        conn.execute('''
+            INSERT INTO change_log_consumers (name, last_seq, updated_at) VALUES (?, ?, ?)
+            ON CONFLICT (name) DO NOTHING
+        ''', (consumer, since, int(time.time())))
+        conn.commit()
+        row = conn.execute('SELECT last_seq FROM change_log_consumers WHERE name = ?', (consumer,)).fetchone()
+        conn.close()
+        return row[0]
+
+    def unregister(self, consumer: str):
+        """Forget a consumer so it no longer holds back retention"""
+        conn = self.db._connect()
+        conn.execute('DELETE FROM change_log_consumers WHERE name = ?', (consumer,))
+        conn.commit()
+        conn.close()
+
+    def consumers(self) -> Dict[str, Dict]:
+        """Offset and lag of every consumer"""
+        latest = self.current_seq()
+        conn = self.db._read_connection()
+        rows = conn.execute('SELECT name, last_seq, updated_at FROM change_log_consumers ORDER BY name').fetchall()
+        conn.close()
+        return {
+            name: {'last_seq': last_seq, 'lag': latest - last_seq, 'updated_at': updated_at}
+            for name, last_seq, updated_at in rows
+        }
+
+    def pull(self, consumer: str, limit: int = BATCH_SIZE) -> List[Dict]:
+        """Next batch of changes for a registered consumer; `acknowledge` it once applied"""
+        conn = self.db._read_connection()
+        row = conn.execute('SELECT last_seq FROM change_log_consumers WHERE name = ?', (consumer,)).fetchone()
+        conn.close()
+        if row is None:
+            raise ValueError(f"Unknown change log consumer: {consumer}")
+        return self.changes_since(row[0], limit)
+
+    def acknowledge(self, consumer: str, seq: int):
+        """Record that `consumer` has applied every change up to `seq`"""
+        conn = self.db._connect()
+        conn.execute('''
+            UPDATE change_log_consumers SET last_seq = MAX(last_seq, ?), updated_at = ? WHERE name = ?
+        ''', (seq, int(time.time()), consumer))
+        conn.commit()
+        conn.close()
+
+    def sync(self, consumer: str, sink, batch_size: int = BATCH_SIZE, max_batches: int = None) -> Dict:
+        """Apply a consumer's pending changes to `sink` batch by batch.
+
+        Offsets are acknowledged after each batch is applied, so a crash
+        replays at most one batch; sinks must apply changes idempotently.
+        """
+        started = time.perf_counter()
+        stats = {'batches': 0, 'changes': 0}
+        while max_batches is None or stats['batches'] < max_batches:
+            changes = self.pull(consumer, batch_size)
+            if not changes:
+                break
+            sink.apply(changes)
+            self.acknowledge(consumer, changes[-1]['seq'])
+            stats['batches'] += 1
+            stats['changes'] += len(changes)
+            if len(changes) < batch_size:
+                break
+        stats['last_seq'] = self.consumers()[consumer]['last_seq']
+        stats['seconds'] = round(time.perf_counter() - started, 3)
+        return stats
+
+    def compact(self, through: int = None) -> int:
+        """Merge the changes to each row into one, up to `through` (default:
+        the latest). Returns the number of changes removed.
+
+        Changes are only merged between consumer offsets, so every
+        registered consumer still sees each row's latest state. A merged
+        upsert takes the place of the row's first change, keeping parents
+        ahead of the children inserted after them; a row deleted in the end
+        keeps its last change, after the deletes of its children, and a row
+        inserted and deleted in between drops out. Readers of
+        `changes_since` from other positions may see a mid-run state.
+        """
+        through = self.current_seq() if through is None else through
+        conn = self.db._connect()
+        cursor = conn.cursor()
+        cursor.execute('SELECT DISTINCT last_seq FROM change_log_consumers WHERE last_seq < ?', (through,))
+        bounds = sorted({0} | {row[0] for row in cursor.fetchall()}) + [through]
+
+        merged = []
+        dropped = []
+        for low, high in zip(bounds, bounds[1:]):
+            cursor.execute('''
+                SELECT runs.table_name, runs.row_id, first.seq, first.op, last.seq, last.op,
+                       last.row_data, last.changed_at
+                FROM (SELECT table_name, row_id, MIN(seq) AS first_seq, MAX(seq) AS last_seq
+                      FROM change_log
+                      WHERE seq > ? AND seq <= ?
+                      GROUP BY table_name, row_id
+                      HAVING COUNT(*) > 1) runs
+                JOIN change_log first ON first.seq = runs.first_seq
+                JOIN change_log last ON last.seq = runs.last_seq
+            ''', (low, high))
+            for table, row_id, first_seq, first_op, last_seq, last_op, row_data, changed_at in cursor.fetchall():
+                if last_op == 'D':
+                    keep = None if first_op == 'I' else last_seq
+                else:
+                    keep = first_seq
+                    merged.append(('I' if first_op == 'I' else last_op, row_data, changed_at, first_seq))
+                dropped.append((table, row_id, low, high, keep))
+
+        cursor.executemany('UPDATE change_log SET op = ?, row_data = ?, changed_at = ? WHERE seq = ?', merged)
+        cursor.executemany('''
+            DELETE FROM change_log
+            WHERE table_name = ? AND row_id = ? AND seq > ? AND seq <= ? AND seq IS NOT ?
+        ''', dropped)
+        removed = cursor.rowcount if dropped else 0
+        conn.commit()
+        conn.close()
+        return removed
+
+    def purge(self, max_age_seconds: float = None) -> int:
+        """Drop changes every consumer has acknowledged, and with
+        `max_age_seconds` also changes older than that.
+
+        Consumers whose offset falls behind an age-based purge get
+        StaleOffsetError on their next pull. Returns the number removed.
+        """
+        conn = self.db._connect()
+        cursor = conn.cursor()
+        cursor.execute('SELECT MIN(last_seq) FROM change_log_consumers')
+        through = cursor.fetchone()[0] or 0
+        if max_age_seconds is not None:
+            cutoff = int(time.time() - max_age_seconds)
+            cursor.execute('SELECT MAX(seq) FROM change_log WHERE changed_at < ?', (cutoff,))
+            through = max(through, cursor.fetchone()[0] or 0)
+
+        cursor.execute('DELETE FROM change_log WHERE seq <= ?', (through,))
+        removed = cursor.rowcount
+        if removed:
+            cursor.execute('''
+                INSERT INTO change_log_state (name, value) VALUES ('purged_through', ?)
+                ON CONFLICT (name) DO UPDATE SET value = MAX(value, excluded.value)
+            ''', (through,))
+        conn.commit()
+        conn.close()
+        return removed
+
+    def stats(self) -> Dict:
+        """Log size, sequence range and consumer offsets"""
+        conn = self.db._read_connection()
+        changes, first_seq = conn.execute('SELECT COUNT(*), MIN(seq) FROM change_log').fetchone()
+        by_table = dict(conn.execute('SELECT table_name, COUNT(*) FROM change_log GROUP BY table_name').fetchall())
+        purged = self._purged_through(conn)
+        conn.close()
+        return {
+            'changes': changes,
+            'first_seq': first_seq,
+            'last_seq': self.current_seq(),
+            'purged_through': purged,
+            'tables': by_table,
+            'consumers': self.consumers()
+        }
+
+    def start(self, interval_seconds: float = 3600.0, max_age_seconds: float = None):
+        """Compact and purge every `interval_seconds` on a background thread"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.is_set():
+                try:
+                    self.compact()
+                    self.purge(max_age_seconds)
+                except Exception as e:
+                    logger.exception("Change log maintenance failed: %s", e)
+                self._stop.wait(interval_seconds)
+
+        self._thread = threading.Thread(target=run, name='change-log', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background maintenance thread"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _purged_through(self, conn: sqlite3.Connection) -> int:
+        row = conn.execute("SELECT value FROM change_log_state WHERE name = 'purged_through'").fetchone()
+        return row[0] if row else 0
+
+def mark_uncaptured(cursor) -> int:
+    """Record that rows were written while the capture triggers were off.
+
+    Takes one sequence number and marks the log purged through it, so every
+    consumer gets StaleOffsetError on its next pull and re-copies the
+    tables. Call in the transaction that restores the triggers. Returns the
+    new purged-through sequence.
+    """
+    cursor.execute("UPDATE sqlite_sequence SET seq = seq + 1 WHERE name = 'change_log'")
+    if cursor.rowcount == 0:
+        cursor.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('change_log', 1)")
+    cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'")
+    through = cursor.fetchone()[0]
+    cursor.execute('''
+        INSERT INTO change_log_state (name, value) VALUES ('purged_through', ?)
+        ON CONFLICT (name) DO UPDATE SET value = MAX(value, excluded.value)
+    ''', (through,))
+    return through
+
+def _trigger_names(table: str) -> List[str]:
+    return [f'{TRIGGER_PREFIX}{table}_{event}' for event in ('insert', 'update', 'delete')]
+
+def _capture_triggers(table: str, columns: List[Tuple[str, str]]) -> Dict[str, str]:
+    """Insert, update and delete triggers logging `table` rows by their id.
+
+    `columns` are (name, declared type) pairs as listed by PRAGMA table_info.
+    """
+    def value(row: str, column: str, declared: str) -> str:
+        declared = declared.upper()
+        if 'INT' not in declared and any(text in declared for text in ('CHAR', 'CLOB', 'TEXT')):
+            return f'{row}.{column}'  # TEXT affinity never holds a REAL
+        # json_object prints REAL values with 15 significant digits; 17 are
+        # enough to read back the same double (infinities are left as is)
+        return (f"CASE WHEN typeof({row}.{column}) = 'real' AND abs({row}.{column}) <= 1.7976931348623157e308 "
+                f"THEN json(printf('%!.17g', {row}.{column})) ELSE {row}.{column} END")
+
+    def image(row: str) -> str:
+        return 'json_object(' + ', '.join(
+            f"'{column}', {value(row, column, declared)}" for column, declared in columns
+        ) + ')'
+
+    def log(op: str, row: str, data: str) -> str:
+        return f'''
+            INSERT INTO change_log (table_name, row_id, op, row_data, changed_at)
+            VALUES ('{table}', {row}.id, '{op}', {data}, CAST(strftime('%s', 'now') AS INTEGER));'''
+
+    # A changed id moves the row: the old id is deleted downstream
+    moved = f'''
+            INSERT INTO change_log (table_name, row_id, op, row_data, changed_at)
+            SELECT '{table}', OLD.id, 'D', NULL, CAST(strftime('%s', 'now') AS INTEGER)
+            WHERE OLD.id IS NOT NEW.id;'''
+    insert, update, delete = _trigger_names(table)
+    return {
+        insert: f'''
+        AFTER INSERT ON {table}
+        BEGIN{log('I', 'NEW', image('NEW'))}
+        END''',
+        update: f'''
+        AFTER UPDATE ON {table}
+        BEGIN{moved}{log('U', 'NEW', image('NEW'))}
+        END''',
+        delete: f'''
+        AFTER DELETE ON {table}
+        BEGIN{log('D', 'OLD', 'NULL')}
+        END''',
+    }
+
+class SQLiteSink:
+    """Mirror of the captured tables in another SQLite file.
+
+    Tables are created from the source's DDL on first use; changes are
+    applied as upserts and deletes by id in one transaction per batch.
+    """
+
+    def __init__(self, path: str, source_path: str):
+        self.path = path
+        self.source_path = source_path
+        self._columns = {}  # table -> mirrored column names
+
+    def apply(self, changes: List[Dict]):
+        conn = sqlite3.connect(self.path)
+        try:
+            for change in changes:
+                table = change['table']
+                columns = self._columns.get(table) or self._create_table(conn, table)
+                if change['op'] == 'delete':
+                    conn.execute(f'DELETE FROM {table} WHERE id = ?', (change['id'],))
+                    continue
+                row = change['row']
+                names = [column for column in columns if column in row]
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+                    [row[name] for name in names]
+                )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def close(self):
+        pass
+
+    def _create_table(self, conn: sqlite3.Connection, table: str) -> List[str]:
+        source = sqlite3.connect(self.source_path)
+        row = source.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+        source.close()
+        if row is None:
+            raise ValueError(f"Table {table} does not exist in {self.source_path}")
+        conn.execute(row[0].replace('CREATE TABLE', 'CREATE TABLE IF NOT EXISTS', 1))
+        columns = self._columns[table] = [column[1] for column in conn.execute(f'PRAGMA table_info({table})')]
+        return columns
+
+class JsonlSink:
+    """Appends each change as one JSON line, e.g. for a bulk loader"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._handle = open(path, 'a', encoding='utf-8')
+
+    def apply(self, changes: List[Dict]):
+        for change in changes:
+            self._handle.write(json.dumps(change, separators=(',', ':')) + '\n')
+        self._handle.flush()
+
+    def close(self):
+        self._handle.close()
+
+def open_sink(spec: str, source_path: str):
+    """'sqlite:PATH' or 'jsonl:PATH'"""
+    kind, _, path = spec.partition(':')
+    if kind == 'sqlite' and path:
+        return SQLiteSink(path, source_path)
+    if kind == 'jsonl' and path:
+        return JsonlSink(path)
+    raise ValueError(f"Unknown sink {spec!r}; expected sqlite:PATH or jsonl:PATH")
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Change data capture log for downstream sync")
+    parser.add_argument('--db', default="employee_dashboard.db", help="SQLite database path")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('enable', help="Create the log and (re)create the capture triggers")
+    commands.add_parser('disable', help="Drop the capture triggers")
+    commands.add_parser('status', help="Print log size and consumer offsets as JSON")
+
+    register = commands.add_parser('register', help="Add a consumer at the latest change")
+    register.add_argument('consumer')
+    register.add_argument('--since', type=int, help="Start after this sequence instead")
+
+    pull = commands.add_parser('pull', help="Print changes after a sequence as JSON lines")
+    pull.add_argument('--since', type=int, default=0)
+    pull.add_argument('--limit', type=int, default=BATCH_SIZE)
+
+    sync = commands.add_parser('sync', help="Apply a consumer's pending changes to a sink")
+    sync.add_argument('consumer')
+    sync.add_argument('--sink', required=True, metavar='sqlite:PATH|jsonl:PATH')
+    sync.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    sync.add_argument('--every', type=float, help="Keep syncing, this many seconds apart")
+
+    commands.add_parser('compact', help="Drop changes superseded by later ones")
+    purge = commands.add_parser('purge', help="Drop acknowledged (and optionally old) changes")
+    purge.add_argument('--max-age-days', type=float, help="Also drop changes older than this")
+
+    args = parser.parse_args(argv)
+    log = ChangeLog(EmployeeDashboardDB(args.db))
+
+    if args.command == 'enable':
+        log.enable()
+        print(f"[v0] Capturing changes on {len(log.tables)} tables; latest sequence {log.current_seq()}")
+    elif args.command == 'disable':
+        log.disable()
+        print("[v0] Change capture disabled")
+    elif args.command == 'status':
+        print(json.dumps(log.stats(), indent=2))
+    elif args.command == 'register':
+        print(f"[v0] {args.consumer} at sequence {log.register(args.consumer, args.since)}")
+    elif args.command == 'pull':
+        for change in log.changes_since(args.since, args.limit):
+            print(json.dumps(change, separators=(',', ':')))
+    elif args.command == 'sync':
+        sink = open_sink(args.sink, args.db)
+        log.register(args.consumer)
+        try:
+            while True:
+                stats = log.sync(args.consumer, sink, args.batch_size)
+                print(f"[v0] Applied {stats['changes']} changes in {stats['batches']} batches "
+                      f"({stats['seconds']}s); {args.consumer} at {stats['last_seq']}")
+                if args.every is None:
+                    break
+                time.sleep(args.every)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            sink.close()
+    elif args.command == 'compact':
+        print(f"[v0] Removed {log.compact()} superseded changes")
+    else:
+        max_age = args.max_age_days * 86400 if args.max_age_days is not None else None
+        print(f"[v0] Removed {log.purge(max_age)} changes")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
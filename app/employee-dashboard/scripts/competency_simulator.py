@@ -0,0 +1,186 @@
+"""
+What-If Competency Scoring Simulator
+Evaluates alternative scoring policies against the whole organisation:
+- Batches of factor-weight and industry-demand configurations
+- A single cached factor matrix shared by every scenario
+- Score distributions, performance-level counts and rank shifts per scenario
+"""
+
+import statistics
+from typing import Dict, List
+
+from ai_competency_calculator import AICompetencyCalculator
+
+FACTORS = [
+    'skill_proficiency',
+    'certifications',
+    'learning_velocity',
+    'practical_application',
+    'industry_relevance',
+    'peer_collaboration'
+]
+
+PERFORMANCE_LEVELS = ["Exceptional", "Excellent", "Good", "Satisfactory", "Needs Improvement"]
+
+class CompetencySimulator:
+    def __init__(self, calculator: AICompetencyCalculator, employee_ids: List[str] = None):
+        self.calculator = calculator
+        self.refresh(employee_ids)
+
+    def refresh(self, employee_ids: List[str] = None):
+        """(Re)load the factor matrix from the database"""
+        matrix = self.calculator.load_factor_matrix(employee_ids)
+
+        # Column-oriented copy of the matrix: one list per fixed factor and a
+        # sparse (category index, level_sum, count) list per employee for the
+        # two demand-dependent factors.
+        self.employee_ids = sorted(matrix)
+        self.categories = sorted({
+            category for factors in matrix.values() for category in factors['skill_categories']
+        })
+        category_index = {category: i for i, category in enumerate(self.categories)}
+
+        self._fixed = {
+            factor: [matrix[employee_id][factor] for employee_id in self.employee_ids]
+            for factor in ('certifications', 'learning_velocity', 'practical_application', 'peer_collaboration')
+        }
+        self._skill_terms = [
+            [(category_index[category], level_sum, count)
+             for category, (level_sum, count) in matrix[employee_id]['skill_categories'].items()]
+            for employee_id in self.employee_ids
+        ]
+        self._skill_counts = [sum(count for _, _, count in terms) for terms in self._skill_terms]
+        self._demand_columns = {}
+        self._baseline = None
+
+    def baseline(self) -> Dict:
+        """Simulate the calculator's current weights and demand table"""
+        return self._simulate_one({'name': 'baseline'}, None)[0]
+
+    def simulate(self, configurations: List[Dict], include_scores: bool = False) -> List[Dict]:
+        """Evaluate every configuration and compare it with the baseline.
+
+        Each configuration is a dict with an optional 'name', 'weights' and
+        'industry_demand'; both tables are overrides merged on top of the
+        calculator's current values. With `include_scores` each result also
+        carries the per-employee scores.
+        """
+        if self._baseline is None:
+            self._baseline = self._simulate_one({'name': 'baseline'}, None)[1]
+
+        results = []
+        for config in configurations:
+            result, scores = self._simulate_one(config, self._baseline)
+            if include_scores:
+                result['scores'] = dict(zip(self.employee_ids, scores))
+            results.append(result)
+        return results
+
+    def _simulate_one(self, config: Dict, baseline: List[int] = None):
+        weights = dict(self.calculator.weights)
+        weights.update(config.get('weights', {}))
+        demand = dict(self.calculator.industry_demand)
+        demand.update(config.get('industry_demand', {}))
+
+        skill_column, relevance_column = self._demand_dependent_columns(demand)
+        columns = dict(self._fixed, skill_proficiency=skill_column, industry_relevance=relevance_column)
+
+        totals = [0.0] * len(self.employee_ids)
+        for factor in FACTORS:
+            weight = weights.get(factor, 0)
+            if weight:
+                totals = [total + value * weight for total, value in zip(totals, columns[factor])]
+        scores = [max(0, min(100, int(total))) for total in totals]
+
+        result = {
+            'name': config.get('name'),
+            'weights': weights,
+            'weight_sum': round(sum(weights.values()), 4),
+            'employees': len(scores),
+            'distribution': self._distribution(scores),
+            'level_counts': self._level_counts(scores)
+        }
+        if baseline is not None:
+            level = self.calculator._get_performance_level
+            result['rank_shifts'] = self._rank_shifts(baseline, scores)
+            result['level_changes'] = sum(
+                1 for before, after in zip(baseline, scores) if level(before) != level(after)
+            )
+        return result, scores
+
+    def _demand_dependent_columns(self, demand: Dict[str, float]):
+        # Configurations that only change weights share the same demand table,
+        # so the two demand-dependent columns are computed once per table.
+        multipliers = tuple(demand.get(category, 1.0) for category in self.categories)
+        if multipliers not in self._demand_columns:
+            skill_column = []
+            relevance_column = []
+            for terms, skill_count in zip(self._skill_terms, self._skill_counts):
+                weighted_sum = 0
+                demand_weight = 0
+                for index, level_sum, count in terms:
+                    multiplier = multipliers[index]
+                    weighted_sum += level_sum * multiplier
+                    demand_weight += count * multiplier
+                skill_column.append(weighted_sum / demand_weight if demand_weight > 0 else 0)
+                relevance_column.append(weighted_sum / skill_count if skill_count > 0 else 0)
+            self._demand_columns[multipliers] = (skill_column, relevance_column)
+        return self._demand_columns[multipliers]
+
+    def _distribution(self, scores: List[int]) -> Dict:
+        if not scores:
+            return {'mean': 0, 'median': 0, 'stdev': 0, 'min': 0, 'max': 0, 'percentiles': {}, 'histogram': {}}
+
+        ordered = sorted(scores)
+        histogram = {f"{low}-{low + 9}": 0 for low in range(0, 100, 10)}
+        for score in ordered:
+            low = min(score, 99) // 10 * 10
+            histogram[f"{low}-{low + 9}"] += 1
+
+        return {
+            'mean': round(statistics.fmean(ordered), 2),
+            'median': statistics.median(ordered),
+            'stdev': round(statistics.pstdev(ordered), 2),
+            'min': ordered[0],
+            'max': ordered[-1],
+            'percentiles': {
+                f"p{p}": ordered[min(len(ordered) - 1, len(ordered) * p // 100)]
+                for p in (10, 25, 75, 90)
+            },
+            'histogram': histogram
+        }
+
+    def _level_counts(self, scores: List[int]) -> Dict[str, int]:
+        counts = {level: 0 for level in PERFORMANCE_LEVELS}
+        for score in scores:
+            counts[self.calculator._get_performance_level(score)] += 1
+        return counts
+
+    def _rank_shifts(self, before: List[int], after: List[int], top_n: int = 5) -> Dict:
+        # Competition ranking ("1224"): tied scores share a rank, so ties do
+        # not show up as spurious movement.
+        before_ranks = self._ranks(before)
+        after_ranks = self._ranks(after)
+        shifts = [b - a for b, a in zip(before_ranks, after_ranks)]  # positive = moved up
+
+        movers = sorted(zip(shifts, self.employee_ids), key=lambda item: (-item[0], item[1]))
+        return {
+            'mean_abs_shift': round(statistics.fmean(abs(s) for s in shifts), 2) if shifts else 0,
+            'max_abs_shift': max((abs(s) for s in shifts), default=0),
+            'moved': sum(1 for s in shifts if s),
+            'top_gainers': [{'employee_id': e, 'shift': s} for s, e in movers[:top_n] if s > 0],
+            'top_losers': [{'employee_id': e, 'shift': s} for s, e in reversed(movers[-top_n:]) if s < 0]
+        }
+
+    def _ranks(self, scores: List[int]) -> List[int]:
+        # Scores are integers in 0-100, so ranks come from a 101-slot count
+        # table instead of a sort.
+        counts = [0] * 101
+        for score in scores:
+            counts[score] += 1
+        rank_of = [0] * 101
+        higher = 0
+        for score in range(100, -1, -1):
+            rank_of[score] = higher + 1
+            higher += counts[score]
+        return [rank_of[score] for score in scores]
@@ -8,20 +8,489 @@ Handles all data operations for the employee dashboard including:
 """
 
 import json
+import logging
 import sqlite3
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
-import random
-import uuid
+
+from catalog_cache import CatalogCache
+from row_models import CareerPath, Certification, Course, Employee, Enrollment, Milestone, Skill, fetch_models
+from score_cache import ScoreCache
+from skill_canonicalizer import SkillCanonicalizer
+
+# Modules only needed by optional features (the read replica, response cache,
+# write-behind queue, seeding) are imported where they are used, so that
+# importing this module and opening a database stay cheap.
+
+logger = logging.getLogger(__name__)
+
+# Version of the schema created by `init_database`, stored in the database
+# file as PRAGMA user_version. Bump it whenever the DDL there changes so that
+# existing files are brought up to date the next time they are opened.
+SCHEMA_VERSION = 3
+
+# Every table managed by EmployeeDashboardDB
+TABLES = ('employees', 'skills', 'employee_skills', 'certifications', 'training_courses',
+          'course_enrollments', 'career_paths', 'career_milestones', 'learning_activities')
+
+# Tables holding an employee's own rows, in dependency-safe delete order
+EMPLOYEE_TABLES = ('learning_activities', 'career_milestones', 'career_paths', 'course_enrollments',
+                   'certifications', 'employee_skills', 'employees')
+
+# Competency score bucket (0-9, ten points wide) of an employee_stats row
+SCORE_BUCKET_SQL = (
+    "CASE WHEN {row}.skill_count > 0 "
+    "THEN CAST(MIN({row}.level_sum / {row}.skill_count, 99) AS INTEGER) / 10 ELSE 0 END"
+)
+
+# Triggers that keep employee_stats, department_stats and
+# department_score_histogram in step with every write, whichever code path
+# (or process) performs it.
+STATISTICS_TRIGGERS = {
+    'trg_stats_employee_insert': '''
+        AFTER INSERT ON employees
+        BEGIN
+            INSERT INTO employee_stats (employee_id, department, level_sum, skill_count, active_certifications)
+            VALUES (
+                NEW.id, NEW.department,
+                (SELECT COALESCE(SUM(current_level), 0) FROM employee_skills WHERE employee_id = NEW.id),
+                (SELECT COUNT(current_level) FROM employee_skills WHERE employee_id = NEW.id),
+                (SELECT COUNT(*) FROM certifications WHERE employee_id = NEW.id AND status = 'active')
+            );
+        END''',
+    'trg_stats_employee_department': '''
+        AFTER UPDATE OF department ON employees
+        BEGIN
+            UPDATE employee_stats SET department = NEW.department WHERE employee_id = NEW.id;
+        END''',
+    'trg_stats_employee_delete': '''
+        AFTER DELETE ON employees
+        BEGIN
+            DELETE FROM employee_stats WHERE employee_id = OLD.id;
+        END''',
+    'trg_stats_skill_insert': '''
+        AFTER INSERT ON employee_skills
+        BEGIN
+            UPDATE employee_stats
+            SET level_sum = level_sum + COALESCE(NEW.current_level, 0),
+                skill_count = skill_count + (NEW.current_level IS NOT NULL)
+            WHERE employee_id = NEW.employee_id;
+        END''',
+    'trg_stats_skill_update': '''
+        AFTER UPDATE OF employee_id, current_level ON employee_skills
+        BEGIN
+            UPDATE employee_stats
+            SET level_sum = level_sum - COALESCE(OLD.current_level, 0),
+                skill_count = skill_count - (OLD.current_level IS NOT NULL)
+            WHERE employee_id = OLD.employee_id;
+            UPDATE employee_stats
+            SET level_sum = level_sum + COALESCE(NEW.current_level, 0),
+                skill_count = skill_count + (NEW.current_level IS NOT NULL)
+            WHERE employee_id = NEW.employee_id;
+        END''',
+    'trg_stats_skill_delete': '''
+        AFTER DELETE ON employee_skills
+        BEGIN
+            UPDATE employee_stats
+            SET level_sum = level_sum - COALESCE(OLD.current_level, 0),
+                skill_count = skill_count - (OLD.current_level IS NOT NULL)
+            WHERE employee_id = OLD.employee_id;
+        END''',
+    'trg_stats_certification_insert': '''
+        AFTER INSERT ON certifications WHEN NEW.status = 'active'
+        BEGIN
+            UPDATE employee_stats SET active_certifications = active_certifications + 1
+            WHERE employee_id = NEW.employee_id;
+        END''',
+    'trg_stats_certification_update': '''
+        AFTER UPDATE OF employee_id, status ON certifications
+        BEGIN
+            UPDATE employee_stats SET active_certifications = active_certifications - (OLD.status = 'active')
+            WHERE employee_id = OLD.employee_id;
+            UPDATE employee_stats SET active_certifications = active_certifications + (NEW.status = 'active')
+            WHERE employee_id = NEW.employee_id;
+        END''',
+    'trg_stats_certification_delete': '''
+        AFTER DELETE ON certifications WHEN OLD.status = 'active'
+        BEGIN
+            UPDATE employee_stats SET active_certifications = active_certifications - 1
+            WHERE employee_id = OLD.employee_id;
+        END''',
+    'trg_stats_rollup_insert': f'''
+        AFTER INSERT ON employee_stats
+        BEGIN
+            INSERT INTO department_stats (department, employee_count, level_sum, skill_count, active_certifications)
+            VALUES (NEW.department, 1, NEW.level_sum, NEW.skill_count, NEW.active_certifications)
+            ON CONFLICT (department) DO UPDATE SET
+                employee_count = employee_count + 1,
+                level_sum = level_sum + excluded.level_sum,
+                skill_count = skill_count + excluded.skill_count,
+                active_certifications = active_certifications + excluded.active_certifications;
+            INSERT INTO department_score_histogram (department, bucket, employee_count)
+            VALUES (NEW.department, {SCORE_BUCKET_SQL.format(row='NEW')}, 1)
+            ON CONFLICT (department, bucket) DO UPDATE SET employee_count = employee_count + 1;
+        END''',
+    'trg_stats_rollup_update': f'''
+        AFTER UPDATE ON employee_stats
+        BEGIN
+            UPDATE department_stats SET
+                employee_count = employee_count - 1,
+                level_sum = level_sum - OLD.level_sum,
+                skill_count = skill_count - OLD.skill_count,
+                active_certifications = active_certifications - OLD.active_certifications
+            WHERE department = OLD.department;
+            UPDATE department_score_histogram SET employee_count = employee_count - 1
+            WHERE department = OLD.department AND bucket = {SCORE_BUCKET_SQL.format(row='OLD')};
+            INSERT INTO department_stats (department, employee_count, level_sum, skill_count, active_certifications)
+            VALUES (NEW.department, 1, NEW.level_sum, NEW.skill_count, NEW.active_certifications)
+            ON CONFLICT (department) DO UPDATE SET
+                employee_count = employee_count + 1,
+                level_sum = level_sum + excluded.level_sum,
+                skill_count = skill_count + excluded.skill_count,
+                active_certifications = active_certifications + excluded.active_certifications;
+            INSERT INTO department_score_histogram (department, bucket, employee_count)
+            VALUES (NEW.department, {SCORE_BUCKET_SQL.format(row='NEW')}, 1)
+            ON CONFLICT (department, bucket) DO UPDATE SET employee_count = employee_count + 1;
+        END''',
+    'trg_stats_rollup_delete': f'''
+        AFTER DELETE ON employee_stats
+        BEGIN
+            UPDATE department_stats SET
+                employee_count = employee_count - 1,
+                level_sum = level_sum - OLD.level_sum,
+                skill_count = skill_count - OLD.skill_count,
+                active_certifications = active_certifications - OLD.active_certifications
+            WHERE department = OLD.department;
+            UPDATE department_score_histogram SET employee_count = employee_count - 1
+            WHERE department = OLD.department AND bucket = {SCORE_BUCKET_SQL.format(row='OLD')};
+        END''',
+}
+
+# Tables whose writes are counted in `table_versions`, with the column naming
+# the employee a row belongs to (None: the rows are shared by every employee).
+# Consumers such as the competency calculator compare versions to tell which
+# memoized results a write made stale.
+VERSIONED_TABLES = {
+    'employees': 'id',
+    'skills': None,
+    'employee_skills': 'employee_id',
+    'certifications': 'employee_id',
+    'course_enrollments': 'employee_id',
+    'learning_activities': 'employee_id',
+}
+
+def _version_bump(table: str, employee: str) -> str:
+    """Statement adding one to a (scope, table) version; '' scopes the whole table"""
+    return f'''
+            INSERT INTO table_versions (employee_id, table_name) VALUES ({employee}, '{table}')
+            ON CONFLICT (employee_id, table_name) DO UPDATE SET version = version + 1;'''
+
+def _table_version_triggers() -> Dict[str, str]:
+    triggers = {}
+    for table, column in VERSIONED_TABLES.items():
+        new, old = (f'NEW.{column}', f'OLD.{column}') if column else ("''", "''")
+        # A new shared row (a skill nobody holds yet) changes no employee's data
+        if column is not None:
+            triggers[f'trg_version_{table}_insert'] = f'''
+        AFTER INSERT ON {table}
+        BEGIN{_version_bump(table, new)}
+        END'''
+        # A row moved to another employee changes both employees' data
+        moved = '' if column is None else f'''
+            INSERT INTO table_versions (employee_id, table_name)
+            SELECT {old}, '{table}' WHERE {old} IS NOT {new}
+            ON CONFLICT (employee_id, table_name) DO UPDATE SET version = version + 1;'''
+        triggers[f'trg_version_{table}_update'] = f'''
+        AFTER UPDATE ON {table}
+        BEGIN{_version_bump(table, new)}{moved}
+        END'''
+        triggers[f'trg_version_{table}_delete'] = f'''
+        AFTER DELETE ON {table}
+        BEGIN{_version_bump(table, old)}
+        END'''
+    return triggers
+
+# Triggers that keep table_versions current
+TABLE_VERSION_TRIGGERS = _table_version_triggers()
+
+def bump_table_versions(cursor: sqlite3.Cursor, tables):
+    """Mark every row of `tables` as changed, for writes made with the triggers off"""
+    for table in tables:
+        if table in VERSIONED_TABLES:
+            cursor.execute(_version_bump(table, "''"))
+
+# Basic-info columns of a profile, in `employees` column order
+PROFILE_FIELDS = ('id', 'name', 'email', 'department', 'position', 'hire_date', 'photo_url', 'years_experience')
+
+# Sections that can be loaded eagerly, lazily or not at all
+PROFILE_SECTIONS = ('skills', 'certifications')
+
+# Column order of the rows taken by `add_learning_activities`
+LEARNING_ACTIVITY_COLUMNS = ('id', 'employee_id', 'activity_type', 'activity_name', 'hours_spent', 'date', 'notes')
+
+def _new_id() -> str:
+    """Random UUID row id"""
+    return str(uuid.uuid4())
+
+def _id_factory(rng, seed: int = None):
+    """Row id generator: random UUIDs, reproducible ones when seeded"""
+    if seed is None:
+        return _new_id
+    return lambda: str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+class LazyProfile(dict):
+    """Profile dict whose deferred sections are loaded on first access.
+    
+    Indexing a header field never touches the database. Anything that looks
+    at the profile as a whole (iteration, `keys`/`values`/`items`, `len`,
+    comparison, `copy`, `json.dumps`, `dict(profile)`) first loads every
+    deferred section, so it always sees the complete profile. `in` reports
+    deferred sections as present without loading them.
+    """
+    
+    def __init__(self, data: Dict, deferred: List[str], loader):
+        super().__init__(data)
+        self._deferred = set(deferred)
+        self._loader = loader
+    
+    def __missing__(self, key):
+        if key not in self._deferred:
+            raise KeyError(key)
+        self._deferred.discard(key)
+        value = self[key] = self._loader(key)
+        return value
+    
+    def __contains__(self, key):
+        return key in self._deferred or super().__contains__(key)
+    
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+    
+    def load_all(self) -> Dict:
+        """Load every deferred section and return the profile"""
+        for section in list(self._deferred):
+            self[section]
+        return self
+    
+    def __iter__(self):
+        return super(LazyProfile, self.load_all()).__iter__()
+    
+    def __len__(self):
+        return super(LazyProfile, self.load_all()).__len__()
+    
+    def __eq__(self, other):
+        return super(LazyProfile, self.load_all()).__eq__(other)
+    
+    def __ne__(self, other):
+        return super(LazyProfile, self.load_all()).__ne__(other)
+    
+    def __repr__(self):
+        return super(LazyProfile, self.load_all()).__repr__()
+    
+    def keys(self):
+        return super(LazyProfile, self.load_all()).keys()
+    
+    def values(self):
+        return super(LazyProfile, self.load_all()).values()
+    
+    def items(self):
+        return super(LazyProfile, self.load_all()).items()
+    
+    def copy(self) -> Dict:
+        return dict(self.items())
+    
+    def __reduce__(self):
+        # The loader is a closure; pickle the complete profile as a plain dict
+        return dict, (self.copy(),)
+
+class IdentityCache:
+    """Bounded LRU map from normalized login email to employee id"""
+    
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._ids = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, email: str) -> Optional[str]:
+        with self._lock:
+            employee_id = self._ids.get(email)
+            if employee_id is not None:
+                self._ids.move_to_end(email)
+            return employee_id
+    
+    def put(self, email: str, employee_id: str):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._ids[email] = employee_id
+            self._ids.move_to_end(email)
+            while len(self._ids) > self.max_entries:
+                self._ids.popitem(last=False)
+    
+    def discard_email(self, email: str):
+        with self._lock:
+            self._ids.pop(email, None)
+    
+    def discard_employee(self, employee_id: str):
+        with self._lock:
+            for email in [e for e, i in self._ids.items() if i == employee_id]:
+                del self._ids[email]
+    
+    def clear(self):
+        with self._lock:
+            self._ids.clear()
 
 class EmployeeDashboardDB:
-    def __init__(self, db_path: str = "employee_dashboard.db"):
+    def __init__(self, db_path: str = "employee_dashboard.db", read_replica: bool = False,
+                 replica_refresh_interval: float = 1.0, response_cache: bool = False,
+                 identity_cache_size: int = 1024, write_behind: bool = False,
+                 write_batch_size: int = 64, write_max_latency: float = 0.005,
+                 catalog_cache_size: int = 256, catalog_cache_ttl: float = 300.0,
+                 score_cache_size: int = 100000, score_cache_max_age: float = 300.0):
         self.db_path = db_path
-        self.init_database()
+        self._ensure_schema()
+        
+        # Optional in-memory replica: reads are served from a shared-cache
+        # copy, writes still go to disk. External writes become visible within
+        # `replica_refresh_interval` seconds; this instance's own writes on the
+        # next read.
+        self.replica = None
+        if read_replica:
+            from read_replica import ReadReplica
+            self.replica = ReadReplica(db_path, replica_refresh_interval)
+        
+        # Optional cache of encoded JSON responses, see `get_json`
+        self.response_cache = None
+        if response_cache:
+            from response_cache import ResponseCache
+            self.response_cache = ResponseCache()
+        
+        # Login email -> employee id, invalidated by writes to `employees`
+        self.identity_cache = IdentityCache(identity_cache_size)
+        
+        # Course catalog query results, invalidated by writes to
+        # `training_courses` and after `catalog_cache_ttl` seconds at most
+        self.catalog_cache = CatalogCache(catalog_cache_size, catalog_cache_ttl)
+        
+        # Six-factor competency scores shown in profiles and listings. Scores
+        # older than `score_cache_max_age` seconds, or whose inputs this
+        # instance wrote, are served while a background thread refreshes them,
+        # and employees without a score yet show None until it is computed there;
+        # cached profile responses are dropped when a refresh changes a score.
+        self.score_cache = ScoreCache(db_path, score_cache_max_age, score_cache_size,
+                                      on_change=self._on_scores_changed)
+        
+        # Maps new skill names onto existing skills ("React.js" -> "React")
+        self.skill_canonicalizer = SkillCanonicalizer()
+        
+        # Callbacks run by `_after_write`, see `add_write_listener`
+        self._write_listeners = []
+        
+        # Optional single writer thread: mutators from many threads are
+        # coalesced into group commits of up to `write_batch_size` operations,
+        # waiting at most `write_max_latency` seconds for a batch to fill.
+        self.write_queue = None
+        if write_behind:
+            from write_queue import WriteBehindQueue
+            self.write_queue = WriteBehindQueue(
+                self._connect, write_batch_size, write_max_latency,
+                on_commit=self._after_writes
+            )
+        
+    def _after_writes(self, writes):
+        """Post-commit hook for a batch flushed by the write-behind queue"""
+        for write in writes:
+            self._after_write(*write.tables, employee_id=write.employee_id)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the on-disk database (used for all writes)"""
+        conn = sqlite3.connect(self.db_path)
+        # INSERT OR REPLACE must fire delete triggers so the statistics
+        # rollups see the replaced row leave
+        conn.execute('PRAGMA recursive_triggers = ON')
+        return conn
+    
+    def _read_connection(self) -> sqlite3.Connection:
+        """Open a connection for reads, served from the replica when enabled"""
+        if self.replica is not None:
+            return self.replica.connect()
+        return sqlite3.connect(self.db_path)
+    
+    def _after_write(self, *tables: str, employee_id: str = None):
+        """Hook run after every committed write.
+        
+        `tables` names the tables that were written and `employee_id` whose
+        rows changed, when the write only touched a single employee.
+        """
+        if self.replica is not None:
+            self.replica.invalidate()
+        if self.response_cache is not None:
+            self.response_cache.invalidate_tables(tables, employee_id)
+        if 'training_courses' in tables:
+            self.catalog_cache.bump()
+        self.score_cache.invalidate_tables(tables, employee_id)
+        if 'employees' in tables:
+            if employee_id is not None:
+                self.identity_cache.discard_employee(employee_id)
+            else:
+                self.identity_cache.clear()
+        for listener in self._write_listeners:
+            try:
+                listener(tables, employee_id)
+            except Exception as e:
+                logger.exception("Write listener failed: %s", e)
+    
+    def _on_scores_changed(self, employee_ids: List[str]):
+        if self.response_cache is not None:
+            for employee_id in employee_ids:
+                self.response_cache.invalidate('profile', employee_id)
+    
+    def add_write_listener(self, listener):
+        """Call `listener(tables, employee_id)` after every committed write.
+        
+        With write-behind enabled listeners run on the writer thread, so they
+        must not make synchronous writes (or wait on an `_async` future):
+        that deadlocks the queue. Queue the write and return instead.
+        """
+        self._write_listeners.append(listener)
+    
+    def close(self):
+        """Flush queued writes and release long-lived resources"""
+        if self.write_queue is not None:
+            self.write_queue.close()
+            self.write_queue = None
+        if self.replica is not None:
+            self.replica.close()
+            self.replica = None
+        self.score_cache.close()
+        
+    def _ensure_schema(self):
+        """Run `init_database` unless the file already has the current schema.
+        
+        A warm open costs one connection and one PRAGMA read instead of
+        re-running every CREATE ... IF NOT EXISTS statement.
+        """
+        conn = sqlite3.connect(self.db_path)
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        conn.close()
         
+        if version == SCHEMA_VERSION:
+            return
+        if version > SCHEMA_VERSION:
+            logger.warning("Database %s has schema version %d, newer than %d; leaving it as is",
+                           self.db_path, version, SCHEMA_VERSION)
+            return
+        self.init_database()
+    
     def init_database(self):
         """Initialize the database with all required tables"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         # Employees table
@@ -162,17 +631,158 @@ class EmployeeDashboardDB:
             )
         ''')
         
+        # Case-insensitive login lookups
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_employees_email_nocase
+            ON employees (email COLLATE NOCASE)
+        ''')
+        
+        # Per-employee activity windows (learning velocity, analytics)
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_learning_activities_employee_date
+            ON learning_activities (employee_id, date)
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_certifications_employee_status
+            ON certifications (employee_id, status)
+        ''')
+        
+        # Point-in-time ("as of") scoring: date-range scans per employee and
+        # org-wide learning windows without touching the table rows
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_learning_activities_date
+            ON learning_activities (date, employee_id, hours_spent)
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_certifications_employee_dates
+            ON certifications (employee_id, issue_date, expiry_date)
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_course_enrollments_employee_date
+            ON course_enrollments (employee_id, enrollment_date)
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_career_paths_employee
+            ON career_paths (employee_id, status)
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_career_milestones_path
+            ON career_milestones (career_path_id, deadline)
+        ''')
+        
+        self._create_statistics_schema(cursor)
+        
+        # Per-employee write counters, see VERSIONED_TABLES
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS table_versions (
+                employee_id TEXT NOT NULL,
+                table_name TEXT NOT NULL,
+                version INTEGER NOT NULL DEFAULT 1,
+                PRIMARY KEY (employee_id, table_name)
+            ) WITHOUT ROWID
+        ''')
+        for name, body in TABLE_VERSION_TRIGGERS.items():
+            cursor.execute(f'CREATE TRIGGER IF NOT EXISTS {name} {body}')
+        
+        # Skill aliases and their trigram index, see `_get_or_create_skill`
+        SkillCanonicalizer.create_schema(cursor)
+        
+        cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
         conn.commit()
         conn.close()
-        print("[v0] Database initialized successfully")
+        logger.info("Database initialized successfully")
     
-    def seed_sample_data(self):
-        """Populate the database with sample data for demonstration"""
-        conn = sqlite3.connect(self.db_path)
+    def _create_statistics_schema(self, cursor: sqlite3.Cursor):
+        """Create the incrementally maintained statistics tables and triggers"""
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'employee_stats'")
+        exists = cursor.fetchone() is not None
+        
+        # Per-employee rollup: skill level sum/count and active certifications
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS employee_stats (
+                employee_id TEXT PRIMARY KEY,
+                department TEXT NOT NULL,
+                level_sum INTEGER NOT NULL DEFAULT 0,
+                skill_count INTEGER NOT NULL DEFAULT 0,
+                active_certifications INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        
+        # Per-department rollup of employee_stats
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS department_stats (
+                department TEXT PRIMARY KEY,
+                employee_count INTEGER NOT NULL DEFAULT 0,
+                level_sum INTEGER NOT NULL DEFAULT 0,
+                skill_count INTEGER NOT NULL DEFAULT 0,
+                active_certifications INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        
+        # Employees per department and competency score bucket
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS department_score_histogram (
+                department TEXT NOT NULL,
+                bucket INTEGER NOT NULL,
+                employee_count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (department, bucket)
+            )
+        ''')
+        
+        for name, body in STATISTICS_TRIGGERS.items():
+            cursor.execute(f'CREATE TRIGGER IF NOT EXISTS {name} {body}')
+        
+        if not exists:
+            self._rebuild_statistics(cursor)
+    
+    def rebuild_statistics(self):
+        """Recompute the statistics tables from scratch (e.g. after a bulk load)"""
+        conn = self._connect()
+        self._rebuild_statistics(conn.cursor())
+        conn.commit()
+        conn.close()
+    
+    def _rebuild_statistics(self, cursor: sqlite3.Cursor):
+        cursor.execute('DELETE FROM employee_stats')
+        cursor.execute('DELETE FROM department_stats')
+        cursor.execute('DELETE FROM department_score_histogram')
+        # The employee_stats insert trigger fills the department rollups
+        cursor.execute('''
+            INSERT INTO employee_stats (employee_id, department, level_sum, skill_count, active_certifications)
+            SELECT e.id, e.department,
+                   COALESCE(sk.level_sum, 0), COALESCE(sk.skill_count, 0), COALESCE(ce.active_certifications, 0)
+            FROM employees e
+            LEFT JOIN (
+                SELECT employee_id, SUM(current_level) AS level_sum, COUNT(current_level) AS skill_count
+                FROM employee_skills
+                GROUP BY employee_id
+            ) sk ON sk.employee_id = e.id
+            LEFT JOIN (
+                SELECT employee_id, COUNT(*) AS active_certifications
+                FROM certifications
+                WHERE status = 'active'
+                GROUP BY employee_id
+            ) ce ON ce.employee_id = e.id
+        ''')
+    
+    def seed_sample_data(self, seed: int = None):
+        """Populate the database with sample data for demonstration.
+        
+        With a `seed`, generated ids and random values are the same on every run.
+        """
+        import random
+        rng = random.Random(seed)
+        new_id = _id_factory(rng, seed)
+        conn = self._connect()
         cursor = conn.cursor()
         
         # Sample employee
-        employee_id = str(uuid.uuid4())
+        employee_id = new_id()
         cursor.execute('''
             INSERT OR REPLACE INTO employees 
             (id, name, email, department, position, hire_date, years_experience)
@@ -194,7 +804,7 @@ class EmployeeDashboardDB:
         
         skill_ids = []
         for skill_name, category, description in skills_data:
-            skill_id = str(uuid.uuid4())
+            skill_id = new_id()
             skill_ids.append((skill_id, skill_name))
             cursor.execute('''
                 INSERT OR REPLACE INTO skills (id, name, category, description)
@@ -210,7 +820,7 @@ class EmployeeDashboardDB:
                 INSERT OR REPLACE INTO employee_skills 
                 (id, employee_id, skill_id, current_level, is_certified)
                 VALUES (?, ?, ?, ?, ?)
-            ''', (str(uuid.uuid4()), employee_id, skill_id, skill_levels[i], certifications[i]))
+            ''', (new_id(), employee_id, skill_id, skill_levels[i], certifications[i]))
         
         # Sample certifications
         cert_data = [
@@ -226,7 +836,7 @@ class EmployeeDashboardDB:
                 INSERT OR REPLACE INTO certifications 
                 (id, employee_id, name, issuer, issue_date, expiry_date, status)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (str(uuid.uuid4()), employee_id, name, issuer, issue_date, expiry_date, status))
+            ''', (new_id(), employee_id, name, issuer, issue_date, expiry_date, status))
         
         # Sample training courses
         courses_data = [
@@ -239,7 +849,7 @@ class EmployeeDashboardDB:
         
         course_ids = []
         for title, provider, description, duration, price, is_free, category, rating, students, skills in courses_data:
-            course_id = str(uuid.uuid4())
+            course_id = new_id()
             course_ids.append(course_id)
             cursor.execute('''
                 INSERT OR REPLACE INTO training_courses 
@@ -258,10 +868,10 @@ class EmployeeDashboardDB:
                 INSERT OR REPLACE INTO course_enrollments 
                 (id, employee_id, course_id, progress_percentage, status, manager_approved)
                 VALUES (?, ?, ?, ?, ?, ?)
-            ''', (str(uuid.uuid4()), employee_id, course_id, progress, status, approved))
+            ''', (new_id(), employee_id, course_id, progress, status, approved))
         
         # Sample career path
-        career_path_id = str(uuid.uuid4())
+        career_path_id = new_id()
         cursor.execute('''
             INSERT OR REPLACE INTO career_paths 
             (id, employee_id, title, current_level, target_level, progress_percentage, estimated_completion_months, priority)
@@ -282,26 +892,36 @@ class EmployeeDashboardDB:
                 INSERT OR REPLACE INTO career_milestones 
                 (id, career_path_id, title, description, status, progress_percentage, points, deadline, completion_date)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (str(uuid.uuid4()), career_path_id, title, description, status, progress, points, deadline, completion_date))
+            ''', (new_id(), career_path_id, title, description, status, progress, points, deadline, completion_date))
         
         # Sample learning activities (last 6 weeks)
         base_date = datetime.now() - timedelta(weeks=6)
         for week in range(6):
             activity_date = base_date + timedelta(weeks=week)
-            hours = random.randint(6, 18)
+            hours = rng.randint(6, 18)
             cursor.execute('''
                 INSERT OR REPLACE INTO learning_activities 
                 (id, employee_id, activity_type, activity_name, hours_spent, date)
                 VALUES (?, ?, ?, ?, ?, ?)
-            ''', (str(uuid.uuid4()), employee_id, "course", f"Week {week + 1} Learning", hours, activity_date.date()))
+            ''', (new_id(), employee_id, "course", f"Week {week + 1} Learning", hours, activity_date.date()))
+        
+        # Seeded skills skip `_get_or_create_skill`; index them for lookups
+        self.skill_canonicalizer.sync(cursor)
         
         conn.commit()
         conn.close()
-        print("[v0] Sample data seeded successfully")
+        self._after_write(*TABLES)
+        logger.info("Sample data seeded successfully")
     
-    def seed_real_employee_data(self):
-        """Populate the database with real employee data from the provided spreadsheet"""
-        conn = sqlite3.connect(self.db_path)
+    def seed_real_employee_data(self, seed: int = None):
+        """Populate the database with real employee data from the provided spreadsheet.
+        
+        With a `seed`, generated ids and random values are the same on every run.
+        """
+        import random
+        rng = random.Random(seed)
+        new_id = _id_factory(rng, seed)
+        conn = self._connect()
         cursor = conn.cursor()
         
         real_employees = [
@@ -377,7 +997,7 @@ class EmployeeDashboardDB:
                 (id, name, email, department, position, hire_date, years_experience, photo_url)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             ''', (emp["id"], emp["name"], emp["email"], emp["department"], 
-                  emp["position"], "2023-01-15", random.uniform(2.0, 6.0), 
+                  emp["position"], "2023-01-15", rng.uniform(2.0, 6.0), 
                   "/professional-woman-smiling.png"))
         
         # Create skills for all unique skills mentioned
@@ -394,8 +1014,8 @@ class EmployeeDashboardDB:
         }
         
         skill_id_map = {}
-        for skill_name in all_skills:
-            skill_id = str(uuid.uuid4())
+        for skill_name in sorted(all_skills):  # stable order for seeded ids
+            skill_id = new_id()
             skill_id_map[skill_name] = skill_id
             category = skill_categories.get(skill_name, "Technical")
             cursor.execute('''
@@ -407,134 +1027,219 @@ class EmployeeDashboardDB:
         for emp in real_employees:
             for skill_name in emp["skills"]:
                 skill_id = skill_id_map[skill_name]
-                level = random.randint(70, 95)  # High skill levels for developers
-                is_certified = random.choice([True, False])
+                level = rng.randint(70, 95)  # High skill levels for developers
+                is_certified = rng.choice([True, False])
                 
                 cursor.execute('''
                     INSERT OR REPLACE INTO employee_skills 
                     (id, employee_id, skill_id, current_level, target_level, is_certified)
                     VALUES (?, ?, ?, ?, ?, ?)
-                ''', (str(uuid.uuid4()), emp["id"], skill_id, level, 100, is_certified))
+                ''', (new_id(), emp["id"], skill_id, level, 100, is_certified))
         
         # Add certifications for employees
         for emp in real_employees:
             for cert_name in emp["certifications"]:
-                issue_date = datetime.now() - timedelta(days=random.randint(30, 730))
+                issue_date = datetime.now() - timedelta(days=rng.randint(30, 730))
                 expiry_date = issue_date + timedelta(days=730)  # 2 years validity
                 
                 cursor.execute('''
                     INSERT OR REPLACE INTO certifications 
                     (id, employee_id, name, issuer, issue_date, expiry_date, status)
                     VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (str(uuid.uuid4()), emp["id"], cert_name, "Professional Institute", 
+                ''', (new_id(), emp["id"], cert_name, "Professional Institute", 
                       issue_date.date(), expiry_date.date(), "active"))
         
         # Add sample career paths for each employee
         for emp in real_employees:
-            career_path_id = str(uuid.uuid4())
+            career_path_id = new_id()
             cursor.execute('''
                 INSERT OR REPLACE INTO career_paths 
                 (id, employee_id, title, current_level, target_level, progress_percentage, estimated_completion_months, priority)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             ''', (career_path_id, emp["id"], "Senior AI Developer", "Gen AI Developer", 
-                  "Senior Gen AI Developer", random.randint(40, 80), 12, "high"))
+                  "Senior Gen AI Developer", rng.randint(40, 80), 12, "high"))
         
         # Add some learning activities for each employee
         for emp in real_employees:
             for week in range(4):  # Last 4 weeks
                 activity_date = datetime.now() - timedelta(weeks=week)
-                hours = random.randint(8, 20)
+                hours = rng.randint(8, 20)
                 cursor.execute('''
                     INSERT OR REPLACE INTO learning_activities 
                     (id, employee_id, activity_type, activity_name, hours_spent, date)
                     VALUES (?, ?, ?, ?, ?, ?)
-                ''', (str(uuid.uuid4()), emp["id"], "skill_development", 
+                ''', (new_id(), emp["id"], "skill_development", 
                       f"Week {week + 1} AI Development", hours, activity_date.date()))
         
+        # Seeded skills skip `_get_or_create_skill`; index them for lookups
+        self.skill_canonicalizer.sync(cursor)
+        
         conn.commit()
         conn.close()
-        print("[v0] Real employee data seeded successfully")
+        self._after_write(*TABLES)
+        logger.info("Real employee data seeded successfully")
     
-    def get_employee_profile(self, employee_id: str) -> Optional[Dict]:
-        """Get complete employee profile with competency data"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def get_employee_profile(self, employee_id: str, fields: List[str] = None,
+                             sections: Tuple[str, ...] = PROFILE_SECTIONS, top_skills: int = None,
+                             active_certifications_only: bool = False, lazy: bool = False) -> Optional[Dict]:
+        """Get employee profile with competency data.
+        
+        By default this is the complete profile. Callers that need less can
+        project it: `fields` limits the basic-info columns (plus
+        'competency_score'), `sections` picks which of 'skills' and
+        'certifications' are loaded, `top_skills` keeps only the N strongest
+        skills and `active_certifications_only` drops expired ones. With
+        `lazy=True` the sections that were not requested are still available
+        and are loaded from the database on first access.
+        
+        'competency_score' is None while the employee's score has not been
+        computed yet; the shared score cache computes it in the background.
+        """
+        conn = self._read_connection()
+        try:
+            return self._load_profile(conn, employee_id, fields, sections, top_skills,
+                                      active_certifications_only, lazy)
+        finally:
+            conn.close()
+    
+    def _load_profile(self, conn: sqlite3.Connection, employee_id: str, fields: List[str] = None,
+                      sections: Tuple[str, ...] = PROFILE_SECTIONS, top_skills: int = None,
+                      active_certifications_only: bool = False, lazy: bool = False) -> Optional[Dict]:
+        """Load a (projected) profile on an existing connection"""
+        fields = list(PROFILE_FIELDS) + ['competency_score'] if fields is None else list(fields)
+        unknown = set(fields) - set(PROFILE_FIELDS) - {'competency_score'}
+        unknown |= set(sections) - set(PROFILE_SECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown profile fields or sections: {sorted(unknown)}")
+        
+        columns = ['id'] + [field for field in PROFILE_FIELDS if field in fields and field != 'id']
+        select = ', '.join(f'e.{column}' for column in columns)
         
-        # Get employee basic info
-        cursor.execute('SELECT * FROM employees WHERE id = ?', (employee_id,))
+        cursor = conn.cursor()
+        cursor.execute(f'SELECT {select} FROM employees e WHERE e.id = ?', (employee_id,))
         employee = cursor.fetchone()
         
         if not employee:
-            conn.close()
             return None
         
-        # Get employee skills
-        cursor.execute('''
+        profile = dict(zip(columns, employee))
+        if 'competency_score' in fields:
+            # Same six-factor score as the competency section, from the cache
+            profile['competency_score'] = self.score_cache.get(employee_id)
+        
+        def load_section(section: str, section_conn: sqlite3.Connection) -> List[Dict]:
+            if section == 'skills':
+                return self._load_profile_skills(section_conn, employee_id, top_skills)
+            return self._load_profile_certifications(section_conn, employee_id, active_certifications_only)
+        
+        for section in sections:
+            profile[section] = load_section(section, conn)
+        
+        if not lazy:
+            return profile
+        
+        def load_deferred(section: str) -> List[Dict]:
+            section_conn = self._read_connection()
+            try:
+                return load_section(section, section_conn)
+            finally:
+                section_conn.close()
+        
+        deferred = [section for section in PROFILE_SECTIONS if section not in sections]
+        return LazyProfile(profile, deferred, load_deferred)
+    
+    def _load_profile_skills(self, conn: sqlite3.Connection, employee_id: str, limit: int = None) -> List[Dict]:
+        cursor = conn.cursor()
+        query = '''
             SELECT s.name, s.category, es.current_level, es.target_level, es.is_certified
             FROM employee_skills es
             JOIN skills s ON es.skill_id = s.id
             WHERE es.employee_id = ?
             ORDER BY es.current_level DESC
-        ''', (employee_id,))
-        skills = cursor.fetchall()
+        '''
+        params = [employee_id]
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+        cursor.execute(query, params)
         
-        # Get certifications
-        cursor.execute('''
+        return [skill.to_dict() for skill in fetch_models(cursor, Skill)]
+    
+    def _load_profile_certifications(self, conn: sqlite3.Connection, employee_id: str,
+                                     active_only: bool = False) -> List[Dict]:
+        cursor = conn.cursor()
+        status_filter = " AND status IN ('active', 'expiring_soon')" if active_only else ''
+        cursor.execute(f'''
             SELECT name, issuer, issue_date, expiry_date, status
             FROM certifications
-            WHERE employee_id = ?
+            WHERE employee_id = ?{status_filter}
             ORDER BY issue_date DESC
         ''', (employee_id,))
-        certifications = cursor.fetchall()
         
-        # Calculate competency score
-        if skills:
-            avg_skill_level = sum(skill[2] for skill in skills) / len(skills)
-            competency_score = int(avg_skill_level)
+        return [cert.to_dict() for cert in fetch_models(cursor, Certification)]
+    
+    def get_json(self, section: str, key: str = None, if_none_match: str = None,
+                 **params) -> Tuple[int, Optional[str], bytes]:
+        """Serve a dashboard section as encoded JSON, from the response cache.
+        
+        Sections: 'profile' and 'competency' (key = employee id) and
+        'courses' (params `category` and `search_term`). Returns
+        (status, etag, body); the status is 304 with an empty body when
+        `if_none_match` already names the current ETag, and 404 when the
+        employee does not exist.
+        """
+        if section == 'profile':
+            build = lambda: self.get_employee_profile(key)
+        elif section == 'competency':
+            build = lambda: self._calculate_competency(key)
+        elif section == 'courses':
+            key = (params.get('category'), params.get('search_term'))
+            build = lambda: self.get_training_courses(*key)
         else:
-            competency_score = 0
-        
+            raise ValueError(f"Unknown response section: {section}")
+        
+        if self.response_cache is None:
+            payload = build()
+            if payload is None:
+                return 404, None, b'null'
+            body = json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8')
+            return 200, None, body
+        return self.response_cache.get(section, key, build, if_none_match)
+    
+    def _calculate_competency(self, employee_id: str) -> Optional[Dict]:
+        conn = self._read_connection()
+        exists = conn.execute('SELECT 1 FROM employees WHERE id = ?', (employee_id,)).fetchone()
         conn.close()
-        
-        return {
-            'id': employee[0],
-            'name': employee[1],
-            'email': employee[2],
-            'department': employee[3],
-            'position': employee[4],
-            'hire_date': employee[5],
-            'photo_url': employee[6],
-            'years_experience': employee[7],
-            'competency_score': competency_score,
-            'skills': [
-                {
-                    'name': skill[0],
-                    'category': skill[1],
-                    'current_level': skill[2],
-                    'target_level': skill[3],
-                    'is_certified': bool(skill[4])
-                } for skill in skills
-            ],
-            'certifications': [
-                {
-                    'name': cert[0],
-                    'issuer': cert[1],
-                    'issue_date': cert[2],
-                    'expiry_date': cert[3],
-                    'status': cert[4]
-                } for cert in certifications
-            ]
-        }
+        if not exists:
+            return None
+        result = self.score_cache.calculator.calculate_competency_score(employee_id)
+        if result is not None:
+            self.score_cache.put(employee_id, result['overall_score'])
+        return result
     
-    def get_training_courses(self, category: str = None, search_term: str = None) -> List[Dict]:
-        """Get available training courses with optional filtering"""
-        conn = sqlite3.connect(self.db_path)
+    def get_training_courses(self, category: str = None, search_term: str = None,
+                             as_models: bool = False) -> List[Dict]:
+        """Get available training courses with optional filtering.
+        
+        With `as_models=True` the slotted `Course` rows are returned instead
+        of dicts, which is cheaper for large listings. Results come from the
+        catalog cache when possible; returned rows are shared with the cache,
+        so treat nested values such as `skills_taught` as read-only.
+        """
+        key = self.catalog_cache.key(category, search_term)
+        courses, course_dicts = self.catalog_cache.get(key, lambda: self._load_training_courses(*key))
+        if as_models:
+            return list(courses)
+        return [dict(course) for course in course_dicts]
+    
+    def _load_training_courses(self, category: str = None, search_term: str = None):
+        conn = self._read_connection()
         cursor = conn.cursor()
         
         query = 'SELECT * FROM training_courses WHERE 1=1'
         params = []
         
-        if category and category != 'all':
+        if category:
             query += ' AND category = ?'
             params.append(category)
         
@@ -545,33 +1250,20 @@ class EmployeeDashboardDB:
         query += ' ORDER BY rating DESC'
         
         cursor.execute(query, params)
-        courses = cursor.fetchall()
+        courses = tuple(fetch_models(cursor, Course))
         
         conn.close()
         
-        return [
-            {
-                'id': course[0],
-                'title': course[1],
-                'provider': course[2],
-                'description': course[3],
-                'duration_weeks': course[4],
-                'price': course[5],
-                'is_free': bool(course[6]),
-                'category': course[7],
-                'rating': course[8],
-                'total_students': course[9],
-                'skills_taught': json.loads(course[10]) if course[10] else []
-            } for course in courses
-        ]
+        # Decoded once per cache entry
+        return courses, tuple(course.to_dict() for course in courses)
     
-    def get_employee_course_progress(self, employee_id: str) -> List[Dict]:
+    def get_employee_course_progress(self, employee_id: str, as_models: bool = False) -> List[Dict]:
         """Get employee's course enrollment and progress"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._read_connection()
         cursor = conn.cursor()
         
         cursor.execute('''
-            SELECT tc.title, tc.provider, tc.category, ce.progress_percentage, 
+            SELECT tc.title, tc.provider, tc.category, ce.progress_percentage AS progress,
                    ce.status, ce.enrollment_date, ce.completion_date
             FROM course_enrollments ce
             JOIN training_courses tc ON ce.course_id = tc.id
@@ -579,80 +1271,116 @@ class EmployeeDashboardDB:
             ORDER BY ce.enrollment_date DESC
         ''', (employee_id,))
         
-        courses = cursor.fetchall()
+        courses = fetch_models(cursor, Enrollment)
         conn.close()
         
-        return [
-            {
-                'title': course[0],
-                'provider': course[1],
-                'category': course[2],
-                'progress': course[3],
-                'status': course[4],
-                'enrollment_date': course[5],
-                'completion_date': course[6]
-            } for course in courses
-        ]
+        return courses if as_models else [course.to_dict() for course in courses]
     
     def get_career_path_data(self, employee_id: str) -> Dict:
         """Get employee's career path information"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._read_connection()
         cursor = conn.cursor()
         
         # Get career paths
         cursor.execute('''
-            SELECT id, title, current_level, target_level, progress_percentage, 
-                   estimated_completion_months, priority, status
+            SELECT id, title, current_level, target_level, progress_percentage AS progress,
+                   estimated_completion_months AS estimated_months, priority, status
             FROM career_paths
             WHERE employee_id = ? AND status = 'active'
         ''', (employee_id,))
         
-        paths = cursor.fetchall()
-        
-        career_data = {
-            'paths': [
-                {
-                    'id': path[0],
-                    'title': path[1],
-                    'current_level': path[2],
-                    'target_level': path[3],
-                    'progress': path[4],
-                    'estimated_months': path[5],
-                    'priority': path[6],
-                    'status': path[7]
-                } for path in paths
-            ],
-            'milestones': []
+        paths = [path.to_dict() for path in fetch_models(cursor, CareerPath)]
+        
+        # Milestones of every active path in one query, grouped in memory
+        cursor.row_factory = None
+        cursor.execute('''
+            SELECT m.career_path_id, m.title, m.description, m.status, m.progress_percentage AS progress,
+                   m.points, m.deadline, m.completion_date
+            FROM career_milestones m
+            JOIN career_paths p ON p.id = m.career_path_id
+            WHERE p.employee_id = ? AND p.status = 'active'
+            ORDER BY m.deadline ASC
+        ''', (employee_id,))
+        
+        milestones_by_path = {path['id']: [] for path in paths}
+        for milestone in fetch_models(cursor, Milestone):
+            milestones_by_path[milestone.career_path_id].append(milestone.to_dict())
+        
+        conn.close()
+        
+        for path in paths:
+            path['milestones'] = milestones_by_path[path['id']]
+        
+        return {
+            'paths': paths,
+            # Kept for existing callers: milestones of the first path
+            'milestones': paths[0]['milestones'] if paths else []
         }
+    
+    def get_career_progress_report(self, department: str = None) -> Dict:
+        """Org-wide career progress per department in a single set-based query"""
+        conn = self._read_connection()
+        cursor = conn.cursor()
         
-        # Get milestones for the first career path (if any)
-        if paths:
-            cursor.execute('''
-                SELECT title, description, status, progress_percentage, points, deadline, completion_date
+        query = '''
+            WITH milestone_totals AS (
+                SELECT career_path_id,
+                       COUNT(*) AS milestones,
+                       SUM(status = 'completed') AS completed,
+                       SUM(points) AS points_total,
+                       SUM(CASE WHEN status = 'completed' THEN points ELSE 0 END) AS points_earned,
+                       SUM(status != 'completed' AND deadline < date('now')) AS overdue
                 FROM career_milestones
-                WHERE career_path_id = ?
-                ORDER BY deadline ASC
-            ''', (paths[0][0],))
-            
-            milestones = cursor.fetchall()
-            career_data['milestones'] = [
-                {
-                    'title': milestone[0],
-                    'description': milestone[1],
-                    'status': milestone[2],
-                    'progress': milestone[3],
-                    'points': milestone[4],
-                    'deadline': milestone[5],
-                    'completion_date': milestone[6]
-                } for milestone in milestones
-            ]
+                GROUP BY career_path_id
+            )
+            SELECT e.department,
+                   COUNT(DISTINCT e.id),
+                   COUNT(p.id),
+                   SUM(p.progress_percentage),
+                   SUM(COALESCE(mt.milestones, 0)),
+                   SUM(COALESCE(mt.completed, 0)),
+                   SUM(COALESCE(mt.points_total, 0)),
+                   SUM(COALESCE(mt.points_earned, 0)),
+                   SUM(COALESCE(mt.overdue, 0)),
+                   COUNT(CASE WHEN mt.overdue > 0 THEN 1 END)
+            FROM career_paths p
+            JOIN employees e ON e.id = p.employee_id
+            LEFT JOIN milestone_totals mt ON mt.career_path_id = p.id
+            WHERE p.status = 'active'
+        '''
+        params = []
+        if department:
+            query += ' AND e.department = ?'
+            params.append(department)
+        query += ' GROUP BY e.department ORDER BY e.department'
         
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
         conn.close()
-        return career_data
+        
+        def summarize(employees, paths, progress_sum, milestones, completed, points_total,
+                      points_earned, overdue, paths_with_overdue):
+            return {
+                'employees_with_paths': employees,
+                'active_paths': paths,
+                'average_path_progress': round(progress_sum / paths, 1) if paths else 0,
+                'milestones': milestones,
+                'completed_milestones': completed,
+                'milestone_completion_rate': round(completed / milestones * 100, 1) if milestones else 0,
+                'points_total': points_total,
+                'points_earned': points_earned,
+                'overdue_milestones': overdue,
+                'paths_with_overdue_milestones': paths_with_overdue
+            }
+        
+        return {
+            'departments': {row[0]: summarize(*row[1:]) for row in rows},
+            'totals': summarize(*[sum(row[i] or 0 for row in rows) for i in range(1, 10)])
+        }
     
     def get_analytics_data(self, employee_id: str) -> Dict:
         """Generate analytics and insights data"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._read_connection()
         cursor = conn.cursor()
         
         # Get learning activity data
@@ -705,249 +1433,430 @@ class EmployeeDashboardDB:
         }
     
     def authenticate_employee(self, email: str) -> Optional[Dict]:
-        """Authenticate employee by email and return their profile"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT id FROM employees WHERE email = ?', (email,))
-        result = cursor.fetchone()
+        """Authenticate employee by email (case-insensitive) and return their profile.
+        
+        The profile is a plain dict with the same content as
+        `get_employee_profile`, read on a single connection, so it can be
+        stored in a session or pickled as is.
+        """
+        normalized = (email or '').strip().lower()
+        if not normalized:
+            return None
         
-        if result:
+        conn = self._read_connection()
+        try:
+            employee_id = self.identity_cache.get(normalized)
+            if employee_id is not None:
+                profile = self._load_profile(conn, employee_id)
+                if profile is not None and profile['email'].lower() == normalized:
+                    return profile
+                # Removed or re-addressed behind our back
+                self.identity_cache.discard_email(normalized)
+            
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id FROM employees
+                WHERE email = ? COLLATE NOCASE
+                ORDER BY email = ? DESC
+                LIMIT 1
+            ''', (normalized, email.strip()))
+            result = cursor.fetchone()
+            if not result:
+                return None
+            
             employee_id = result[0]
+            self.identity_cache.put(normalized, employee_id)
+            return self._load_profile(conn, employee_id)
+        finally:
             conn.close()
-            return self.get_employee_profile(employee_id)
-        
-        conn.close()
-        return None
     
-    def get_all_employees(self) -> List[Dict]:
-        """Get list of all employees for login selection"""
-        conn = sqlite3.connect(self.db_path)
+    def get_all_employees(self, as_models: bool = False) -> List[Dict]:
+        """Get list of all employees for login selection.
+        
+        `competency_score` is None for employees whose score is still being
+        computed in the background.
+        """
+        conn = self._read_connection()
         cursor = conn.cursor()
         
-        cursor.execute('SELECT id, name, email, department, position FROM employees ORDER BY name')
-        employees = cursor.fetchall()
+        cursor.execute('''
+            SELECT id, name, email, department, position, NULL AS competency_score
+            FROM employees ORDER BY name
+        ''')
+        employees = fetch_models(cursor, Employee)
         
         conn.close()
+        self._fill_competency_scores(employees)
         
-        return [
-            {
-                'id': emp[0],
-                'name': emp[1], 
-                'email': emp[2],
-                'department': emp[3],
-                'position': emp[4]
-            } for emp in employees
-        ]
+        return employees if as_models else [emp.to_dict() for emp in employees]
     
     def add_employee(self, employee_data: Dict) -> str:
         """Add a new employee to the database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        return self.add_employee_async(employee_data).result()
+    
+    def add_employee_async(self, employee_data: Dict) -> Future:
+        """Queue `add_employee`; the future resolves to the new ID or None"""
+        employee_id = _new_id()
         
-        employee_id = str(uuid.uuid4())
+        def on_success(_):
+            logger.info("Employee %s added successfully with ID: %s", employee_data['name'], employee_id)
+            return employee_id
         
-        try:
-            cursor.execute('''
-                INSERT INTO employees 
-                (id, name, email, department, position, hire_date, years_experience, photo_url)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                employee_id,
-                employee_data['name'],
-                employee_data['email'],
-                employee_data['department'],
-                employee_data['position'],
-                employee_data.get('hire_date', datetime.now().date()),
-                employee_data.get('years_experience', 0),
-                employee_data.get('photo_url', '/professional-woman-smiling.png')
-            ))
-            
-            # Add skills if provided
-            if 'skills' in employee_data:
-                for skill_name in employee_data['skills']:
-                    # Create skill if it doesn't exist
-                    skill_id = self._get_or_create_skill(skill_name)
-                    
-                    # Add employee skill
-                    cursor.execute('''
-                        INSERT INTO employee_skills 
-                        (id, employee_id, skill_id, current_level, target_level, is_certified)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (
-                        str(uuid.uuid4()),
-                        employee_id,
-                        skill_id,
-                        employee_data.get('skill_level', 70),
-                        100,
-                        False
-                    ))
-            
-            # Add certifications if provided
-            if 'certifications' in employee_data:
-                for cert_name in employee_data['certifications']:
-                    cursor.execute('''
-                        INSERT INTO certifications 
-                        (id, employee_id, name, issuer, issue_date, expiry_date, status)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        str(uuid.uuid4()),
-                        employee_id,
-                        cert_name,
-                        'Professional Institute',
-                        datetime.now().date(),
-                        (datetime.now() + timedelta(days=730)).date(),
-                        'active'
-                    ))
+        def on_error(e):
+            if not isinstance(e, sqlite3.IntegrityError):
+                raise e
+            logger.error("Error adding employee: %s", e)
+            return None
+        
+        tables = ['employees', 'employee_skills', 'certifications', 'career_paths']
+        
+        def insert(cursor):
+            if self._insert_employee(cursor, employee_id, employee_data):
+                tables.append('skills')
+        
+        write = self._submit_write(insert, tables, employee_id)
+        return self._map_outcome(write, on_success, on_error)
+    
+    def _insert_employee(self, cursor: sqlite3.Cursor, employee_id: str, employee_data: Dict) -> bool:
+        """Insert the employee's rows; True when new skills were created"""
+        cursor.execute('''
+            INSERT INTO employees 
+            (id, name, email, department, position, hire_date, years_experience, photo_url)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            employee_id,
+            employee_data['name'],
+            employee_data['email'],
+            employee_data['department'],
+            employee_data['position'],
+            employee_data.get('hire_date', datetime.now().date()),
+            employee_data.get('years_experience', 0),
+            employee_data.get('photo_url', '/professional-woman-smiling.png')
+        ))
+        
+        # Add skills if provided
+        created_skills = False
+        if 'skills' in employee_data:
+            created_skills = self._insert_employee_skills(cursor, employee_id, employee_data)
+        
+        # Add certifications if provided
+        if 'certifications' in employee_data:
+            for cert_name in employee_data['certifications']:
+                cursor.execute('''
+                    INSERT INTO certifications 
+                    (id, employee_id, name, issuer, issue_date, expiry_date, status)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    _new_id(),
+                    employee_id,
+                    cert_name,
+                    'Professional Institute',
+                    datetime.now().date(),
+                    (datetime.now() + timedelta(days=730)).date(),
+                    'active'
+                ))
+        
+        # Create default career path
+        career_path_id = _new_id()
+        cursor.execute('''
+            INSERT INTO career_paths 
+            (id, employee_id, title, current_level, target_level, progress_percentage, estimated_completion_months, priority)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            career_path_id,
+            employee_id,
+            f"Senior {employee_data['position']}",
+            employee_data['position'],
+            f"Senior {employee_data['position']}",
+            0,
+            12,
+            'medium'
+        ))
+        return created_skills
+    
+    def _insert_employee_skills(self, cursor: sqlite3.Cursor, employee_id: str, employee_data: Dict) -> bool:
+        """Insert the employee's skill rows; True when new skills were created"""
+        created_any = False
+        for skill_name in employee_data['skills']:
+            # Create skill if it doesn't exist
+            skill_id, created = self._get_or_create_skill(skill_name, cursor)
+            created_any = created_any or created
             
-            # Create default career path
-            career_path_id = str(uuid.uuid4())
             cursor.execute('''
-                INSERT INTO career_paths 
-                (id, employee_id, title, current_level, target_level, progress_percentage, estimated_completion_months, priority)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO employee_skills 
+                (id, employee_id, skill_id, current_level, target_level, is_certified)
+                VALUES (?, ?, ?, ?, ?, ?)
             ''', (
-                career_path_id,
+                _new_id(),
                 employee_id,
-                f"Senior {employee_data['position']}",
-                employee_data['position'],
-                f"Senior {employee_data['position']}",
-                0,
-                12,
-                'medium'
+                skill_id,
+                employee_data.get('skill_level', 70),
+                100,
+                False
             ))
-            
-            conn.commit()
-            print(f"[v0] Employee {employee_data['name']} added successfully with ID: {employee_id}")
-            return employee_id
-            
-        except sqlite3.IntegrityError as e:
-            print(f"[v0] Error adding employee: {e}")
-            return None
-        finally:
-            conn.close()
+        return created_any
     
     def update_employee(self, employee_id: str, employee_data: Dict) -> bool:
         """Update an existing employee's information"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        try:
-            # Update basic employee info
-            update_fields = []
-            params = []
-            
-            for field in ['name', 'email', 'department', 'position', 'years_experience']:
-                if field in employee_data:
-                    update_fields.append(f"{field} = ?")
-                    params.append(employee_data[field])
-            
-            if update_fields:
-                params.append(employee_id)
-                cursor.execute(f'''
-                    UPDATE employees 
-                    SET {', '.join(update_fields)}
-                    WHERE id = ?
-                ''', params)
-            
-            # Update skills if provided
-            if 'skills' in employee_data:
-                # Remove existing skills
-                cursor.execute('DELETE FROM employee_skills WHERE employee_id = ?', (employee_id,))
-                
-                # Add new skills
-                for skill_name in employee_data['skills']:
-                    skill_id = self._get_or_create_skill(skill_name)
-                    cursor.execute('''
-                        INSERT INTO employee_skills 
-                        (id, employee_id, skill_id, current_level, target_level, is_certified)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (
-                        str(uuid.uuid4()),
-                        employee_id,
-                        skill_id,
-                        employee_data.get('skill_level', 70),
-                        100,
-                        False
-                    ))
-            
-            conn.commit()
-            print(f"[v0] Employee {employee_id} updated successfully")
+        return self.update_employee_async(employee_id, employee_data).result()
+    
+    def update_employee_async(self, employee_id: str, employee_data: Dict) -> Future:
+        """Queue `update_employee`; the future resolves to True or False"""
+        def on_success(_):
+            logger.info("Employee %s updated successfully", employee_id)
             return True
-            
-        except Exception as e:
-            print(f"[v0] Error updating employee: {e}")
+        
+        def on_error(e):
+            logger.error("Error updating employee: %s", e)
             return False
-        finally:
-            conn.close()
+        
+        tables = ['employees']
+        if 'skills' in employee_data:
+            tables.append('employee_skills')
+        
+        def update(cursor):
+            if self._update_employee_rows(cursor, employee_id, employee_data):
+                tables.append('skills')
+        
+        write = self._submit_write(update, tables, employee_id)
+        return self._map_outcome(write, on_success, on_error)
     
-    def remove_employee(self, employee_id: str) -> bool:
-        """Remove an employee and all related data"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def _update_employee_rows(self, cursor: sqlite3.Cursor, employee_id: str, employee_data: Dict) -> bool:
+        """Apply the update; True when new skills were created"""
+        # Update basic employee info
+        update_fields = []
+        params = []
         
-        try:
-            # Get employee name for logging
-            cursor.execute('SELECT name FROM employees WHERE id = ?', (employee_id,))
-            result = cursor.fetchone()
-            employee_name = result[0] if result else "Unknown"
-            
-            # Remove all related data (cascading delete)
-            tables_to_clean = [
-                'learning_activities',
-                'career_milestones',
-                'career_paths', 
-                'course_enrollments',
-                'certifications',
-                'employee_skills',
-                'employees'
-            ]
+        for field in ['name', 'email', 'department', 'position', 'years_experience']:
+            if field in employee_data:
+                update_fields.append(f"{field} = ?")
+                params.append(employee_data[field])
+        
+        if update_fields:
+            params.append(employee_id)
+            cursor.execute(f'''
+                UPDATE employees 
+                SET {', '.join(update_fields)}
+                WHERE id = ?
+            ''', params)
+        
+        # Update skills if provided
+        if 'skills' in employee_data:
+            # Remove existing skills
+            cursor.execute('DELETE FROM employee_skills WHERE employee_id = ?', (employee_id,))
             
-            for table in tables_to_clean:
-                if table == 'career_milestones':
-                    # Special handling for career milestones
-                    cursor.execute('''
-                        DELETE FROM career_milestones 
-                        WHERE career_path_id IN (
-                            SELECT id FROM career_paths WHERE employee_id = ?
-                        )
-                    ''', (employee_id,))
-                else:
-                    cursor.execute(f'DELETE FROM {table} WHERE employee_id = ?', (employee_id,))
-            
-            conn.commit()
-            print(f"[v0] Employee {employee_name} ({employee_id}) removed successfully")
+            # Add new skills
+            return self._insert_employee_skills(cursor, employee_id, employee_data)
+        return False
+    
+    def remove_employee(self, employee_id: str) -> bool:
+        """Remove an employee and all related data"""
+        return self.remove_employee_async(employee_id).result()
+    
+    def remove_employee_async(self, employee_id: str) -> Future:
+        """Queue `remove_employee`; the future resolves to True or False"""
+        def on_success(employee_name):
+            logger.info("Employee %s (%s) removed successfully", employee_name, employee_id)
             return True
-            
-        except Exception as e:
-            print(f"[v0] Error removing employee: {e}")
+        
+        def on_error(e):
+            logger.error("Error removing employee: %s", e)
             return False
-        finally:
-            conn.close()
+        
+        write = self._submit_write(
+            lambda cursor: self._delete_employee_rows(cursor, employee_id),
+            EMPLOYEE_TABLES,
+            employee_id
+        )
+        return self._map_outcome(write, on_success, on_error)
     
-    def _get_or_create_skill(self, skill_name: str) -> str:
-        """Get existing skill ID or create new skill"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def _delete_employee_rows(self, cursor: sqlite3.Cursor, employee_id: str) -> str:
+        # Get employee name for logging
+        cursor.execute('SELECT name FROM employees WHERE id = ?', (employee_id,))
+        result = cursor.fetchone()
+        employee_name = result[0] if result else "Unknown"
+        
+        # Remove all related data (cascading delete)
+        for table in EMPLOYEE_TABLES:
+            if table == 'career_milestones':
+                # Special handling for career milestones
+                cursor.execute('''
+                    DELETE FROM career_milestones 
+                    WHERE career_path_id IN (
+                        SELECT id FROM career_paths WHERE employee_id = ?
+                    )
+                ''', (employee_id,))
+            elif table == 'employees':
+                cursor.execute('DELETE FROM employees WHERE id = ?', (employee_id,))
+            else:
+                cursor.execute(f'DELETE FROM {table} WHERE employee_id = ?', (employee_id,))
+        
+        return employee_name
+    
+    def add_learning_activities(self, rows: List[Tuple]) -> int:
+        """Bulk-insert learning activities and return how many were new.
+        
+        `rows` are tuples in LEARNING_ACTIVITY_COLUMNS order; rows whose id
+        already exists are skipped, so replaying a batch is harmless.
+        """
+        return self.add_learning_activities_async(rows).result()
+    
+    def add_learning_activities_async(self, rows: List[Tuple]) -> Future:
+        """Queue `add_learning_activities`; the future resolves to the number inserted"""
+        rows = list(rows)
+        
+        def insert(cursor):
+            cursor.executemany(f'''
+                INSERT OR IGNORE INTO learning_activities ({', '.join(LEARNING_ACTIVITY_COLUMNS)})
+                VALUES ({', '.join('?' * len(LEARNING_ACTIVITY_COLUMNS))})
+            ''', rows)
+            return cursor.rowcount
+        
+        def on_success(inserted):
+            # A batch spans many employees: invalidate each of them rather
+            # than every employee's cached data
+            for employee_id in {row[1] for row in rows}:
+                self._after_write('learning_activities', employee_id=employee_id)
+            return inserted
+        
+        def on_error(e):
+            raise e
+        
+        return self._map_outcome(self._submit_write(insert), on_success, on_error)
+    
+    def _get_or_create_skill(self, skill_name: str, cursor: sqlite3.Cursor = None) -> Tuple[str, bool]:
+        """Get existing skill ID or create new skill: (skill id, created).
+        
+        Pass the cursor of the surrounding write so the lookup and insert
+        join its transaction; without one the skill is created as a write of
+        its own. Writers report 'skills' as written only when `created`.
+        """
+        if cursor is None:
+            # A brand-new skill is not referenced by any cached response yet
+            return self._submit_write(lambda c: self._get_or_create_skill(skill_name, c)).result()
         
         # Check if skill exists
         cursor.execute('SELECT id FROM skills WHERE name = ?', (skill_name,))
         result = cursor.fetchone()
         
         if result:
-            skill_id = result[0]
-        else:
-            # Create new skill
-            skill_id = str(uuid.uuid4())
-            category = self._categorize_skill(skill_name)
-            cursor.execute('''
-                INSERT INTO skills (id, name, category, description)
-                VALUES (?, ?, ?, ?)
-            ''', (skill_id, skill_name, category, f"Professional skill in {skill_name}"))
+            return result[0], False
+        
+        # Spelling variant or alias of an existing skill
+        skill_id = self.skill_canonicalizer.resolve(cursor, skill_name)
+        if skill_id:
+            return skill_id, False
+        
+        # Create new skill
+        skill_id = _new_id()
+        category = self._categorize_skill(skill_name)
+        cursor.execute('''
+            INSERT INTO skills (id, name, category, description)
+            VALUES (?, ?, ?, ?)
+        ''', (skill_id, skill_name, category, f"Professional skill in {skill_name}"))
+        self.skill_canonicalizer.register(cursor, skill_id, skill_name)
+        return skill_id, True
+    
+    def resolve_skill(self, skill_name: str) -> Optional[Dict]:
+        """The existing skill a name refers to, matching aliases and close spellings"""
+        conn = self._read_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('SELECT id FROM skills WHERE name = ? COLLATE NOCASE', (skill_name,))
+            row = cursor.fetchone()
+            # A lookup, not a write: fuzzy matches are not stored as aliases here
+            skill_id = row[0] if row else self.skill_canonicalizer.resolve(cursor, skill_name, learn=False)
+            if skill_id is None:
+                return None
+            cursor.execute('SELECT id, name, category FROM skills WHERE id = ?', (skill_id,))
+            return dict(zip(('id', 'name', 'category'), cursor.fetchone()))
+        finally:
+            conn.close()
+    
+    def add_skill_alias(self, alias: str, skill_name: str) -> bool:
+        """Make `alias` resolve to the existing skill `skill_name`"""
+        def add(cursor):
+            cursor.execute('SELECT id FROM skills WHERE name = ? COLLATE NOCASE', (skill_name,))
+            row = cursor.fetchone()
+            if row is None:
+                raise ValueError(f"Unknown skill: {skill_name}")
+            return self.skill_canonicalizer.register(cursor, row[0], alias, 'manual')
+        
+        return self._submit_write(add).result()
+    
+    def merge_duplicate_skills(self, dry_run: bool = False) -> Dict:
+        """Fold near-duplicate skills into one canonical skill each.
+        
+        Returns the merge counts and, per canonical skill, the names merged
+        into it. With `dry_run` the plan is made on a read connection and
+        nothing is changed.
+        """
+        def merge(cursor):
+            if not dry_run:
+                # Aliases of skills added by bulk loads become mergeable too
+                self.skill_canonicalizer.sync(cursor)
+            mapping = self.skill_canonicalizer.plan_merge(cursor)
+            cursor.execute('SELECT id, name FROM skills')
+            names = dict(cursor.fetchall())
+            groups = {}
+            for old_id, new_id in mapping.items():
+                groups.setdefault(names[new_id], []).append(names[old_id])
+            
+            stats = {'skills_merged': len(mapping), 'rows_repointed': 0, 'collisions': 0}
+            if not dry_run:
+                stats = self.skill_canonicalizer.merge(cursor, mapping)
+            stats['groups'] = {name: sorted(merged) for name, merged in sorted(groups.items())}
+            return stats
+        
+        if dry_run:
+            conn = self._read_connection()
+            try:
+                return merge(conn.cursor())
+            finally:
+                conn.close()
+        return self._submit_write(merge, ('skills', 'employee_skills')).result()
+    
+    def _submit_write(self, operation, tables: Tuple[str, ...] = (), employee_id: str = None) -> Future:
+        """Run `operation(cursor)` as one transaction and return a Future.
+        
+        With the write-behind queue enabled the operation is group-committed
+        by the writer thread; otherwise it runs inline on a fresh connection.
+        Write hooks run after the commit, before the future resolves. A
+        `tables` list may be extended by the operation with tables it only
+        turned out to write while running.
+        """
+        if self.write_queue is not None:
+            return self.write_queue.submit(operation, tables, employee_id)
+        
+        future = Future()
+        conn = self._connect()
+        try:
+            result = operation(conn.cursor())
             conn.commit()
+        except Exception as e:
+            conn.rollback()
+            future.set_exception(e)
+            return future
+        finally:
+            conn.close()
         
-        conn.close()
-        return skill_id
+        self._after_write(*tables, employee_id=employee_id)
+        future.set_result(result)
+        return future
+    
+    def _map_outcome(self, write: Future, on_success, on_error) -> Future:
+        """Chain a write future into the public outcome of a mutator"""
+        outcome = Future()
+        
+        def resolve(done: Future):
+            try:
+                error = done.exception()
+                outcome.set_result(on_success(done.result()) if error is None else on_error(error))
+            except Exception as e:
+                outcome.set_exception(e)
+        
+        write.add_done_callback(resolve)
+        return outcome
     
     def _categorize_skill(self, skill_name: str) -> str:
         """Automatically categorize skills based on name"""
@@ -970,12 +1879,19 @@ class EmployeeDashboardDB:
         else:
             return 'Technical'
     
-    def search_employees(self, search_term: str = None, department: str = None) -> List[Dict]:
-        """Search employees by name, email, or department"""
-        conn = sqlite3.connect(self.db_path)
+    def search_employees(self, search_term: str = None, department: str = None,
+                         as_models: bool = False) -> List[Dict]:
+        """Search employees by name, email, or department.
+        
+        `competency_score` is None for employees whose score is still being
+        computed in the background.
+        """
+        conn = self._read_connection()
         cursor = conn.cursor()
         
-        query = 'SELECT id, name, email, department, position, hire_date FROM employees WHERE 1=1'
+        query = '''
+            SELECT id, name, email, department, position, hire_date, NULL AS competency_score
+            FROM employees WHERE 1=1'''
         params = []
         
         if search_term:
@@ -989,57 +1905,97 @@ class EmployeeDashboardDB:
         query += ' ORDER BY name'
         
         cursor.execute(query, params)
-        employees = cursor.fetchall()
+        employees = fetch_models(cursor, Employee)
         
         conn.close()
+        self._fill_competency_scores(employees)
         
-        return [
-            {
-                'id': emp[0],
-                'name': emp[1],
-                'email': emp[2],
-                'department': emp[3],
-                'position': emp[4],
-                'hire_date': emp[5]
-            } for emp in employees
-        ]
+        return employees if as_models else [emp.to_dict() for emp in employees]
+    
+    def _fill_competency_scores(self, employees: List[Employee]):
+        """Set each listed employee's score from the shared score cache (None until computed)"""
+        scores = self.score_cache.get_many([employee.id for employee in employees])
+        for employee in employees:
+            employee.competency_score = scores.get(employee.id)
     
     def get_employee_statistics(self) -> Dict:
-        """Get overall employee statistics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Total employees
-        cursor.execute('SELECT COUNT(*) FROM employees')
-        total_employees = cursor.fetchone()[0]
+        """Get overall and per-department employee statistics.
         
-        # Employees by department
-        cursor.execute('SELECT department, COUNT(*) FROM employees GROUP BY department')
-        dept_stats = cursor.fetchall()
+        Served from the trigger-maintained rollup tables, so the cost grows
+        with the number of departments rather than employees or skills.
+        """
+        return self.summarize_statistics(*self.get_statistics_rollups())
+    
+    def get_statistics_rollups(self) -> Tuple[List[Tuple], List[Tuple]]:
+        """Raw rollup rows: (department, employees, level_sum, skill_count,
+        active_certifications) and (department, bucket, employees).
+        
+        Rows from several databases can be concatenated and passed to
+        `summarize_statistics` together.
+        """
+        conn = self._read_connection()
+        cursor = conn.cursor()
         
-        # Average competency score
         cursor.execute('''
-            SELECT AVG(es.current_level) 
-            FROM employee_skills es
-            JOIN employees e ON es.employee_id = e.id
+            SELECT department, employee_count, level_sum, skill_count, active_certifications
+            FROM department_stats
+            WHERE employee_count > 0
+            ORDER BY department
         ''')
-        avg_competency = cursor.fetchone()[0] or 0
+        dept_rows = cursor.fetchall()
         
-        # Total certifications
-        cursor.execute('SELECT COUNT(*) FROM certifications WHERE status = "active"')
-        total_certifications = cursor.fetchone()[0]
+        cursor.execute('''
+            SELECT department, bucket, employee_count
+            FROM department_score_histogram
+            WHERE employee_count > 0
+        ''')
+        histogram_rows = cursor.fetchall()
         
         conn.close()
+        return dept_rows, histogram_rows
+    
+    @staticmethod
+    def summarize_statistics(dept_rows: List[Tuple], histogram_rows: List[Tuple]) -> Dict:
+        """Build the `get_employee_statistics` result from rollup rows"""
+        merged = {}
+        for department, employees, level_sum, skill_count, certifications in dept_rows:
+            totals = merged.setdefault(department, [0, 0, 0, 0])
+            totals[0] += employees
+            totals[1] += level_sum
+            totals[2] += skill_count
+            totals[3] += certifications
+        dept_rows = [(department, *merged[department]) for department in sorted(merged)]
+        
+        distributions = {}
+        for department, bucket, count in histogram_rows:
+            label = f"{bucket * 10}-{bucket * 10 + 9}"
+            buckets = distributions.setdefault(department, {})
+            buckets[label] = buckets.get(label, 0) + count
+        
+        total_level = sum(row[2] for row in dept_rows)
+        total_skills = sum(row[3] for row in dept_rows)
         
         return {
-            'total_employees': total_employees,
-            'departments': dict(dept_stats),
-            'average_competency': round(avg_competency, 1),
-            'total_certifications': total_certifications
+            'total_employees': sum(row[1] for row in dept_rows),
+            'departments': {row[0]: row[1] for row in dept_rows},
+            'average_competency': round(total_level / total_skills, 1) if total_skills else 0,
+            'total_certifications': sum(row[4] for row in dept_rows),
+            'department_details': {
+                department: {
+                    'employees': employees,
+                    'average_competency': round(level_sum / skill_count, 1) if skill_count else 0,
+                    'active_certifications': certifications,
+                    'score_distribution': {
+                        f"{low}-{low + 9}": distributions.get(department, {}).get(f"{low}-{low + 9}", 0)
+                        for low in range(0, 100, 10)
+                    }
+                } for department, employees, level_sum, skill_count, certifications in dept_rows
+            }
         }
 
 # Initialize and run the data management system
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="[v0] %(message)s")
     print("[v0] Initializing Employee Dashboard Database...")
     
     # Create database instance
@@ -0,0 +1,288 @@
+"""
+Industry Demand Multipliers
+Derives the per-category skill demand multipliers used by competency scoring
+from the organisation's own data:
+- Role requirement files (CSV with skill, role and level columns)
+- Enrollment volume per training course category
+- Skill scarcity: how few employees are proficient in a category that is in demand
+- Results cached in the `industry_demand` table, recomputed on a schedule
+- Only employees holding skills in categories whose multiplier moved are re-scored
+"""
+
+import argparse
+import csv
+import json
+import logging
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List
+
+from employee_data_manager import EmployeeDashboardDB
+from score_history import ScoreHistory
+
+logger = logging.getLogger(__name__)
+
+# Requirement levels, as accepted by the job role import API
+LEVELS = {'beginner': 1, 'junior': 2, 'intermediate': 3, 'mid': 3, 'senior': 4,
+          'advanced': 4, 'expert': 5, 'lead': 5}
+
+# Column names accepted in role requirement files
+SKILL_COLUMNS = ('skill', 'skill_name')
+LEVEL_COLUMNS = ('level', 'min_level', 'required_level')
+
+# Skill level at which an employee counts towards a category's supply
+PROFICIENT_LEVEL = 70
+
+# Most each signal (scaled to 0-1) adds on top of a neutral 1.0
+SIGNAL_WEIGHTS = {'role_demand': 0.3, 'enrollment_demand': 0.1, 'scarcity': 0.2}
+
+MIN_MULTIPLIER = 1.0
+MAX_MULTIPLIER = 1.5
+
+# Multipliers are stored to two decimals; a smaller move re-scores nobody
+TOLERANCE = 0.01
+
+class IndustryDemand:
+    def __init__(self, db: EmployeeDashboardDB, role_files: Iterable[str] = (), history: ScoreHistory = None):
+        self.db = db
+        self.role_files = list(role_files)
+        self.history = history or ScoreHistory(db)
+        self._stop = threading.Event()
+        self._thread = None
+        self.ensure_schema()
+
+    def ensure_schema(self):
+        """Create the multiplier table if it does not exist"""
+        conn = self.db._connect()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS industry_demand (
+                category TEXT PRIMARY KEY,
+                multiplier REAL NOT NULL,
+                role_demand REAL NOT NULL,
+                enrollment_demand REAL NOT NULL,
+                scarcity REAL NOT NULL,
+                computed_at INTEGER NOT NULL -- unix seconds
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    def compute(self) -> Dict[str, Dict]:
+        """Multiplier and signals of every category found in the data.
+
+        Role and enrollment demand are scaled so the most demanded category
+        gets 1.0; scarcity is the share of employees not proficient in the
+        category, counted only as far as the category is in demand.
+        """
+        conn = self.db._read_connection()
+        cursor = conn.cursor()
+        cursor.execute('SELECT name, category FROM skills')
+        skill_categories = {name.lower(): category for name, category in cursor.fetchall()}
+
+        cursor.execute('''
+            SELECT tc.category, COUNT(ce.id)
+            FROM training_courses tc
+            LEFT JOIN course_enrollments ce ON ce.course_id = tc.id
+            GROUP BY tc.category
+        ''')
+        enrollments = dict(cursor.fetchall())
+
+        cursor.execute('''
+            SELECT s.category, COUNT(DISTINCT es.employee_id)
+            FROM employee_skills es
+            JOIN skills s ON s.id = es.skill_id
+            WHERE es.current_level >= ?
+            GROUP BY s.category
+        ''', (PROFICIENT_LEVEL,))
+        proficient = dict(cursor.fetchall())
+
+        cursor.execute('SELECT category FROM skills UNION SELECT category FROM training_courses')
+        categories = {row[0] for row in cursor.fetchall()}
+
+        cursor.execute('SELECT COUNT(*) FROM employees')
+        employees = cursor.fetchone()[0]
+        conn.close()
+
+        roles = {}
+        for skill, level in self._role_requirements():
+            category = skill_categories.get(skill.lower()) or self.db._categorize_skill(skill)
+            roles[category] = roles.get(category, 0) + level
+        categories.update(roles)
+
+        role_demand = _scaled(roles)
+        enrollment_demand = _scaled(enrollments)
+
+        result = {}
+        for category in sorted(categories):
+            signals = {
+                'role_demand': role_demand.get(category, 0.0),
+                'enrollment_demand': enrollment_demand.get(category, 0.0),
+            }
+            coverage = proficient.get(category, 0) / employees if employees else 0.0
+            signals['scarcity'] = (1 - coverage) * max(signals.values())
+
+            multiplier = 1.0 + sum(SIGNAL_WEIGHTS[name] * value for name, value in signals.items())
+            result[category] = dict(
+                {name: round(value, 4) for name, value in signals.items()},
+                multiplier=round(min(MAX_MULTIPLIER, max(MIN_MULTIPLIER, multiplier)), 2)
+            )
+        return result
+
+    def stored(self) -> Dict[str, Dict]:
+        """Multipliers and signals as last computed"""
+        conn = self.db._read_connection()
+        rows = conn.execute('''
+            SELECT category, multiplier, role_demand, enrollment_demand, scarcity, computed_at
+            FROM industry_demand ORDER BY category
+        ''').fetchall()
+        conn.close()
+        return {
+            category: {'multiplier': multiplier, 'role_demand': role, 'enrollment_demand': enrollment,
+                       'scarcity': scarcity, 'computed_at': computed_at}
+            for category, multiplier, role, enrollment, scarcity, computed_at in rows
+        }
+
+    def refresh(self, tolerance: float = TOLERANCE) -> Dict:
+        """Recompute and store the multipliers, then re-score affected employees.
+
+        A category has moved when its new multiplier differs from the one
+        scoring used so far (stored or default) by at least `tolerance`.
+        Only employees with a skill in a moved category get new stored scores.
+        """
+        started = time.perf_counter()
+        before = self.history.calculator.load_industry_demand()
+        demand = self.compute()
+        moved = {
+            category: (before.get(category, 1.0), values['multiplier'])
+            for category, values in demand.items()
+            if abs(values['multiplier'] - before.get(category, 1.0)) >= tolerance - 1e-9
+        }
+
+        computed_at = int(time.time())
+        conn = self.db._connect()
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM industry_demand')
+        cursor.executemany('''
+            INSERT INTO industry_demand
+            (category, multiplier, role_demand, enrollment_demand, scarcity, computed_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', [
+            (category, values['multiplier'], values['role_demand'], values['enrollment_demand'],
+             values['scarcity'], computed_at)
+            for category, values in demand.items()
+        ])
+
+        affected = []
+        if moved:
+            placeholders = ', '.join('?' * len(moved))
+            cursor.execute(f'''
+                SELECT DISTINCT es.employee_id
+                FROM employee_skills es
+                JOIN skills s ON s.id = es.skill_id
+                WHERE s.category IN ({placeholders})
+            ''', list(moved))
+            affected = [row[0] for row in cursor.fetchall()]
+        conn.commit()
+        conn.close()
+
+        self.db._after_write('industry_demand')
+        rescored = self.history.snapshot(affected) if affected else None
+
+        return {
+            'categories': len(demand),
+            'moved': {category: list(change) for category, change in sorted(moved.items())},
+            'rescored': len(affected),
+            'changed_scores': rescored['changed'] if rescored else 0,
+            'seconds': round(time.perf_counter() - started, 3)
+        }
+
+    def start(self, interval_seconds: float = 86400.0):
+        """Refresh the multipliers every `interval_seconds` on a background thread"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.is_set():
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.exception("Industry demand refresh failed: %s", e)
+                self._stop.wait(interval_seconds)
+
+        self._thread = threading.Thread(target=run, name='industry-demand', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background refresh thread"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _role_requirements(self) -> List[tuple]:
+        """(skill, level weight) pairs from every role requirement file"""
+        requirements = []
+        for path in self.role_files:
+            with open(path, newline='', encoding='utf-8') as handle:
+                reader = csv.DictReader(handle)
+                columns = {name.strip().lower(): name for name in reader.fieldnames or ()}
+                skill_column = next((columns[c] for c in SKILL_COLUMNS if c in columns), None)
+                if skill_column is None:
+                    raise ValueError(f"{path}: no skill column (expected one of {', '.join(SKILL_COLUMNS)})")
+                level_column = next((columns[c] for c in LEVEL_COLUMNS if c in columns), None)
+                for row in reader:
+                    skill = (row[skill_column] or '').strip()
+                    if skill:
+                        requirements.append((skill, _level(row[level_column] if level_column else None)))
+        return requirements
+
+def _level(value: str = None) -> int:
+    """Requirement level 1-5 from a name or number, 3 when unknown"""
+    text = (value or '').strip().lower()
+    if text in LEVELS:
+        return LEVELS[text]
+    return int(text) if text in ('1', '2', '3', '4', '5') else 3
+
+def _scaled(volumes: Dict[str, float]) -> Dict[str, float]:
+    """Volumes divided by the largest one"""
+    top = max(volumes.values(), default=0)
+    return {category: volume / top for category, volume in volumes.items()} if top else {}
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Recompute skill category demand multipliers")
+    parser.add_argument('--db', default="employee_dashboard.db", help="SQLite database path")
+    parser.add_argument('--roles', action='append', default=[], metavar='CSV',
+                        help="Role requirement file with skill and level columns (repeatable)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('show', help="Print stored and freshly computed multipliers as JSON")
+    commands.add_parser('refresh', help="Recompute once and re-score affected employees")
+    run = commands.add_parser('run', help="Recompute on a schedule")
+    run.add_argument('--every', type=float, default=86400.0, help="Seconds between refreshes")
+
+    args = parser.parse_args(argv)
+    demand = IndustryDemand(EmployeeDashboardDB(args.db), args.roles)
+
+    if args.command == 'show':
+        print(json.dumps({'stored': demand.stored(), 'computed': demand.compute()}, indent=2))
+    elif args.command == 'refresh':
+        stats = demand.refresh()
+        print(f"[v0] {stats['categories']} categories, {len(stats['moved'])} moved; "
+              f"re-scored {stats['rescored']} employees in {stats['seconds']}s")
+        for category, (old, new) in stats['moved'].items():
+            print(f"[v0]   {category}: {old} -> {new}")
+    else:
+        print(f"[v0] Refreshing demand multipliers every {args.every}s (Ctrl+C to stop)")
+        demand.start(args.every)
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            demand.stop()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""
+Competency Leaderboards
+Top-k and rank-of queries over stored scores and skill levels:
+- Org-wide and per-department rankings from `competency_score_latest`
+- Per-skill rankings from `employee_skills.current_level`
+- Ordered indexes, so top-k reads k index entries and ranks are index range counts
+- Stored scores of employees changed through this process are refreshed before the next query
+"""
+
+import argparse
+import json
+import sys
+import threading
+from typing import Dict, List, Optional
+
+from employee_data_manager import EmployeeDashboardDB
+from response_cache import SECTION_TABLES
+from score_history import ScoreHistory
+
+# Tables a competency score is computed from. Demand multiplier refreshes
+# re-score the employees they affect themselves, see industry_demand.py.
+SCORE_TABLES = SECTION_TABLES['competency'] - {'industry_demand'}
+
+class Leaderboards:
+    def __init__(self, db: EmployeeDashboardDB, history: ScoreHistory = None):
+        self.db = db
+        self.history = history or ScoreHistory(db)
+        self._dirty = set()
+        self._all_dirty = False
+        self._lock = threading.Lock()
+
+        conn = self.db._connect()
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_employee_skills_skill_level
+            ON employee_skills (skill_id, current_level DESC, employee_id)
+        ''')
+        conn.commit()
+        has_scores = conn.execute('SELECT 1 FROM competency_score_latest LIMIT 1').fetchone() is not None
+        employees = conn.execute('SELECT 1 FROM employees LIMIT 1').fetchone() is not None
+        conn.close()
+
+        # No stored scores yet: take the first snapshot on the first query
+        self._all_dirty = employees and not has_scores
+        db.add_write_listener(self._on_write)
+
+    def top_employees(self, limit: int = 10, department: str = None) -> List[Dict]:
+        """Highest competency scores, org-wide or within one department"""
+        self.refresh()
+        condition = 'WHERE l.department = ?' if department else ''
+        params = [department] if department else []
+
+        conn = self.db._read_connection()
+        rows = conn.execute(f'''
+            SELECT l.employee_id, e.name, l.department, e.position, l.overall_score
+            FROM competency_score_latest l
+            JOIN employees e ON e.id = l.employee_id
+            {condition}
+            ORDER BY l.overall_score DESC, l.employee_id
+            LIMIT ?
+        ''', params + [limit]).fetchall()
+        conn.close()
+
+        return [dict(entry, overall_score=entry.pop('score')) for entry in _ranked(rows)]
+
+    def employee_rank(self, employee_id: str) -> Optional[Dict]:
+        """Org-wide and department rank of one employee (ties share a rank)"""
+        self.refresh()
+        conn = self.db._read_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT overall_score, department FROM competency_score_latest WHERE employee_id = ?
+        ''', (employee_id,))
+        row = cursor.fetchone()
+        if row is None:
+            conn.close()
+            return None
+        score, department = row
+
+        cursor.execute('SELECT COUNT(*) FROM competency_score_latest WHERE overall_score > ?', (score,))
+        org_rank = cursor.fetchone()[0] + 1
+        cursor.execute('SELECT COUNT(*) FROM competency_score_latest')
+        org_size = cursor.fetchone()[0]
+        cursor.execute('''
+            SELECT COUNT(*) FROM competency_score_latest WHERE department = ? AND overall_score > ?
+        ''', (department, score))
+        department_rank = cursor.fetchone()[0] + 1
+        cursor.execute('SELECT COUNT(*) FROM competency_score_latest WHERE department = ?', (department,))
+        department_size = cursor.fetchone()[0]
+        conn.close()
+
+        return {
+            'employee_id': employee_id,
+            'overall_score': score,
+            'department': department,
+            'org_rank': org_rank,
+            'org_size': org_size,
+            'department_rank': department_rank,
+            'department_size': department_size
+        }
+
+    def top_by_skill(self, skill_name: str, limit: int = 20, department: str = None) -> List[Dict]:
+        """Highest current levels in one skill, optionally within a department"""
+        conn = self.db._read_connection()
+        skill_id = self._skill_id(conn, skill_name)
+        if skill_id is None:
+            conn.close()
+            return []
+
+        condition = 'AND e.department = ?' if department else ''
+        params = [department] if department else []
+        rows = conn.execute(f'''
+            SELECT es.employee_id, e.name, e.department, e.position, es.current_level
+            FROM employee_skills es
+            JOIN employees e ON e.id = es.employee_id
+            WHERE es.skill_id = ? {condition}
+            ORDER BY es.current_level DESC, es.employee_id
+            LIMIT ?
+        ''', [skill_id] + params + [limit]).fetchall()
+        conn.close()
+
+        return [dict(entry, current_level=entry.pop('score')) for entry in _ranked(rows)]
+
+    def skill_rank(self, employee_id: str, skill_name: str) -> Optional[Dict]:
+        """Rank of one employee among everyone holding a skill"""
+        conn = self.db._read_connection()
+        cursor = conn.cursor()
+        skill_id = self._skill_id(conn, skill_name)
+        cursor.execute('''
+            SELECT current_level FROM employee_skills WHERE employee_id = ? AND skill_id = ?
+        ''', (employee_id, skill_id))
+        row = cursor.fetchone()
+        if row is None:
+            conn.close()
+            return None
+
+        cursor.execute('''
+            SELECT COUNT(*) FROM employee_skills WHERE skill_id = ? AND current_level > ?
+        ''', (skill_id, row[0]))
+        rank = cursor.fetchone()[0] + 1
+        cursor.execute('SELECT COUNT(*) FROM employee_skills WHERE skill_id = ?', (skill_id,))
+        holders = cursor.fetchone()[0]
+        conn.close()
+
+        return {'employee_id': employee_id, 'skill': skill_name, 'current_level': row[0],
+                'rank': rank, 'holders': holders}
+
+    def refresh(self, force: bool = False):
+        """Re-score employees whose inputs changed since the last query"""
+        with self._lock:
+            full = force or self._all_dirty
+            dirty = list(self._dirty)
+            self._dirty.clear()
+            self._all_dirty = False
+        if full:
+            self.history.snapshot()
+        elif dirty:
+            self.history.snapshot(dirty)
+
+    def _on_write(self, tables, employee_id: str = None):
+        if not SCORE_TABLES.intersection(tables):
+            return
+        with self._lock:
+            if employee_id is None:
+                self._all_dirty = True
+            else:
+                self._dirty.add(employee_id)
+
+    def _skill_id(self, conn, skill_name: str) -> Optional[str]:
+        row = conn.execute('SELECT id FROM skills WHERE name = ? COLLATE NOCASE', (skill_name,)).fetchone()
+        if row:
+            return row[0]
+        # "k8s" or "React.js" for a skill stored under another name
+        return self.db.skill_canonicalizer.resolve(conn.cursor(), skill_name, learn=False)
+
+def _ranked(rows) -> List[Dict]:
+    """Competition ranks ("1224") for rows ordered by score, which comes last"""
+    entries = []
+    previous = None
+    rank = 0
+    for place, (employee_id, name, department, position, score) in enumerate(rows, 1):
+        if score != previous:
+            rank = place
+            previous = score
+        entries.append({'rank': rank, 'employee_id': employee_id, 'name': name, 'department': department,
+                        'position': position, 'score': score})
+    return entries
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Competency and skill leaderboards")
+    parser.add_argument('--db', default="employee_dashboard.db", help="SQLite database path")
+    parser.add_argument('--department', help="Limit the leaderboard to one department")
+    parser.add_argument('--skill', help="Rank by level in this skill instead of competency score")
+    parser.add_argument('--limit', type=int, default=10, help="Number of entries")
+    parser.add_argument('--employee', help="Show this employee's rank instead of the top entries")
+    args = parser.parse_args(argv)
+
+    boards = Leaderboards(EmployeeDashboardDB(args.db))
+    if args.employee and args.skill:
+        result = boards.skill_rank(args.employee, args.skill)
+    elif args.employee:
+        result = boards.employee_rank(args.employee)
+    elif args.skill:
+        result = boards.top_by_skill(args.skill, args.limit, args.department)
+    else:
+        result = boards.top_employees(args.limit, args.department)
+    print(json.dumps(result, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""
+In-Memory Read Replica
+Serves read-heavy dashboard traffic from a shared-cache in-memory copy of
+the on-disk employee database:
+- Snapshots are taken with the SQLite online backup API
+- Writes keep going to disk; the replica refreshes with bounded staleness
+- Refreshes are skipped entirely while the disk file is unchanged
+- Copies are built outside the reader lock; interval refreshes run in the
+  background while readers keep using the previous snapshot
+"""
+
+import itertools
+import logging
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class ReadReplica:
+    _names = itertools.count()
+
+    def __init__(self, db_path: str, refresh_interval: float = 1.0, pages_per_step: int = 1024):
+        self.db_path = db_path
+        self.refresh_interval = refresh_interval
+        self.pages_per_step = pages_per_step
+        self.refresh_count = 0
+
+        # `_lock` guards the current snapshot and is only held briefly;
+        # `_refresh_lock` serializes the copies themselves.
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        # Long-lived source connection: used for the backup itself and for
+        # cheap `PRAGMA data_version` checks that detect commits made by any
+        # other connection (including our own write path). Only used with
+        # `_refresh_lock` held.
+        self._source = sqlite3.connect(db_path, check_same_thread=False)
+        self._anchor = None  # keeps the current in-memory database alive
+        self._uri = None
+        self._data_version = None
+        self._refreshed_at = 0.0
+        # `invalidate` bumps the generation; a snapshot is current for our
+        # own writes once it was copied at (or after) that generation.
+        self._generation = 0
+        self._copied_generation = -1
+        self._background = None
+
+        with self._refresh_lock:
+            self._copy()
+
+    def connect(self) -> sqlite3.Connection:
+        """Open a read connection on the replica.
+
+        After `invalidate` the read waits for a fresh copy; when only the
+        refresh interval has elapsed, the current snapshot is served while a
+        background refresh runs.
+        """
+        with self._lock:
+            dirty = self._copied_generation != self._generation
+            expired = time.monotonic() - self._refreshed_at >= self.refresh_interval
+        if dirty:
+            self._refresh_for_writes()
+        elif expired:
+            self._refresh_in_background()
+        with self._lock:
+            # Connect while holding the lock so a concurrent swap cannot
+            # drop the database between reading the URI and opening it.
+            return sqlite3.connect(self._uri, uri=True)
+
+    def invalidate(self):
+        """Force a refresh before the next read (read-your-writes)"""
+        with self._lock:
+            self._generation += 1
+
+    def refresh(self):
+        """Re-copy the on-disk database into a fresh in-memory replica"""
+        with self._refresh_lock:
+            self._copy()
+
+    def staleness(self) -> float:
+        """Seconds since the replica was last refreshed"""
+        return time.monotonic() - self._refreshed_at
+
+    def close(self):
+        """Release the replica and the source connection"""
+        with self._refresh_lock, self._lock:
+            if self._anchor is not None:
+                self._anchor.close()
+                self._anchor = None
+            self._source.close()
+
+    def _refresh_for_writes(self):
+        with self._refresh_lock:
+            # Another reader may have copied past our writes while we waited
+            with self._lock:
+                if self._copied_generation == self._generation:
+                    return
+            self._copy()
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._background is not None:
+                return
+            # Checked once per interval, however many readers arrive meanwhile
+            self._refreshed_at = time.monotonic()
+            self._background = threading.Thread(target=self._background_refresh, name='replica-refresh',
+                                                daemon=True)
+            self._background.start()
+
+    def _background_refresh(self):
+        try:
+            with self._refresh_lock:
+                # Interval elapsed: only pay for a copy if the file actually changed
+                if self._current_data_version() != self._data_version:
+                    self._copy()
+        except Exception as e:
+            logger.exception("Replica refresh failed: %s", e)
+        finally:
+            with self._lock:
+                self._background = None
+
+    def _current_data_version(self) -> int:
+        return self._source.execute('PRAGMA data_version').fetchone()[0]
+
+    def _copy(self):
+        # Called with `_refresh_lock` held. The generation and data version
+        # are read before copying, so writes that land mid-backup are picked
+        # up by the next read.
+        with self._lock:
+            generation = self._generation
+        data_version = self._current_data_version()
+
+        # Double-buffered: build the new snapshot under a fresh name and swap,
+        # so readers still holding the previous snapshot are never disturbed.
+        uri = f"file:employee_replica_{id(self)}_{next(self._names)}?mode=memory&cache=shared"
+        replica = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        self._source.backup(replica, pages=self.pages_per_step)
+
+        with self._lock:
+            previous = self._anchor
+            self._anchor, self._uri = replica, uri
+            self._data_version = data_version
+            self._refreshed_at = time.monotonic()
+            self._copied_generation = max(self._copied_generation, generation)
+            self.refresh_count += 1
+
+        if previous is not None:
+            previous.close()
@@ -0,0 +1,136 @@
+"""
+Pre-Serialized JSON Response Cache
+Keeps the encoded JSON for dashboard sections so unchanged data is served
+without touching SQLite or the JSON encoder:
+- Entries per (section, key) with a content-hash ETag
+- 304 Not Modified for matching If-None-Match headers
+- Invalidation driven by the tables each section reads
+- Hit-rate metrics
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+# Tables each cached section is built from
+SECTION_TABLES = {
+    'profile': {'employees', 'employee_skills', 'skills', 'certifications'},
+    'courses': {'training_courses'},
+    'competency': {'employees', 'employee_skills', 'skills', 'certifications',
+                   'learning_activities', 'course_enrollments', 'industry_demand'},
+}
+
+# Tables whose rows belong to a single employee; writes to them only
+# invalidate that employee's entries when the writer says whose rows changed.
+EMPLOYEE_SCOPED_TABLES = {'employees', 'employee_skills', 'certifications', 'course_enrollments',
+                          'career_paths', 'career_milestones', 'learning_activities'}
+
+# Sections whose content also changes with the clock (the competency score
+# uses a rolling three-month learning window)
+SECTION_TTL = {'competency': 3600}
+
+class ResponseCache:
+    def __init__(self, max_entries: int = 4096, section_ttl: Dict[str, float] = None):
+        self.max_entries = max_entries
+        self.section_ttl = SECTION_TTL if section_ttl is None else section_ttl
+
+        self._entries = OrderedDict()  # (section, key) -> (etag, body, expires_at)
+        self._generations = {}  # section -> invalidation counter
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'not_modified': 0, 'invalidations': 0, 'evictions': 0}
+
+    def get(self, section: str, key, build: Callable[[], object],
+            if_none_match: str = None) -> Tuple[int, Optional[str], bytes]:
+        """Return (status, etag, body) for a section, building it on a miss.
+
+        `build` returns the payload to encode; a None payload is answered
+        with 404 and not cached. On a 304 the body is empty.
+        """
+        cache_key = (section, key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[2] is not None and entry[2] <= time.monotonic():
+                del self._entries[cache_key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(cache_key)
+                etag, body, _ = entry
+                if self._etag_matches(etag, if_none_match):
+                    self._stats['not_modified'] += 1
+                    return 304, etag, b''
+                self._stats['hits'] += 1
+                return 200, etag, body
+            self._stats['misses'] += 1
+            generation = self._generations.get(section, 0)
+
+        payload = build()
+        if payload is None:
+            return 404, None, b'null'
+
+        body = json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8')
+        etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+        ttl = self.section_ttl.get(section)
+
+        with self._lock:
+            # Skip the store if the section was invalidated while building:
+            # the payload may predate that write.
+            if self._generations.get(section, 0) == generation:
+                self._entries[cache_key] = (etag, body, time.monotonic() + ttl if ttl else None)
+                self._entries.move_to_end(cache_key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._stats['evictions'] += 1
+
+        if self._etag_matches(etag, if_none_match):
+            return 304, etag, b''
+        return 200, etag, body
+
+    def invalidate(self, section: str, key=None):
+        """Drop one entry, or the whole section when no key is given"""
+        with self._lock:
+            self._generations[section] = self._generations.get(section, 0) + 1
+            if key is not None:
+                if self._entries.pop((section, key), None) is not None:
+                    self._stats['invalidations'] += 1
+                return
+            for cache_key in [k for k in self._entries if k[0] == section]:
+                del self._entries[cache_key]
+                self._stats['invalidations'] += 1
+
+    def invalidate_tables(self, tables: Iterable[str], employee_id: str = None):
+        """Invalidate every section that reads from any of the written tables"""
+        tables = set(tables)
+        for section, section_tables in SECTION_TABLES.items():
+            written = tables & section_tables
+            if not written:
+                continue
+            if employee_id is not None and written <= EMPLOYEE_SCOPED_TABLES:
+                self.invalidate(section, employee_id)
+            else:
+                self.invalidate(section)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            for section in set(SECTION_TABLES) | {k[0] for k in self._entries}:
+                self._generations[section] = self._generations.get(section, 0) + 1
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and the hit rate (304s count as hits)"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        served = stats['hits'] + stats['not_modified']
+        lookups = served + stats['misses']
+        stats['hit_rate'] = round(served / lookups, 4) if lookups else 0.0
+        return stats
+
+    def _etag_matches(self, etag: str, if_none_match: str = None) -> bool:
+        if not if_none_match:
+            return False
+        candidates = [tag.strip() for tag in if_none_match.split(',')]
+        return '*' in candidates or etag in candidates or f'W/{etag}' in candidates
@@ -0,0 +1,108 @@
+"""
+Slotted Row Models
+Typed, `__slots__`-based records for the employee dashboard tables:
+- Built directly by SQLite as the cursor row factory
+- Columns are matched by name, so queries may select any subset or order
+- Cheap `to_dict` for JSON responses
+"""
+
+import json
+from typing import Dict, Tuple
+
+class RowModel:
+    """Base class for slotted row models.
+
+    Each query shape gets its own variant subclass (see `factory_for`) whose
+    `__init__` unpacks a result row straight into the slots, so building a
+    model costs one call and no per-row dict.
+    """
+    __slots__ = ()
+
+    # Columns loaded into instances of this (variant) class
+    _fields: Tuple[str, ...] = ()
+
+    # Per-column conversions applied by to_dict
+    _converters: Dict = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if '_variants' not in cls.__dict__:
+            cls._variants = {}
+
+    @classmethod
+    def factory_for(cls, description) -> type:
+        """Return the row factory for a cursor's result columns.
+
+        Assign the result to `cursor.row_factory` after `execute()` and before
+        fetching. Columns that are not model fields are ignored.
+        """
+        names = tuple(column[0] for column in description)
+        variant = cls._variants.get(names)
+        if variant is None:
+            variant = cls._variants[names] = cls._make_variant(names)
+        return variant
+
+    @classmethod
+    def _make_variant(cls, names: Tuple[str, ...]) -> type:
+        unknown = [name for name in names if name not in cls.__slots__]
+        targets = ', '.join(f'self.{name}' if name in cls.__slots__ else '_' for name in names)
+        # Generated rather than a closure over the slot setters: one unpacking
+        # assignment costs ~0.2µs per row, a setter loop ~0.9µs, no faster
+        # than building a dict. Only names from `__slots__` reach the source.
+        namespace = {}
+        exec(f"def __init__(self, cursor, row):\n    ({targets},) = row\n", namespace)
+
+        fields = tuple(name for name in names if name not in unknown)
+        return type(cls.__name__, (cls,), {
+            '__slots__': (),
+            '__init__': namespace['__init__'],
+            '_fields': fields,
+            '_variants': cls._variants
+        })
+
+    def to_dict(self) -> Dict:
+        """Plain dict of the loaded columns, ready for JSON encoding"""
+        data = {name: getattr(self, name) for name in self._fields}
+        for name, convert in self._converters.items():
+            if name in data:
+                data[name] = convert(data[name])
+        return data
+
+    def __repr__(self):
+        values = ', '.join(f'{name}={getattr(self, name)!r}' for name in self._fields)
+        return f'{type(self).__name__}({values})'
+
+def _json_list(value):
+    return json.loads(value) if value else []
+
+class Employee(RowModel):
+    __slots__ = ('id', 'name', 'email', 'department', 'position', 'hire_date', 'photo_url', 'years_experience',
+                 'competency_score')
+
+class Skill(RowModel):
+    __slots__ = ('name', 'category', 'current_level', 'target_level', 'is_certified')
+    _converters = {'is_certified': bool}
+
+class Certification(RowModel):
+    __slots__ = ('name', 'issuer', 'issue_date', 'expiry_date', 'status')
+
+class Course(RowModel):
+    __slots__ = ('id', 'title', 'provider', 'description', 'duration_weeks', 'price', 'is_free',
+                 'category', 'rating', 'total_students', 'skills_taught')
+    _converters = {'is_free': bool, 'skills_taught': _json_list}
+
+class Enrollment(RowModel):
+    __slots__ = ('title', 'provider', 'category', 'progress', 'status', 'enrollment_date', 'completion_date')
+
+class CareerPath(RowModel):
+    __slots__ = ('id', 'title', 'current_level', 'target_level', 'progress', 'estimated_months',
+                 'priority', 'status')
+
+class Milestone(RowModel):
+    __slots__ = ('career_path_id', 'title', 'description', 'status', 'progress', 'points', 'deadline',
+                 'completion_date')
+
+def fetch_models(cursor, model: type) -> list:
+    """Fetch the remaining rows of an executed cursor as `model` instances"""
+    cursor.row_factory = model.factory_for(cursor.description)
+    return cursor.fetchall()
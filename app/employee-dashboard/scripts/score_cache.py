@@ -0,0 +1,304 @@
+"""
+Shared Competency Score Cache
+Serves the six-factor competency score to profiles, logins and listings:
+- Overall scores per employee from `AICompetencyCalculator`, computed in bulk,
+  or from its per-factor memo for a few recently written employees
+- Entries older than `max_age` seconds, or whose inputs were written since,
+  are still served but queued for a refresh on a background thread
+- Nothing is computed on the request path: scores stored by `ScoreHistory`
+  seed the cache, employees with no score at all are left out and queued
+- Size-bounded LRU eviction, grown to fit the largest lookup, and
+  hit/stale/miss stats
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+
+from response_cache import EMPLOYEE_SCOPED_TABLES, SECTION_TABLES
+
+logger = logging.getLogger(__name__)
+
+# Tables the competency score is calculated from
+SCORE_TABLES = SECTION_TABLES['competency']
+
+# Employees refreshed per background batch
+REFRESH_BATCH_SIZE = 500
+
+# Batches up to this size are scored one employee at a time, re-reading only
+# the factor groups their writes touched (see `calculate_competency_score`)
+MEMOIZED_BATCH_SIZE = 16
+
+class ScoreCache:
+    def __init__(self, db_path: str, max_age: float = 300.0, max_entries: int = 100000,
+                 batch_size: int = REFRESH_BATCH_SIZE,
+                 on_change: Callable[[List[str]], None] = None):
+        """
+        Scores are served for up to `max_age` seconds after they were
+        computed; older ones are served once more while a refresh is queued.
+        `on_change(employee_ids)` is called when refreshed scores differ from
+        the ones served before.
+        """
+        self.db_path = db_path
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.batch_size = batch_size
+        self.on_change = on_change
+
+        # employee id -> (score, computed_at, seq); computed_at is unix time so
+        # stored snapshots compare with in-process computations, seq is the
+        # invalidation counter when the computation started
+        self._entries = OrderedDict()
+        self._seq = 0
+        self._dirty = {}  # employee id -> seq of the write that invalidated it
+        self._cleared = 0  # seq of the last write that invalidated every entry
+        self._computing = 0
+        self._reload_demand = False
+
+        self._pending = OrderedDict()  # employee ids queued for refresh
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._thread = None
+        self._closed = False
+        self._calculator = None
+        self._stats = {'hits': 0, 'stale': 0, 'misses': 0, 'refreshed': 0, 'evictions': 0}
+
+    @property
+    def calculator(self):
+        """Calculator shared by request-path and background computations"""
+        if self._calculator is None:
+            from ai_competency_calculator import AICompetencyCalculator
+            self._calculator = AICompetencyCalculator(self.db_path)
+        return self._calculator
+
+    def get(self, employee_id: str) -> Optional[int]:
+        """Overall score of an employee, None if it is not known yet"""
+        return self.get_many([employee_id]).get(employee_id)
+
+    def get_many(self, employee_ids: Iterable[str]) -> Dict[str, int]:
+        """{employee id: overall score} of the employees with a known score.
+
+        Employees without one are left out and scored in the background;
+        `on_change` reports them once their score is known.
+        """
+        employee_ids = list(employee_ids)
+        scores = {}
+        missing = []
+        stale = []
+        now = time.time()
+        with self._lock:
+            if len(employee_ids) > self.max_entries:
+                # A lookup that does not fit would evict its own entries and
+                # recompute all of them on every call
+                logger.warning("Score cache holds %d entries, a lookup asked for %d; growing it to fit",
+                               self.max_entries, len(employee_ids))
+                self.max_entries = len(employee_ids)
+            for employee_id in employee_ids:
+                entry = self._entries.get(employee_id)
+                if entry is None:
+                    missing.append(employee_id)
+                    continue
+                self._entries.move_to_end(employee_id)
+                scores[employee_id] = entry[0]
+                if self._is_stale(employee_id, entry, now):
+                    stale.append(employee_id)
+                else:
+                    self._stats['hits'] += 1
+            self._stats['stale'] += len(stale)
+            self._stats['misses'] += len(missing)
+
+        if missing:
+            seeded = self._seed(missing)
+            scores.update(seeded)
+            with self._lock:
+                stale.extend(
+                    employee_id for employee_id in seeded
+                    if employee_id not in self._entries
+                    or self._is_stale(employee_id, self._entries[employee_id], now)
+                )
+            missing = [employee_id for employee_id in missing if employee_id not in seeded]
+        if stale or missing:
+            self._schedule(stale + missing)
+        return scores
+
+    def put(self, employee_id: str, score: int):
+        """Store a score that was just computed elsewhere"""
+        with self._lock:
+            changed = self._store({employee_id: score}, time.time(), self._seq)
+        self._notify(changed)
+
+    def invalidate(self, employee_id: str = None):
+        """Mark one employee's score, or every score, as out of date.
+
+        A cached score is refreshed in the background right away; when every
+        score is invalidated they are refreshed as they are read.
+        """
+        with self._lock:
+            self._seq += 1
+            if employee_id is None:
+                self._cleared = self._seq
+                return
+            # Uncached employees only need marking while a computation that
+            # may have read the old rows is still running
+            if employee_id in self._entries or self._computing:
+                self._dirty[employee_id] = self._seq
+            cached = employee_id in self._entries
+        if cached:
+            self._schedule([employee_id])
+
+    def invalidate_tables(self, tables: Iterable[str], employee_id: str = None):
+        """Invalidate the scores affected by a write to `tables`"""
+        tables = set(tables)
+        written = tables & SCORE_TABLES
+        if not written:
+            return
+        if 'industry_demand' in written:
+            with self._lock:
+                self._reload_demand = True
+        if employee_id is None or not written <= EMPLOYEE_SCOPED_TABLES:
+            self.invalidate()
+        if employee_id is not None:
+            # The writer's own score is refreshed right away either way
+            self.invalidate(employee_id)
+
+    def stats(self) -> Dict:
+        """Hit/stale/miss counters and the fresh hit rate"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['pending'] = len(self._pending)
+        lookups = stats['hits'] + stats['stale'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
+
+    def close(self):
+        """Stop the refresh thread; queued refreshes are dropped"""
+        with self._lock:
+            self._closed = True
+            self._pending.clear()
+            self._wakeup.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def _is_stale(self, employee_id: str, entry, now: float) -> bool:
+        score, computed_at, seq = entry
+        return (now - computed_at > self.max_age or seq < self._cleared
+                or seq < self._dirty.get(employee_id, 0))
+
+    def _store(self, scores: Dict[str, int], computed_at: float, seq: int) -> List[str]:
+        # Called with the lock held; `seq` is the counter when the inputs were
+        # read. Returns the employees whose cached score changed, including
+        # ones that had none (their lookups were answered without a score).
+        changed = []
+        for employee_id, score in scores.items():
+            previous = self._entries.get(employee_id)
+            if previous is None or previous[0] != score:
+                changed.append(employee_id)
+            self._entries[employee_id] = (score, computed_at, seq)
+            self._entries.move_to_end(employee_id)
+            if self._dirty.get(employee_id, 0) <= seq:
+                self._dirty.pop(employee_id, None)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._dirty.pop(evicted, None)
+            self._stats['evictions'] += 1
+        return changed
+
+    def _seed(self, employee_ids: List[str]) -> Dict[str, int]:
+        """Load scores stored by `ScoreHistory`, timestamped with their snapshot"""
+        with self._lock:
+            seq = self._seq
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = []
+            for start in range(0, len(employee_ids), 500):
+                chunk = employee_ids[start:start + 500]
+                placeholders = ', '.join('?' * len(chunk))
+                rows += conn.execute(f'''
+                    SELECT employee_id, overall_score, snapshot_at
+                    FROM competency_score_latest
+                    WHERE employee_id IN ({placeholders})
+                ''', chunk).fetchall()
+        except sqlite3.OperationalError:
+            return {}  # scores were never recorded in this database
+        finally:
+            conn.close()
+
+        with self._lock:
+            # Seeded scores are always refreshed, so whether a write raced the
+            # read does not matter; they must not overwrite fresher entries
+            for employee_id, score, snapshot_at in rows:
+                if employee_id not in self._entries:
+                    self._store({employee_id: score}, snapshot_at, seq)
+        return {employee_id: score for employee_id, score, _ in rows}
+
+    def _notify(self, changed: List[str]):
+        if changed and self.on_change is not None:
+            try:
+                self.on_change(changed)
+            except Exception as e:
+                logger.exception("Score change callback failed: %s", e)
+
+    def _compute(self, employee_ids: List[str]) -> Dict[str, int]:
+        with self._lock:
+            seq = self._seq
+            self._computing += 1
+            reload_demand, self._reload_demand = self._reload_demand, False
+        try:
+            if reload_demand:
+                self.calculator.reload_industry_demand()
+            computed_at = time.time()
+            if len(employee_ids) <= MEMOIZED_BATCH_SIZE:
+                results = {}
+                for employee_id in employee_ids:
+                    result = self.calculator.calculate_competency_score(employee_id)
+                    if result is not None:
+                        results[employee_id] = result
+            else:
+                results = self.calculator.calculate_all_scores(employee_ids)
+            scores = {employee_id: result['overall_score'] for employee_id, result in results.items()}
+            with self._lock:
+                changed = self._store(scores, computed_at, seq)
+            self._notify(changed)
+            return scores
+        finally:
+            with self._lock:
+                self._computing -= 1
+
+    def _schedule(self, employee_ids: List[str]):
+        with self._lock:
+            if self._closed:
+                return
+            for employee_id in employee_ids:
+                self._pending[employee_id] = None
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='score-refresh', daemon=True)
+                self._thread.start()
+            self._wakeup.notify()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._pending and not self._closed:
+                    self._wakeup.wait()
+                if self._closed:
+                    return
+                batch = []
+                while self._pending and len(batch) < self.batch_size:
+                    batch.append(self._pending.popitem(last=False)[0])
+
+            try:
+                scores = self._compute(batch)
+            except Exception as e:
+                logger.exception("Score refresh failed: %s", e)
+                continue
+            with self._lock:
+                self._stats['refreshed'] += len(scores)
+                # Employees that no longer exist
+                for employee_id in batch:
+                    if employee_id not in scores and self._entries.pop(employee_id, None) is not None:
+                        self._dirty.pop(employee_id, None)
@@ -0,0 +1,458 @@
+"""
+Competency Score History
+Keeps an append-only record of competency scores for trend reporting:
+- Scheduled snapshots of every employee's overall score and factor breakdown
+- Rows are only written when an employee's score, breakdown or department changed
+- History rows are never replaced: at most one row per employee per second
+- Compact rows: integer timestamps and factor scores stored in tenths
+- Indexed range queries for per-employee, per-department and org-level trends
+"""
+
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+
+from ai_competency_calculator import AICompetencyCalculator
+from employee_data_manager import EmployeeDashboardDB
+
+logger = logging.getLogger(__name__)
+
+FACTORS = ('skill_proficiency', 'certifications', 'learning_velocity', 'practical_application',
+           'industry_relevance', 'peer_collaboration')
+
+# Trend bucket widths; months are calendar months
+INTERVALS = ('day', 'week', 'month')
+
+SCORE_COLUMNS = ', '.join(('department', 'overall_score') + FACTORS)
+
+# Time a move or removal is recorded at: now, or one second after the
+# employee's last history row when that is already taken
+_CHANGE_TIME = '''MAX(CAST(strftime('%s', 'now') AS INTEGER),
+                (SELECT COALESCE(MAX(snapshot_at) + 1, 0) FROM competency_score_history
+                 WHERE employee_id = {}))'''
+
+# Keep stored scores in step with employee moves and removals between
+# snapshots; both are also recorded in the history at the time they happen.
+SCORE_TRIGGERS = {
+    'trg_score_latest_department': f'''
+        AFTER UPDATE OF department ON employees
+        WHEN NEW.department IS NOT OLD.department
+        BEGIN
+            UPDATE competency_score_latest
+            SET department = NEW.department, snapshot_at = {_CHANGE_TIME.format('NEW.id')}
+            WHERE employee_id = NEW.id;
+            INSERT INTO competency_score_history (employee_id, snapshot_at, {SCORE_COLUMNS})
+            SELECT employee_id, snapshot_at, {SCORE_COLUMNS}
+            FROM competency_score_latest
+            WHERE employee_id = NEW.id;
+        END''',
+    'trg_score_latest_delete': f'''
+        AFTER DELETE ON employees
+        BEGIN
+            INSERT INTO competency_score_history (employee_id, snapshot_at, department)
+            SELECT employee_id, {_CHANGE_TIME.format('OLD.id')}, department
+            FROM competency_score_latest
+            WHERE employee_id = OLD.id;
+            DELETE FROM competency_score_latest WHERE employee_id = OLD.id;
+        END''',
+}
+
+class ScoreHistory:
+    def __init__(self, db: EmployeeDashboardDB, calculator: AICompetencyCalculator = None):
+        self.db = db
+        self.calculator = calculator or AICompetencyCalculator(db.db_path)
+        self._stop = threading.Event()
+        self._thread = None
+        self.ensure_schema()
+
+    def ensure_schema(self):
+        """Create the history tables and indexes if they do not exist"""
+        conn = self.db._connect()
+        cursor = conn.cursor()
+
+        # One row per change. A NULL overall_score marks an employee who was
+        # removed. Factor scores are stored in tenths of a point.
+        factor_columns = ''.join(f'{factor} INTEGER,\n' for factor in FACTORS)
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS competency_score_history (
+                employee_id TEXT NOT NULL,
+                snapshot_at INTEGER NOT NULL, -- unix seconds
+                department TEXT NOT NULL,
+                overall_score INTEGER,
+                {factor_columns}
+                PRIMARY KEY (employee_id, snapshot_at)
+            ) WITHOUT ROWID
+        ''')
+
+        # Latest row per employee, compared against on every snapshot
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS competency_score_latest (
+                employee_id TEXT PRIMARY KEY,
+                snapshot_at INTEGER NOT NULL,
+                department TEXT NOT NULL,
+                overall_score INTEGER NOT NULL,
+                {factor_columns.rstrip().rstrip(',')}
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_score_history_department
+            ON competency_score_history (department, snapshot_at)
+        ''')
+
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_score_history_snapshot
+            ON competency_score_history (snapshot_at)
+        ''')
+
+        # Leaderboards: ordered walks of the stored scores, org-wide and per
+        # department, and counts of higher scores for ranks
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_score_latest_score
+            ON competency_score_latest (overall_score DESC, employee_id)
+        ''')
+
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_score_latest_department_score
+            ON competency_score_latest (department, overall_score DESC, employee_id)
+        ''')
+
+        # Recreated when their definition changed (they used to replace rows)
+        cursor.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'")
+        existing = dict(cursor.fetchall())
+        for name, body in SCORE_TRIGGERS.items():
+            statement = f'CREATE TRIGGER {name} {body}'
+            if existing.get(name) != statement:
+                cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+                cursor.execute(statement)
+
+        conn.commit()
+        conn.close()
+
+    def snapshot(self, employee_ids: List[str] = None, at=None) -> Dict:
+        """Score employees and record those whose score changed.
+
+        `at` (default: now) is the snapshot time; employees missing from a
+        full snapshot are recorded as removed.
+        """
+        snapshot_at = _to_epoch(at) if at is not None else int(time.time())
+        started = time.perf_counter()
+
+        # Pick up demand multipliers recomputed since the last snapshot,
+        # possibly by another process
+        self.calculator.reload_industry_demand()
+
+        rows = {}
+        matrix = self.calculator.load_factor_matrix(employee_ids)
+        for employee_id, factors in matrix.items():
+            scores = self.calculator.score_factors(factors)
+            overall = max(0, min(100, int(self.calculator.weighted_total(scores))))
+            rows[employee_id] = (factors['department'], overall) + tuple(
+                int(round(scores[factor] * 10)) for factor in FACTORS
+            )
+
+        conn = self.db._connect()
+        cursor = conn.cursor()
+        condition, params = self.calculator._employee_filter('employee_id', employee_ids)
+        cursor.execute(f'''
+            SELECT employee_id, {SCORE_COLUMNS}
+            FROM competency_score_latest
+            WHERE 1=1{condition}
+        ''', params)
+        latest = {row[0]: row[1:] for row in cursor.fetchall()}
+
+        # History rows are never replaced. An employee already recorded at
+        # `snapshot_at` (moved or removed that second) keeps that row, and
+        # their stored score is left as is so the next snapshot records it.
+        cursor.execute('SELECT employee_id FROM competency_score_history WHERE snapshot_at = ?', (snapshot_at,))
+        recorded = {row[0] for row in cursor.fetchall()}
+
+        changed = [(employee_id, snapshot_at) + row for employee_id, row in rows.items()
+                   if latest.get(employee_id) != row and employee_id not in recorded]
+        removed = [] if employee_ids is not None else [
+            (employee_id, snapshot_at, row[0]) for employee_id, row in latest.items()
+            if employee_id not in rows and employee_id not in recorded
+        ]
+
+        placeholders = ', '.join('?' * (len(FACTORS) + 4))
+        cursor.executemany(f'''
+            INSERT INTO competency_score_history (employee_id, snapshot_at, {SCORE_COLUMNS})
+            VALUES ({placeholders})
+        ''', changed)
+        cursor.executemany(f'''
+            INSERT OR REPLACE INTO competency_score_latest (employee_id, snapshot_at, {SCORE_COLUMNS})
+            VALUES ({placeholders})
+        ''', changed)
+        cursor.executemany('''
+            INSERT INTO competency_score_history (employee_id, snapshot_at, department)
+            VALUES (?, ?, ?)
+        ''', removed)
+        cursor.executemany('DELETE FROM competency_score_latest WHERE employee_id = ?',
+                           [(employee_id,) for employee_id, _, _ in removed])
+        conn.commit()
+        conn.close()
+
+        if changed or removed:
+            self.db._after_write('competency_score_history', 'competency_score_latest')
+
+        return {
+            'snapshot_at': snapshot_at,
+            'employees': len(rows),
+            'changed': len(changed),
+            'removed': len(removed),
+            'seconds': round(time.perf_counter() - started, 3)
+        }
+
+    def employee_trend(self, employee_id: str, start=None, end=None) -> List[Dict]:
+        """Recorded scores of one employee within [start, end].
+
+        The first point is the score in effect at `start`, when there is one.
+        """
+        start_at = _to_epoch(start) if start is not None else 0
+        end_at = _to_epoch(end, end_of_day=True) if end is not None else sys.maxsize
+
+        conn = self.db._read_connection()
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT snapshot_at, {SCORE_COLUMNS}
+            FROM competency_score_history
+            WHERE employee_id = ? AND snapshot_at BETWEEN
+                  COALESCE((SELECT MAX(snapshot_at) FROM competency_score_history
+                            WHERE employee_id = ? AND snapshot_at <= ?), ?) AND ?
+            ORDER BY snapshot_at
+        ''', (employee_id, employee_id, start_at, start_at, end_at))
+        rows = cursor.fetchall()
+        conn.close()
+
+        return [{
+            'snapshot_at': _to_iso(snapshot_at),
+            'department': department,
+            'overall_score': overall,
+            'breakdown': None if overall is None else {
+                factor: value / 10 for factor, value in zip(FACTORS, factor_values)
+            }
+        } for snapshot_at, department, overall, *factor_values in rows]
+
+    def department_trend(self, department: str, start, end=None, interval: str = 'week') -> Dict:
+        """Average scores of a department at the end of every interval in [start, end]"""
+        return self._trend(start, end, interval, department)
+
+    def org_trend(self, start, end=None, interval: str = 'week', by_department: bool = False) -> Dict:
+        """Org-wide average scores at the end of every interval in [start, end]"""
+        return self._trend(start, end, interval, None, by_department)
+
+    def _trend(self, start, end, interval: str, department: str = None, by_department: bool = False) -> Dict:
+        if interval not in INTERVALS:
+            raise ValueError(f"interval must be one of {', '.join(INTERVALS)}")
+        start_at = _to_epoch(start)
+        end_at = _to_epoch(end, end_of_day=True) if end is not None else int(time.time())
+        boundaries = _period_ends(start_at, end_at, interval)
+
+        conn = self.db._read_connection()
+        cursor = conn.cursor()
+
+        # Only employees who were ever in the department can affect its trend
+        member_filter = ''
+        params = []
+        if department is not None:
+            member_filter = '''
+                AND {}employee_id IN (SELECT employee_id FROM competency_score_history WHERE department = ?)
+            '''
+            params = [department]
+
+        # State at `start`, without reading the history before it: the stored
+        # latest row of employees unchanged since, and for the few recorded
+        # after `start` one primary key lookup of their row in effect at it
+        cursor.execute(f'''
+            WITH changed AS (
+                SELECT DISTINCT employee_id FROM competency_score_history INDEXED BY idx_score_history_snapshot
+                WHERE snapshot_at > ?
+            )
+            SELECT employee_id, {SCORE_COLUMNS}
+            FROM competency_score_latest
+            WHERE snapshot_at <= ? AND employee_id NOT IN changed{member_filter.format('')}
+            UNION ALL
+            SELECT h.employee_id, {', '.join('h.' + column for column in SCORE_COLUMNS.split(', '))}
+            FROM changed
+            JOIN competency_score_history h ON h.employee_id = changed.employee_id
+             AND h.snapshot_at = (SELECT MAX(snapshot_at) FROM competency_score_history
+                                  WHERE employee_id = changed.employee_id AND snapshot_at <= ?)
+            WHERE 1=1{member_filter.format('h.')}
+        ''', [start_at, start_at] + params + [start_at] + params)
+        state = {row[0]: row[1:] for row in cursor.fetchall()}
+
+        # ... then every change inside the window, in time order
+        cursor.execute(f'''
+            SELECT snapshot_at, employee_id, {SCORE_COLUMNS}
+            FROM competency_score_history
+            WHERE snapshot_at > ? AND snapshot_at <= ?{member_filter.format('')}
+            ORDER BY snapshot_at
+        ''', [start_at, boundaries[-1]] + params)
+        changes = cursor.fetchall()
+        conn.close()
+
+        points = []
+        position = 0
+        for boundary in boundaries:
+            while position < len(changes) and changes[position][0] <= boundary:
+                state[changes[position][1]] = changes[position][2:]
+                position += 1
+            point = {'period_end': _to_iso(boundary)}
+            point.update(_aggregate(row for row in state.values()
+                                    if department is None or row[0] == department))
+            if by_department:
+                groups = {}
+                for row in state.values():
+                    groups.setdefault(row[0], []).append(row)
+                point['departments'] = {name: _aggregate(rows) for name, rows in sorted(groups.items())}
+            points.append(point)
+
+        first = next((p['average'] for p in points if p['employees']), None)
+        last = next((p['average'] for p in reversed(points) if p['employees']), None)
+        return {
+            'department': department,
+            'interval': interval,
+            'points': points,
+            'change': round(last - first, 2) if first is not None else None
+        }
+
+    def start(self, interval_seconds: float = 3600.0):
+        """Take snapshots every `interval_seconds` on a background thread"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.is_set():
+                try:
+                    self.snapshot()
+                except Exception as e:
+                    logger.exception("Score snapshot failed: %s", e)
+                self._stop.wait(interval_seconds)
+
+        self._thread = threading.Thread(target=run, name='score-history', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background snapshot thread"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+def _aggregate(rows) -> Dict:
+    count = 0
+    overall_sum = 0
+    factor_sums = [0] * len(FACTORS)
+    for _, overall, *factor_values in rows:
+        if overall is None:
+            continue  # removed employee
+        count += 1
+        overall_sum += overall
+        for i, value in enumerate(factor_values):
+            factor_sums[i] += value
+    return {
+        'employees': count,
+        'average': round(overall_sum / count, 2) if count else None,
+        'breakdown': {
+            factor: round(total / count / 10, 1) for factor, total in zip(FACTORS, factor_sums)
+        } if count else None
+    }
+
+def _period_ends(start_at: int, end_at: int, interval: str) -> List[int]:
+    """Timestamps closing each interval after `start_at`, ending with `end_at`"""
+    boundaries = []
+    current = datetime.fromtimestamp(start_at)
+    while True:
+        if interval == 'day':
+            current += timedelta(days=1)
+        elif interval == 'week':
+            current += timedelta(weeks=1)
+        else:
+            month = current.month % 12 + 1
+            year = current.year + (current.month == 12)
+            current = current.replace(year=year, month=month, day=min(current.day, _days_in_month(year, month)))
+        boundary = int(current.timestamp())
+        if boundary >= end_at:
+            boundaries.append(end_at)
+            return boundaries
+        boundaries.append(boundary)
+
+def _days_in_month(year: int, month: int) -> int:
+    following = date(year + (month == 12), month % 12 + 1, 1)
+    return (following - timedelta(days=1)).day
+
+def _to_epoch(value, end_of_day: bool = False) -> int:
+    """Unix seconds from a timestamp, date, datetime or ISO string"""
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        text = value.strip()
+        if len(text) > 10:
+            return int(datetime.fromisoformat(text.replace('Z', '+00:00')).timestamp())
+        value = date.fromisoformat(text)
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    if isinstance(value, date):
+        moment = datetime(value.year, value.month, value.day)
+        if end_of_day:
+            moment += timedelta(days=1, seconds=-1)
+        return int(moment.timestamp())
+    raise TypeError(f"Unsupported time value: {value!r}")
+
+def _to_iso(epoch: int) -> str:
+    return datetime.fromtimestamp(epoch).isoformat(sep=' ')
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Competency score history snapshots and trends")
+    parser.add_argument('--db', default="employee_dashboard.db", help="SQLite database path")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('snapshot', help="Take one snapshot")
+
+    run = commands.add_parser('run', help="Take snapshots on a schedule")
+    run.add_argument('--every', type=float, default=3600.0, help="Seconds between snapshots")
+
+    trend = commands.add_parser('trend', help="Print a trend as JSON")
+    scope = trend.add_mutually_exclusive_group()
+    scope.add_argument('--employee', help="Employee id")
+    scope.add_argument('--department', help="Department name")
+    trend.add_argument('--start', help="Window start (ISO date or timestamp)")
+    trend.add_argument('--end', help="Window end (default: now)")
+    trend.add_argument('--interval', choices=INTERVALS, default='week')
+    trend.add_argument('--by-department', action='store_true', help="Break org trends down by department")
+
+    args = parser.parse_args(argv)
+    history = ScoreHistory(EmployeeDashboardDB(args.db))
+
+    if args.command == 'snapshot':
+        stats = history.snapshot()
+        print(f"[v0] Snapshot of {stats['employees']} employees: {stats['changed']} changed, "
+              f"{stats['removed']} removed in {stats['seconds']}s")
+    elif args.command == 'run':
+        print(f"[v0] Taking score snapshots every {args.every}s (Ctrl+C to stop)")
+        history.start(args.every)
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            history.stop()
+    elif args.employee:
+        print(json.dumps(history.employee_trend(args.employee, args.start, args.end), indent=2))
+    else:
+        start = args.start or (date.today() - timedelta(days=90)).isoformat()
+        if args.department:
+            result = history.department_trend(args.department, start, args.end, args.interval)
+        else:
+            result = history.org_trend(start, args.end, args.interval, args.by_department)
+        print(json.dumps(result, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,396 @@
+"""
+Skill Bitmap Index
+In-memory inverted index for boolean skill queries, e.g. "Python >= 80 AND
+AWS >= 70 AND no expired certifications in Engineering":
+- Every employee gets an ordinal; each posting list is a bitmap of ordinals
+- Per skill, one bitmap per level threshold (>= 0, 10, ..., 100), so a
+  threshold query is a single lookup; thresholds between add the holders of
+  the few exact levels above them from per-level ordinal lists
+- Department and certification status bitmaps
+- Queries are bitmap AND / OR / AND NOT, with no SQLite access
+- Kept current from the write path: changed employees are re-read before the next query
+"""
+
+import argparse
+import sys
+from array import array
+import threading
+import time
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from employee_data_manager import EmployeeDashboardDB
+
+# Tables the index is built from
+INDEX_TABLES = {'employees', 'employee_skills', 'skills', 'certifications'}
+
+# Width of a level bucket; thresholds on a bucket edge need no per-level lists
+BUCKET_WIDTH = 10
+BUCKETS = 100 // BUCKET_WIDTH + 1
+
+class SkillBitmapIndex:
+    def __init__(self, db: EmployeeDashboardDB):
+        """
+        Bitmaps are Python ints: bit n is employee ordinal n. They are plain
+        (uncompressed) bitsets, about 12 KB per posting list at 100k
+        employees, which keeps every boolean operation a single C loop.
+        """
+        self.db = db
+        self._lock = threading.RLock()
+        self._dirty = set()
+        self._stale = True
+        self._build_stats = {}
+        db.add_write_listener(self._on_write)
+
+    def query(self, skills: Dict[str, int] = None, any_skills: Dict[str, int] = None,
+              exclude_skills: Dict[str, int] = None, departments: Iterable[str] = None,
+              certified: bool = None, expired_certifications: bool = None) -> int:
+        """Bitmap of the employees matching every given condition.
+
+        `skills` must all be held at or above their minimum level,
+        at least one of `any_skills` must be, and none of `exclude_skills`.
+        `departments` is an OR over department names. `certified` and
+        `expired_certifications` require (True) or exclude (False) employees
+        holding a valid, respectively an expired, certification.
+        """
+        self.refresh()
+        with self._lock:
+            result = self._live
+            if departments is not None:
+                result &= self._union(self._departments.get(name, 0) for name in departments)
+            if certified is not None:
+                result = result & self._certified if certified else result & ~self._certified
+            if expired_certifications is not None:
+                result = result & self._expired if expired_certifications else result & ~self._expired
+            for name, level in (skills or {}).items():
+                result &= self._at_least(name, level)
+                if not result:
+                    return 0
+            if any_skills:
+                result &= self._union(self._at_least(name, level) for name, level in any_skills.items())
+            for name, level in (exclude_skills or {}).items():
+                result &= ~self._at_least(name, level)
+            return result
+
+    def employees(self, bitmap: int, limit: int = None) -> List[str]:
+        """Employee ids of the set bits, in ordinal order"""
+        with self._lock:
+            return [self._employee_ids[ordinal] for ordinal in _ordinals(bitmap, limit)]
+
+    def count(self, bitmap: int) -> int:
+        return bitmap.bit_count()
+
+    def find(self, limit: int = None, **conditions) -> Dict:
+        """`query` with the matching ids and their count"""
+        bitmap = self.query(**conditions)
+        return {'count': bitmap.bit_count(), 'employee_ids': self.employees(bitmap, limit)}
+
+    def refresh(self):
+        """Apply pending writes: a full rebuild or a re-read of changed employees"""
+        with self._lock:
+            if self._stale or self._cert_date != date.today().isoformat():
+                self.rebuild()
+                return
+            if not self._dirty:
+                return
+            dirty = list(self._dirty)
+            self._dirty.clear()
+            conn = self.db._read_connection()
+            try:
+                for employee_id in dirty:
+                    self._reload_employee(conn, employee_id)
+            finally:
+                conn.close()
+
+    def rebuild(self):
+        """Rebuild every bitmap from the database"""
+        started = time.perf_counter()
+        with self._lock:
+            self._dirty.clear()
+            self._stale = False
+            conn = self.db._read_connection()
+            try:
+                self._load(conn)
+            finally:
+                conn.close()
+            self._build_stats = {
+                'employees': len(self._employee_ids),
+                'skills': len(self._skill_ids),
+                'departments': len(self._departments),
+                'seconds': round(time.perf_counter() - started, 3)
+            }
+
+    def stats(self) -> Dict:
+        """Size of the last full build and pending updates"""
+        with self._lock:
+            stats = dict(self._build_stats)
+            stats['pending'] = len(self._dirty)
+            stats['stale'] = self._stale
+            stats['bytes'] = sum(
+                (bitmap.bit_length() + 7) // 8
+                for thresholds in self._thresholds.values() for bitmap in thresholds
+            ) if not self._stale else 0
+        return stats
+
+    def _load(self, conn):
+        cursor = conn.cursor()
+        cursor.execute('SELECT id, department FROM employees ORDER BY id')
+        rows = cursor.fetchall()
+        self._employee_ids = [employee_id for employee_id, _ in rows]
+        self._ordinals = {employee_id: ordinal for ordinal, employee_id in enumerate(self._employee_ids)}
+        size = (len(rows) + 7) // 8
+
+        departments = {}
+        for ordinal, (_, department) in enumerate(rows):
+            _set_bit(departments.setdefault(department, bytearray(size)), ordinal)
+        self._departments = {name: int.from_bytes(bits, 'little') for name, bits in departments.items()}
+        self._employee_departments = [department for _, department in rows]
+        self._live = (1 << len(rows)) - 1
+
+        cursor.execute('SELECT id, name FROM skills')
+        self._skill_ids = {name.lower(): skill_id for skill_id, name in cursor.fetchall()}
+
+        # Employees per exact bucket first; threshold bitmaps are their
+        # running unions from the top bucket down
+        buckets = {}
+        self._exact = {}  # skill id -> {level: array of ordinals}
+        cursor.execute('SELECT employee_id, skill_id, current_level FROM employee_skills')
+        for employee_id, skill_id, level in cursor:
+            ordinal = self._ordinals.get(employee_id)
+            if ordinal is None:
+                continue
+            level = _clamp(level)
+            skill_buckets = buckets.get(skill_id)
+            if skill_buckets is None:
+                skill_buckets = buckets[skill_id] = [None] * BUCKETS
+                self._exact[skill_id] = {}
+            bucket = level // BUCKET_WIDTH
+            if skill_buckets[bucket] is None:
+                skill_buckets[bucket] = bytearray(size)
+            _set_bit(skill_buckets[bucket], ordinal)
+            self._exact[skill_id].setdefault(level, array('I')).append(ordinal)
+
+        self._thresholds = {}
+        for skill_id, skill_buckets in buckets.items():
+            thresholds = [0] * BUCKETS
+            running = 0
+            for bucket in range(BUCKETS - 1, -1, -1):
+                if skill_buckets[bucket] is not None:
+                    running |= int.from_bytes(skill_buckets[bucket], 'little')
+                thresholds[bucket] = running
+            self._thresholds[skill_id] = thresholds
+
+        self._load_certifications(cursor)
+
+    def _load_certifications(self, cursor, employee_id: str = None):
+        today = date.today().isoformat()
+        condition = 'WHERE employee_id = ?' if employee_id else ''
+        cursor.execute(f'''
+            SELECT employee_id,
+                   MAX(status = 'active' AND (expiry_date IS NULL OR expiry_date >= ?)),
+                   MAX(status = 'expired' OR (expiry_date IS NOT NULL AND expiry_date < ?))
+            FROM certifications
+            {condition}
+            GROUP BY employee_id
+        ''', [today, today] + ([employee_id] if employee_id else []))
+        rows = cursor.fetchall()
+
+        if employee_id is None:
+            size = (len(self._employee_ids) + 7) // 8
+            certified = bytearray(size)
+            expired = bytearray(size)
+            for holder, valid, lapsed in rows:
+                ordinal = self._ordinals.get(holder)
+                if ordinal is None:
+                    continue
+                if valid:
+                    _set_bit(certified, ordinal)
+                if lapsed:
+                    _set_bit(expired, ordinal)
+            self._certified = int.from_bytes(certified, 'little')
+            self._expired = int.from_bytes(expired, 'little')
+            self._cert_date = today
+            return
+
+        bit = 1 << self._ordinals[employee_id]
+        valid, lapsed = rows[0][1:] if rows else (0, 0)
+        self._certified = self._certified | bit if valid else self._certified & ~bit
+        self._expired = self._expired | bit if lapsed else self._expired & ~bit
+
+    def _reload_employee(self, conn, employee_id: str):
+        cursor = conn.cursor()
+        cursor.execute('SELECT department FROM employees WHERE id = ?', (employee_id,))
+        row = cursor.fetchone()
+        ordinal = self._ordinals.get(employee_id)
+        if ordinal is not None:
+            self._clear_employee(ordinal)
+        if row is None:
+            return  # removed; the ordinal stays retired until the next rebuild
+
+        if ordinal is None:
+            ordinal = len(self._employee_ids)
+            self._employee_ids.append(employee_id)
+            self._employee_departments.append(None)
+            self._ordinals[employee_id] = ordinal
+        bit = 1 << ordinal
+        self._live |= bit
+        self._employee_departments[ordinal] = row[0]
+        self._departments[row[0]] = self._departments.get(row[0], 0) | bit
+
+        cursor.execute('''
+            SELECT es.skill_id, s.name, es.current_level
+            FROM employee_skills es
+            JOIN skills s ON s.id = es.skill_id
+            WHERE es.employee_id = ?
+        ''', (employee_id,))
+        for skill_id, name, level in cursor.fetchall():
+            level = _clamp(level)
+            self._skill_ids.setdefault(name.lower(), skill_id)
+            thresholds = self._thresholds.setdefault(skill_id, [0] * BUCKETS)
+            for bucket in range(level // BUCKET_WIDTH + 1):
+                thresholds[bucket] |= bit
+            self._exact.setdefault(skill_id, {}).setdefault(level, array('I')).append(ordinal)
+
+        self._load_certifications(cursor, employee_id)
+
+    def _clear_employee(self, ordinal: int):
+        mask = ~(1 << ordinal)
+        self._live &= mask
+        department = self._employee_departments[ordinal]
+        if department in self._departments:
+            self._departments[department] &= mask
+        bit = 1 << ordinal
+        for skill_id, thresholds in self._thresholds.items():
+            if not thresholds[0] & bit:
+                continue
+            top = max(bucket for bucket in range(BUCKETS) if thresholds[bucket] & bit)
+            for bucket in range(top + 1):
+                thresholds[bucket] &= mask
+            exact = self._exact[skill_id]
+            for level in range(top * BUCKET_WIDTH, min(100, (top + 1) * BUCKET_WIDTH - 1) + 1):
+                if ordinal in exact.get(level, ()):
+                    exact[level].remove(ordinal)
+                    break
+        self._certified &= mask
+        self._expired &= mask
+
+    def _at_least(self, name: str, level: int) -> int:
+        """Holders of a skill at `level` or above"""
+        skill_id = self._skill_id(name)
+        if skill_id is None:
+            return 0
+        level = _clamp(level)
+        thresholds = self._thresholds.get(skill_id)
+        if thresholds is None:
+            return 0
+        bucket = level // BUCKET_WIDTH
+        if level % BUCKET_WIDTH == 0:
+            return thresholds[bucket]
+
+        # Threshold inside a bucket: the next bucket up qualifies as a whole,
+        # plus whoever holds one of the remaining levels of this bucket
+        above = thresholds[bucket + 1] if bucket + 1 < BUCKETS else 0
+        exact = self._exact[skill_id]
+        qualified = bytearray((thresholds[bucket].bit_length() + 7) // 8)
+        for exact_level in range(level, (bucket + 1) * BUCKET_WIDTH):
+            for ordinal in exact.get(exact_level, ()):
+                qualified[ordinal >> 3] |= 1 << (ordinal & 7)
+        return above | int.from_bytes(qualified, 'little')
+
+    def _skill_id(self, name: str) -> Optional[str]:
+        skill_id = self._skill_ids.get(name.lower())
+        if skill_id is None:
+            # "k8s" or "React.js" for a skill stored under another name
+            conn = self.db._read_connection()
+            try:
+                skill_id = self.db.skill_canonicalizer.resolve(conn.cursor(), name, learn=False)
+            finally:
+                conn.close()
+            if skill_id is not None:
+                self._skill_ids[name.lower()] = skill_id
+        return skill_id
+
+    def _union(self, bitmaps) -> int:
+        result = 0
+        for bitmap in bitmaps:
+            result |= bitmap
+        return result
+
+    def _on_write(self, tables, employee_id: str = None):
+        if not INDEX_TABLES.intersection(tables):
+            return
+        with self._lock:
+            if employee_id is None:
+                self._stale = True
+            else:
+                self._dirty.add(employee_id)
+
+def _set_bit(bits: bytearray, ordinal: int):
+    bits[ordinal >> 3] |= 1 << (ordinal & 7)
+
+def _clamp(level) -> int:
+    return max(0, min(100, int(level or 0)))
+
+def _ordinals(bitmap: int, limit: int = None) -> List[int]:
+    """Positions of the set bits, lowest first"""
+    if bitmap <= 0:
+        return []
+    if bitmap.bit_count() <= 32:
+        # A few bits: peel off the lowest one instead of formatting every bit
+        ordinals = []
+        while bitmap and (limit is None or len(ordinals) < limit):
+            lowest = bitmap & -bitmap
+            ordinals.append(lowest.bit_length() - 1)
+            bitmap ^= lowest
+        return ordinals
+    digits = bin(bitmap)[:1:-1]
+    ordinals = []
+    position = digits.find('1')
+    while position != -1 and (limit is None or len(ordinals) < limit):
+        ordinals.append(position)
+        position = digits.find('1', position + 1)
+    return ordinals
+
+def _skill_condition(text: str) -> Tuple[str, int]:
+    """'Python:80' -> ('Python', 80); a bare name means any level"""
+    name, _, level = text.rpartition(':')
+    if not name or not level.strip().isdigit():
+        return text, 0
+    return name, int(level)
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Boolean skill queries over the in-memory bitmap index")
+    parser.add_argument('--db', default="employee_dashboard.db", help="SQLite database path")
+    parser.add_argument('--skill', action='append', default=[], metavar='NAME[:LEVEL]',
+                        help="Required skill and minimum level (repeatable)")
+    parser.add_argument('--any-skill', action='append', default=[], metavar='NAME[:LEVEL]',
+                        help="At least one of these skills (repeatable)")
+    parser.add_argument('--exclude-skill', action='append', default=[], metavar='NAME[:LEVEL]',
+                        help="None of these skills (repeatable)")
+    parser.add_argument('--department', action='append', help="Department (repeatable, OR)")
+    parser.add_argument('--no-expired', action='store_true', help="Exclude holders of expired certifications")
+    parser.add_argument('--certified', action='store_true', help="Only holders of a valid certification")
+    parser.add_argument('--limit', type=int, default=20, help="Number of ids to print")
+    args = parser.parse_args(argv)
+
+    index = SkillBitmapIndex(EmployeeDashboardDB(args.db))
+    index.rebuild()
+    print(f"[v0] Indexed {index.stats()['employees']} employees in {index.stats()['seconds']}s")
+
+    started = time.perf_counter()
+    bitmap = index.query(
+        skills=dict(map(_skill_condition, args.skill)) or None,
+        any_skills=dict(map(_skill_condition, args.any_skill)) or None,
+        exclude_skills=dict(map(_skill_condition, args.exclude_skill)) or None,
+        departments=args.department,
+        certified=True if args.certified else None,
+        expired_certifications=False if args.no_expired else None
+    )
+    elapsed = time.perf_counter() - started
+    print(f"[v0] {bitmap.bit_count()} matching employees in {elapsed * 1e6:.0f}us")
+    for employee_id in index.employees(bitmap, args.limit):
+        print(f"[v0] - {employee_id}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,363 @@
+"""
+Skill Name Canonicalization
+Keeps one `skills` row per real skill:
+- Normalized match keys, so "React.js", "React js" and "React" or "C#" and "C sharp" are one key
+- Alias table mapping keys to canonical skill ids, with built-in aliases such as "k8s"
+- Character trigram index over alias keys for fuzzy matching of new names on insert
+- Bulk merge job that repoints `employee_skills` with set-based statements,
+  keeping the highest level when an employee held several duplicates
+"""
+
+import argparse
+import json
+import re
+import sys
+from typing import Dict, List, Optional
+
+# Symbols that carry meaning in skill names, spelled out before punctuation is dropped
+SYMBOL_WORDS = (('++', 'plusplus'), ('#', 'sharp'), ('+', 'plus'))
+
+# Common alternative names, registered once the canonical skill exists
+BUILTIN_ALIASES = {
+    'golang': 'Go',
+    'k8s': 'Kubernetes',
+    'js': 'JavaScript',
+    'ecmascript': 'JavaScript',
+    'ts': 'TypeScript',
+    'postgres': 'PostgreSQL',
+    'ml': 'Machine Learning',
+    'dotnet': '.NET',
+    'amazon web services': 'AWS',
+    'google cloud platform': 'GCP',
+    'ci/cd': 'CI/CD Pipelines',
+}
+
+# Trigram similarity (Dice coefficient) a fuzzy match has to exceed; lower
+# values start pairing distinct skills such as "Project" and "Product Management"
+SIMILARITY_THRESHOLD = 0.8
+
+# A key that extends another by this many characters adds a word ("Machine
+# Learning Ops"), it does not misspell it
+MIN_EXTRA_WORD_LENGTH = 3
+
+# Shorter keys only match exactly; a typo in "Go" or "R" is another skill
+MIN_FUZZY_LENGTH = 4
+
+# Fuzzy candidates scored per lookup, by shared trigram count
+CANDIDATE_LIMIT = 20
+
+def normalize_skill_name(name: str) -> str:
+    """Match key of a skill name: lowercase alphanumerics, symbols spelled out"""
+    text = (name or '').strip().lower()
+    for symbol, word in SYMBOL_WORDS:
+        text = text.replace(symbol, word)
+    key = re.sub(r'[^a-z0-9]', '', text)
+    # "React.js" and "Node JS" name the library, not a different skill
+    if key.endswith('js') and len(key) > 4:
+        key = key[:-2]
+    return key
+
+def trigrams(key: str) -> set:
+    """Character trigrams of a match key, padded so short keys still have some"""
+    padded = f'  {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def similarity(a: str, b: str) -> float:
+    """Dice coefficient of two keys' trigram sets.
+
+    0 when their numbers or spelled-out symbols differ, which name versions
+    or other languages ("Python 2", "C++"), or when one key is the other
+    with words added:
+
+    >>> similarity('cprogramming', 'cplusprogramming')
+    0.0
+    >>> similarity('csharp', 'cplusplus')
+    0.0
+    >>> similarity('machinelearning', 'machinelearningops')
+    0.0
+    >>> similarity('kubernetes', 'kubernetees') > SIMILARITY_THRESHOLD
+    True
+    """
+    if re.sub(r'\D', '', a) != re.sub(r'\D', '', b):
+        return 0.0
+    if _symbol_words(a) != _symbol_words(b):
+        return 0.0
+    shorter, longer = sorted((a, b), key=len)
+    if len(longer) - len(shorter) >= MIN_EXTRA_WORD_LENGTH and (
+            longer.startswith(shorter) or longer.endswith(shorter)):
+        return 0.0
+    grams_a = trigrams(a)
+    grams_b = trigrams(b)
+    return 2 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+
+def _symbol_words(key: str) -> List[str]:
+    return re.findall('|'.join(word for _, word in SYMBOL_WORDS), key)
+
+class SkillCanonicalizer:
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD, min_fuzzy_length: int = MIN_FUZZY_LENGTH):
+        self.threshold = threshold
+        self.min_fuzzy_length = min_fuzzy_length
+
+    @staticmethod
+    def create_schema(cursor):
+        """Create the alias and trigram tables (called by `init_database`)"""
+        # alias_key is a normalized name; `source` is 'name' for a skill's
+        # own name, 'builtin', 'fuzzy' (learned on insert), 'merged' or 'manual'
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS skill_aliases (
+                alias_key TEXT PRIMARY KEY,
+                skill_id TEXT NOT NULL,
+                alias TEXT NOT NULL,
+                source TEXT NOT NULL DEFAULT 'name',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_skill_aliases_skill
+            ON skill_aliases (skill_id)
+        ''')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS skill_alias_ngrams (
+                gram TEXT NOT NULL,
+                alias_key TEXT NOT NULL,
+                PRIMARY KEY (gram, alias_key)
+            ) WITHOUT ROWID
+        ''')
+
+    def resolve(self, cursor, name: str, learn: bool = True) -> Optional[str]:
+        """Id of the existing skill `name` refers to, or None.
+
+        Tries the alias table, then a fuzzy trigram match. With `learn`
+        (needs a write cursor) a fuzzy match is stored as an alias, so the
+        next lookup is exact. Only indexed skills are found: `register` new
+        ones, and `sync` after bulk loads.
+        """
+        key = normalize_skill_name(name)
+        if not key:
+            return None
+
+        cursor.execute('''
+            SELECT a.skill_id FROM skill_aliases a JOIN skills s ON s.id = a.skill_id
+            WHERE a.alias_key = ?
+        ''', (key,))
+        row = cursor.fetchone()
+        if row:
+            return row[0]
+
+        match = self._fuzzy_match(cursor, key)
+        if match is None:
+            return None
+        if learn:
+            self.register(cursor, match, name, 'fuzzy')
+        return match
+
+    def register(self, cursor, skill_id: str, name: str, source: str = 'name') -> bool:
+        """Map `name` to `skill_id`; False when its key belongs to another live skill"""
+        key = normalize_skill_name(name)
+        if not key:
+            return False
+        # A key left behind by a deleted skill is taken over
+        cursor.execute('''
+            INSERT INTO skill_aliases (alias_key, skill_id, alias, source)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (alias_key) DO UPDATE
+            SET skill_id = excluded.skill_id, alias = excluded.alias, source = excluded.source
+            WHERE skill_id NOT IN (SELECT id FROM skills)
+        ''', (key, skill_id, name, source))
+        if cursor.rowcount == 0:
+            return False
+        cursor.executemany('INSERT OR IGNORE INTO skill_alias_ngrams (gram, alias_key) VALUES (?, ?)',
+                           [(gram, key) for gram in trigrams(key)])
+        return True
+
+    def sync(self, cursor) -> int:
+        """Index skills added without going through `register` (seeding, imports).
+
+        Scans every skill, so it belongs after bulk loads, not on the insert path.
+        """
+        cursor.execute('''
+            SELECT s.id, s.name FROM skills s
+            WHERE NOT EXISTS (SELECT 1 FROM skill_aliases a WHERE a.skill_id = s.id)
+        ''')
+        unindexed = cursor.fetchall()
+        indexed = sum(self.register(cursor, skill_id, name) for skill_id, name in unindexed)
+
+        if indexed:
+            for alias, canonical in BUILTIN_ALIASES.items():
+                cursor.execute('SELECT skill_id FROM skill_aliases WHERE alias_key = ?',
+                               (normalize_skill_name(canonical),))
+                row = cursor.fetchone()
+                if row:
+                    self.register(cursor, row[0], alias, 'builtin')
+        return indexed
+
+    def plan_merge(self, cursor) -> Dict[str, str]:
+        """Map of duplicate skill id -> canonical skill id.
+
+        The most widely held skill of each group stays canonical; the others
+        are matched to it by key, alias or trigram similarity. Only reads, so
+        it also runs on a read connection; skills not indexed yet are planned
+        from their names and the built-in aliases.
+        """
+        cursor.execute('''
+            SELECT s.id, s.name, COUNT(es.id) AS holders
+            FROM skills s
+            LEFT JOIN employee_skills es ON es.skill_id = s.id
+            GROUP BY s.id
+            ORDER BY holders DESC, s.created_at, s.id
+        ''')
+        skills = cursor.fetchall()
+        cursor.execute('SELECT alias_key, skill_id FROM skill_aliases')
+        aliases = dict(cursor.fetchall())
+        builtin = {normalize_skill_name(alias): normalize_skill_name(name) for alias, name in BUILTIN_ALIASES.items()}
+
+        canonical = {}  # key -> canonical skill id
+        canonical_ids = set()
+        grams = {}  # trigram -> canonical keys
+        mapping = {}
+        for skill_id, name, _ in skills:
+            key = normalize_skill_name(name)
+            target = canonical.get(key)
+            if target is None and aliases.get(key) in canonical_ids:
+                target = aliases[key]
+            if target is None and key in builtin:
+                target = canonical.get(builtin[key])
+            if target is None and len(key) >= self.min_fuzzy_length:
+                shared = {}
+                for gram in trigrams(key):
+                    for other in grams.get(gram, ()):
+                        shared[other] = shared.get(other, 0) + 1
+                best = max(shared, key=lambda other: (similarity(key, other), other), default=None)
+                if best is not None and similarity(key, best) > self.threshold:
+                    target = canonical[best]
+
+            if target is not None and target != skill_id:
+                mapping[skill_id] = target
+            elif key not in canonical:
+                canonical[key] = skill_id
+                canonical_ids.add(skill_id)
+                for gram in trigrams(key):
+                    grams.setdefault(gram, set()).add(key)
+        return mapping
+
+    def merge(self, cursor, mapping: Dict[str, str]) -> Dict:
+        """Fold duplicate skills into their canonical ones.
+
+        Employees holding several skills of a group end up with one row
+        carrying the highest current and target level; the duplicates'
+        names become aliases of the canonical skill.
+        """
+        if not mapping:
+            return {'skills_merged': 0, 'rows_repointed': 0, 'collisions': 0}
+
+        cursor.execute('DROP TABLE IF EXISTS temp.skill_merge_map')
+        cursor.execute('CREATE TEMP TABLE skill_merge_map (old_id TEXT PRIMARY KEY, new_id TEXT NOT NULL)')
+        cursor.executemany('INSERT INTO skill_merge_map (old_id, new_id) VALUES (?, ?)', mapping.items())
+
+        # Only employees holding a duplicate have rows to change
+        affected_rows = '''
+            skill_id IN (SELECT old_id FROM skill_merge_map UNION SELECT new_id FROM skill_merge_map)
+            AND employee_id IN (
+                SELECT employee_id FROM employee_skills
+                WHERE skill_id IN (SELECT old_id FROM skill_merge_map)
+            )
+        '''
+        cursor.execute('SELECT COUNT(*) FROM employee_skills WHERE skill_id IN (SELECT old_id FROM skill_merge_map)')
+        repointed = cursor.fetchone()[0]
+
+        cursor.execute('DROP TABLE IF EXISTS temp.skill_merge_rows')
+        cursor.execute(f'''
+            CREATE TEMP TABLE skill_merge_rows AS
+            SELECT MIN(es.id) AS id, es.employee_id, COALESCE(m.new_id, es.skill_id) AS skill_id,
+                   MAX(es.current_level) AS current_level, MAX(es.target_level) AS target_level,
+                   MAX(es.is_certified) AS is_certified, MAX(es.last_updated) AS last_updated,
+                   COUNT(*) AS merged
+            FROM employee_skills es
+            LEFT JOIN skill_merge_map m ON m.old_id = es.skill_id
+            WHERE {affected_rows}
+            GROUP BY es.employee_id, COALESCE(m.new_id, es.skill_id)
+        ''')
+        cursor.execute('SELECT COALESCE(SUM(merged - 1), 0) FROM skill_merge_rows')
+        collisions = cursor.fetchone()[0]
+
+        cursor.execute(f'DELETE FROM employee_skills WHERE {affected_rows}')
+        cursor.execute('''
+            INSERT INTO employee_skills
+            (id, employee_id, skill_id, current_level, target_level, is_certified, last_updated)
+            SELECT id, employee_id, skill_id, current_level, target_level, is_certified, last_updated
+            FROM skill_merge_rows
+        ''')
+
+        cursor.execute('''
+            SELECT s.name, m.new_id FROM skills s JOIN skill_merge_map m ON m.old_id = s.id
+        ''')
+        old_names = cursor.fetchall()
+        cursor.execute('''
+            UPDATE skill_aliases
+            SET skill_id = (SELECT new_id FROM skill_merge_map WHERE old_id = skill_aliases.skill_id)
+            WHERE skill_id IN (SELECT old_id FROM skill_merge_map)
+        ''')
+        cursor.execute('DELETE FROM skills WHERE id IN (SELECT old_id FROM skill_merge_map)')
+        for name, new_id in old_names:
+            self.register(cursor, new_id, name, 'merged')
+
+        cursor.execute('DROP TABLE temp.skill_merge_rows')
+        cursor.execute('DROP TABLE temp.skill_merge_map')
+        return {'skills_merged': len(mapping), 'rows_repointed': repointed, 'collisions': collisions}
+
+    def _fuzzy_match(self, cursor, key: str) -> Optional[str]:
+        if len(key) < self.min_fuzzy_length:
+            return None
+        grams = list(trigrams(key))
+        placeholders = ', '.join('?' * len(grams))
+        cursor.execute(f'''
+            SELECT n.alias_key, a.skill_id
+            FROM skill_alias_ngrams n
+            JOIN skill_aliases a ON a.alias_key = n.alias_key
+            JOIN skills s ON s.id = a.skill_id
+            WHERE n.gram IN ({placeholders})
+            GROUP BY n.alias_key
+            ORDER BY COUNT(*) DESC, n.alias_key
+            LIMIT ?
+        ''', grams + [CANDIDATE_LIMIT])
+        best = None
+        best_score = self.threshold
+        for alias_key, skill_id in cursor.fetchall():
+            score = similarity(key, alias_key)
+            if score > best_score:
+                best, best_score = skill_id, score
+        return best
+
+def main(argv: List[str] = None):
+    from employee_data_manager import EmployeeDashboardDB
+
+    parser = argparse.ArgumentParser(description="Canonicalize duplicate skill names")
+    parser.add_argument('--db', default="employee_dashboard.db", help="SQLite database path")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    merge = commands.add_parser('merge', help="Merge duplicate skills into canonical ones")
+    merge.add_argument('--dry-run', action='store_true', help="Only print the planned merges")
+
+    resolve = commands.add_parser('resolve', help="Print the skill a name resolves to")
+    resolve.add_argument('name')
+
+    alias = commands.add_parser('alias', help="Add an alias for an existing skill")
+    alias.add_argument('alias')
+    alias.add_argument('skill', help="Name of the canonical skill")
+
+    args = parser.parse_args(argv)
+    db = EmployeeDashboardDB(args.db)
+
+    if args.command == 'merge':
+        result = db.merge_duplicate_skills(dry_run=args.dry_run)
+    elif args.command == 'resolve':
+        result = db.resolve_skill(args.name)
+    else:
+        result = db.add_skill_alias(args.alias, args.skill)
+    print(json.dumps(result, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
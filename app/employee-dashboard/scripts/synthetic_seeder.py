@@ -0,0 +1,455 @@
+"""
+Synthetic Data Seeder
+Builds staging databases at production volume:
+- Deterministic: the same seed and configuration give a byte-identical database file
+- Configurable row counts and value distributions per table
+- Chunked `executemany` transactions with bulk-load pragmas
+- Secondary indexes and triggers are dropped during the load and rebuilt once at the end
+- With change capture enabled the seeded rows are not logged; consumers of the
+  change log are sent back to a full copy instead
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+from itertools import islice
+from typing import Dict, Iterator, List, Tuple
+
+from change_log import TRIGGER_PREFIX, mark_uncaptured
+from employee_data_manager import TABLES, EmployeeDashboardDB, bump_table_versions
+
+# Absolute counts for catalog tables, per-employee averages for employee
+# tables and a per-path average for milestones. Per-employee counts are drawn
+# uniformly from 0..2*average, so the totals match the averages in expectation.
+DEFAULT_COUNTS = {
+    'employees': 1000,
+    'skills': 250,
+    'training_courses': 400,
+    'employee_skills': 8,
+    'certifications': 1.5,
+    'course_enrollments': 3,
+    'career_paths': 1,
+    'career_milestones': 4,
+    'learning_activities': 50,
+}
+
+DEFAULT_DISTRIBUTIONS = {
+    # Weighted choices
+    'departments': {
+        'Software Engineering': 30, 'Gen AI Development': 15, 'Data Science': 12, 'Cloud Infrastructure': 10,
+        'Quality Assurance': 8, 'Product Management': 8, 'Design': 6, 'Sales': 6, 'Human Resources': 5,
+    },
+    'positions': {
+        'Associate': 20, 'Developer': 30, 'Senior Developer': 25, 'Lead': 12, 'Manager': 8, 'Director': 5,
+    },
+    'enrollment_status': {'enrolled': 20, 'in_progress': 40, 'completed': 35, 'dropped': 5},
+    'career_path_status': {'active': 80, 'completed': 15, 'paused': 5},
+    'milestone_status': {'not_started': 35, 'in_progress': 35, 'completed': 30},
+    'activity_types': {'course': 45, 'skill_practice': 30, 'certification': 10, 'workshop': 10, 'mentoring': 5},
+    # (mean, standard deviation), clamped to 0-100
+    'skill_level': (62, 18),
+    # (low, high), uniform
+    'years_experience': (0.0, 25.0),
+    'hours_spent': (0.5, 8.0),
+    'course_price': (49, 499),
+    'course_rating': (3.5, 5.0),
+    # Probabilities
+    'certified_skill_rate': 0.3,
+    'free_course_rate': 0.35,
+    # Days; certifications expire after this many days
+    'certification_validity_days': 730,
+    'hire_window_days': 15 * 365,
+    'activity_window_days': 2 * 365,
+}
+
+SKILL_CATEGORIES = ('Programming', 'Frontend', 'Backend', 'AI/ML', 'Cloud', 'DevOps', 'Database',
+                    'Analytics', 'Design', 'API')
+
+FIRST_NAMES = ('Aarav', 'Priya', 'Sarah', 'James', 'Mei', 'Carlos', 'Fatima', 'Liam', 'Ananya', 'Noah',
+               'Sofia', 'Kenji', 'Amara', 'Lucas', 'Zara', 'Ethan', 'Isha', 'Mateo', 'Chloe', 'Omar')
+
+LAST_NAMES = ('Johnson', 'Sharma', 'Chen', 'Garcia', 'Okafor', 'Smith', 'Naik', 'Tanaka', 'Hussain', 'Rossi',
+              'Kim', 'Muller', 'Silva', 'Patel', 'Nguyen', 'Roy', 'Brown', 'Khan', 'Lopez', 'Ivanova')
+
+CERTIFICATION_NAMES = (('AWS Solutions Architect', 'Amazon'), ('Azure Fundamentals', 'Microsoft'),
+                       ('Google Cloud Engineer', 'Google'), ('Certified Kubernetes Administrator', 'CNCF'),
+                       ('Scrum Master', 'Scrum Alliance'), ('TensorFlow Developer', 'Google'),
+                       ('Python Professional', 'Python Institute'), ('Oracle Java SE', 'Oracle'))
+
+CAREER_TRACKS = (('Technical Lead', 'Senior Developer'), ('Engineering Manager', 'Lead'),
+                 ('Principal Engineer', 'Senior Developer'), ('AI Architect', 'Developer'),
+                 ('Product Owner', 'Associate'))
+
+# Tables in load order; rows of later tables reference earlier ones
+LOAD_ORDER = ('employees', 'skills', 'employee_skills', 'certifications', 'training_courses',
+              'course_enrollments', 'career_paths', 'career_milestones', 'learning_activities')
+
+COLUMNS = {
+    'employees': ('id', 'name', 'email', 'department', 'position', 'hire_date', 'photo_url',
+                  'years_experience', 'created_at'),
+    'skills': ('id', 'name', 'category', 'description', 'created_at'),
+    'employee_skills': ('id', 'employee_id', 'skill_id', 'current_level', 'target_level', 'is_certified',
+                        'last_updated'),
+    'certifications': ('id', 'employee_id', 'name', 'issuer', 'issue_date', 'expiry_date', 'status'),
+    'training_courses': ('id', 'title', 'provider', 'description', 'duration_weeks', 'price', 'is_free',
+                         'category', 'rating', 'total_students', 'skills_taught', 'created_at'),
+    'course_enrollments': ('id', 'employee_id', 'course_id', 'enrollment_date', 'completion_date',
+                           'progress_percentage', 'status', 'manager_approved'),
+    'career_paths': ('id', 'employee_id', 'title', 'current_level', 'target_level', 'progress_percentage',
+                     'estimated_completion_months', 'priority', 'status', 'created_at'),
+    'career_milestones': ('id', 'career_path_id', 'title', 'description', 'status', 'progress_percentage',
+                          'points', 'deadline', 'completion_date'),
+    'learning_activities': ('id', 'employee_id', 'activity_type', 'activity_name', 'hours_spent', 'date'),
+}
+
+# Short row-id prefixes; ids are "<prefix>_<zero-padded sequence>" like the
+# repo's real employee ids, so inserts append to the end of each primary key.
+ID_PREFIXES = {
+    'employees': 'emp', 'skills': 'skl', 'employee_skills': 'esk', 'certifications': 'crt',
+    'training_courses': 'crs', 'course_enrollments': 'enr', 'career_paths': 'pth',
+    'career_milestones': 'mst', 'learning_activities': 'act',
+}
+
+class _WeightedChoice:
+    """Weighted choice over a fixed population"""
+
+    def __init__(self, weights: Dict[str, float]):
+        self.values = list(weights)
+        self.cum_weights = []
+        total = 0
+        for value in self.values:
+            total += weights[value]
+            self.cum_weights.append(total)
+
+    def one(self, rng: random.Random) -> str:
+        return rng.choices(self.values, cum_weights=self.cum_weights)[0]
+
+    def many(self, rng: random.Random, k: int) -> List[str]:
+        return rng.choices(self.values, cum_weights=self.cum_weights, k=k)
+
+class SyntheticSeeder:
+    def __init__(self, db: EmployeeDashboardDB, seed: int = 0, counts: Dict = None,
+                 distributions: Dict = None, base_date: str = '2024-06-30', chunk_size: int = 50000):
+        """
+        `counts` and `distributions` are merged over DEFAULT_COUNTS and
+        DEFAULT_DISTRIBUTIONS. Generated history ends at `base_date`, which
+        also stamps the created_at columns, so the output does not depend on
+        when the seeder runs.
+        """
+        self.db = db
+        self.seed = seed
+        self.counts = dict(DEFAULT_COUNTS, **(counts or {}))
+        self.distributions = dict(DEFAULT_DISTRIBUTIONS, **(distributions or {}))
+        self.base_date = date.fromisoformat(base_date)
+        self.chunk_size = chunk_size
+
+        # Day offsets before base_date -> ISO date, shared by every table
+        window = max(self.distributions['hire_window_days'], self.distributions['activity_window_days'])
+        self._dates = [(self.base_date - timedelta(days=offset)).isoformat() for offset in range(window + 1)]
+        self._timestamp = f'{self.base_date.isoformat()} 00:00:00'
+
+    def seed_database(self) -> Dict:
+        """Generate every table and return per-table row counts and timings.
+
+        Reproducibility is byte for byte when seeding a new database file;
+        seeding into a database that already has rows appends to it.
+        """
+        started = time.perf_counter()
+        stats = {'tables': {}}
+
+        conn = self.db._connect()
+        conn.isolation_level = None  # transactions are managed explicitly below
+        cursor = conn.cursor()
+        for pragma in ('synchronous = OFF', 'journal_mode = MEMORY', 'temp_store = MEMORY',
+                       'cache_size = -262144', 'locking_mode = EXCLUSIVE'):
+            cursor.execute(f'PRAGMA {pragma}')
+
+        # Maintaining secondary indexes and statistics triggers row by row
+        # dominates bulk-load time; rebuild them once after the load instead.
+        cursor.execute('''
+            SELECT type, name, sql FROM sqlite_master
+            WHERE type IN ('index', 'trigger') AND sql IS NOT NULL
+            ORDER BY type = 'trigger', name
+        ''')
+        deferred = cursor.fetchall()
+        for object_type, name, _ in deferred:
+            cursor.execute(f'DROP {object_type.upper()} {name}')
+        capturing = any(object_type == 'trigger' and name.startswith(TRIGGER_PREFIX)
+                        for object_type, name, _ in deferred)
+
+        try:
+            self._employees = []  # (department index, hire-date offset) per employee
+            for table in LOAD_ORDER:
+                table_started = time.perf_counter()
+                rows = self._insert(cursor, table, getattr(self, f'_generate_{table}')())
+                stats['tables'][table] = {'rows': rows, 'seconds': round(time.perf_counter() - table_started, 2)}
+            # Index the skill names for alias and fuzzy lookups
+            cursor.execute('BEGIN')
+            self.db.skill_canonicalizer.sync(cursor)
+            cursor.execute('COMMIT')
+        finally:
+            self._employees = None
+            index_started = time.perf_counter()
+            if conn.in_transaction:
+                cursor.execute('ROLLBACK')  # the chunk that failed
+            cursor.execute('BEGIN')
+            for _, _, sql in deferred:
+                cursor.execute(sql)
+            # The rows went in without the version triggers
+            bump_table_versions(cursor, LOAD_ORDER)
+            if capturing:
+                # ... and without the change log's, so its consumers must re-copy
+                stats['change_log_purged_through'] = mark_uncaptured(cursor)
+            cursor.execute('COMMIT')
+            stats['index_seconds'] = round(time.perf_counter() - index_started, 2)
+            conn.close()
+
+        # Triggers are back, so the rebuild also fills the department rollups
+        self.db.rebuild_statistics()
+        self.db._after_write(*TABLES)
+
+        elapsed = time.perf_counter() - started
+        total = sum(table['rows'] for table in stats['tables'].values())
+        stats['rows'] = total
+        stats['seconds'] = round(elapsed, 2)
+        stats['rows_per_second'] = round(total / elapsed) if elapsed > 0 else 0
+        return stats
+
+    def _insert(self, cursor, table: str, rows: Iterator[Tuple]) -> int:
+        columns = COLUMNS[table]
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        inserted = 0
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                return inserted
+            cursor.execute('BEGIN')
+            cursor.executemany(sql, chunk)
+            cursor.execute('COMMIT')
+            inserted += len(chunk)
+
+    def _rng(self, table: str) -> random.Random:
+        # One stream per table, so changing one table's count or distribution
+        # leaves every other table's values unchanged
+        return random.Random(f'{self.seed}:{table}')
+
+    def _per_employee(self, rng: random.Random, table: str) -> Iterator[Tuple[int, int]]:
+        """Yield (employee index, row count) for a per-employee table"""
+        # floor(U * (2m + 1)) has mean m, also for fractional averages
+        span = self.counts[table] * 2 + 1
+        for index in range(len(self._employees)):
+            count = int(rng.random() * span)
+            if count:
+                yield index, count
+
+    def _id(self, table: str, sequence: int) -> str:
+        return f'{ID_PREFIXES[table]}_{sequence:09d}'
+
+    def _generate_employees(self) -> Iterator[Tuple]:
+        rng = self._rng('employees')
+        dist = self.distributions
+        departments = _WeightedChoice(dist['departments'])
+        department_index = {name: i for i, name in enumerate(departments.values)}
+        positions = _WeightedChoice(dist['positions'])
+        low, high = dist['years_experience']
+        hire_window = dist['hire_window_days']
+
+        for n in range(self.counts['employees']):
+            first = FIRST_NAMES[int(rng.random() * len(FIRST_NAMES))]
+            last = LAST_NAMES[int(rng.random() * len(LAST_NAMES))]
+            department = departments.one(rng)
+            hire_offset = int(rng.random() * hire_window)
+            years = round(hire_offset / 365 + rng.random() * (high - low) / 4 + low, 1)
+            self._employees.append((department_index[department], hire_offset))
+            yield (self._id('employees', n), f'{first} {last}', f'{first}.{last}.{n}@company.com'.lower(),
+                   department, positions.one(rng), self._dates[hire_offset], None, min(years, high),
+                   self._timestamp)
+
+    def _generate_skills(self) -> Iterator[Tuple]:
+        rng = self._rng('skills')
+        self._skill_names = []
+        for n in range(self.counts['skills']):
+            category = SKILL_CATEGORIES[int(rng.random() * len(SKILL_CATEGORIES))]
+            name = f'{category} Skill {n:05d}'
+            self._skill_names.append(name)
+            yield (self._id('skills', n), name, category, f'Professional skill in {name}', self._timestamp)
+
+    def _generate_employee_skills(self) -> Iterator[Tuple]:
+        rng = self._rng('employee_skills')
+        mean, stdev = self.distributions['skill_level']
+        certified_rate = self.distributions['certified_skill_rate']
+        skill_count = len(self._skill_names)
+        sequence = 0
+        for index, count in self._per_employee(rng, 'employee_skills'):
+            employee_id = self._id('employees', index)
+            for skill in rng.sample(range(skill_count), min(count, skill_count)):
+                level = max(0, min(100, int(rng.gauss(mean, stdev))))
+                yield (self._id('employee_skills', sequence), employee_id, self._id('skills', skill), level, 100,
+                       rng.random() < certified_rate, self._timestamp)
+                sequence += 1
+
+    def _generate_certifications(self) -> Iterator[Tuple]:
+        rng = self._rng('certifications')
+        validity = self.distributions['certification_validity_days']
+        sequence = 0
+        for index, count in self._per_employee(rng, 'certifications'):
+            employee_id = self._id('employees', index)
+            hire_offset = self._employees[index][1]
+            for _ in range(count):
+                name, issuer = CERTIFICATION_NAMES[int(rng.random() * len(CERTIFICATION_NAMES))]
+                issue_offset = int(rng.random() * (hire_offset + 1))
+                expiry_offset = issue_offset - validity  # negative: expires after base_date
+                if expiry_offset > 0:
+                    status = 'expired'
+                elif expiry_offset > -90:
+                    status = 'expiring_soon'
+                else:
+                    status = 'active'
+                expiry = (self.base_date - timedelta(days=expiry_offset)).isoformat()
+                yield (self._id('certifications', sequence), employee_id, name, issuer,
+                       self._dates[issue_offset], expiry, status)
+                sequence += 1
+
+    def _generate_training_courses(self) -> Iterator[Tuple]:
+        rng = self._rng('training_courses')
+        dist = self.distributions
+        price_low, price_high = dist['course_price']
+        rating_low, rating_high = dist['course_rating']
+        for n in range(self.counts['training_courses']):
+            category = SKILL_CATEGORIES[int(rng.random() * len(SKILL_CATEGORIES))]
+            is_free = rng.random() < dist['free_course_rate']
+            taught = rng.sample(self._skill_names, min(3, len(self._skill_names)))
+            yield (self._id('training_courses', n), f'{category} Course {n:05d}', f'Provider {n % 37:02d}',
+                   f'Hands-on {category} training', 2 + int(rng.random() * 11),
+                   0 if is_free else round(price_low + rng.random() * (price_high - price_low)),
+                   is_free, category, round(rating_low + rng.random() * (rating_high - rating_low), 1),
+                   int(rng.random() * 5000), json.dumps(taught), self._timestamp)
+
+    def _generate_course_enrollments(self) -> Iterator[Tuple]:
+        rng = self._rng('course_enrollments')
+        statuses = _WeightedChoice(self.distributions['enrollment_status'])
+        course_count = self.counts['training_courses']
+        window = self.distributions['activity_window_days']
+        sequence = 0
+        for index, count in self._per_employee(rng, 'course_enrollments'):
+            employee_id = self._id('employees', index)
+            for course in rng.sample(range(course_count), min(count, course_count)):
+                status = statuses.one(rng)
+                enrolled_offset = int(rng.random() * min(window, self._employees[index][1] + 1))
+                completion = None
+                if status == 'completed':
+                    progress = 100
+                    completion = self._dates[int(rng.random() * (enrolled_offset + 1))]
+                elif status == 'enrolled':
+                    progress = 0
+                else:
+                    progress = 1 + int(rng.random() * 99)
+                yield (self._id('course_enrollments', sequence), employee_id, self._id('training_courses', course),
+                       self._dates[enrolled_offset], completion, progress, status, rng.random() < 0.8)
+                sequence += 1
+
+    def _generate_career_paths(self) -> Iterator[Tuple]:
+        rng = self._rng('career_paths')
+        statuses = _WeightedChoice(self.distributions['career_path_status'])
+        self._path_owners = []
+        sequence = 0
+        for index, count in self._per_employee(rng, 'career_paths'):
+            employee_id = self._id('employees', index)
+            for _ in range(count):
+                title, current = CAREER_TRACKS[int(rng.random() * len(CAREER_TRACKS))]
+                status = statuses.one(rng)
+                self._path_owners.append(index)
+                yield (self._id('career_paths', sequence), employee_id, title, current, title,
+                       100 if status == 'completed' else int(rng.random() * 100), 6 + int(rng.random() * 19),
+                       ('high', 'medium', 'low')[int(rng.random() * 3)], status, self._timestamp)
+                sequence += 1
+
+    def _generate_career_milestones(self) -> Iterator[Tuple]:
+        rng = self._rng('career_milestones')
+        statuses = _WeightedChoice(self.distributions['milestone_status'])
+        span = self.counts['career_milestones'] * 2 + 1
+        sequence = 0
+        for path in range(len(self._path_owners)):
+            path_id = self._id('career_paths', path)
+            for step in range(int(rng.random() * span)):
+                status = statuses.one(rng)
+                # Deadlines fall from a year before to a year after base_date
+                deadline = (self.base_date + timedelta(days=int(rng.random() * 730) - 365)).isoformat()
+                completion = deadline if status == 'completed' and deadline <= self._dates[0] else None
+                progress = 100 if status == 'completed' else 0 if status == 'not_started' else int(rng.random() * 100)
+                yield (self._id('career_milestones', sequence), path_id, f'Milestone {step + 1}',
+                       f'Step {step + 1} towards the target role', status, progress,
+                       10 * (5 + int(rng.random() * 16)), deadline, completion)
+                sequence += 1
+        self._path_owners = None
+
+    def _generate_learning_activities(self) -> Iterator[Tuple]:
+        rng = self._rng('learning_activities')
+        dist = self.distributions
+        types = _WeightedChoice(dist['activity_types'])
+        names = {activity_type: [f'{activity_type.replace("_", " ").title()} session {i}' for i in range(1, 21)]
+                 for activity_type in types.values}
+        hours_low, hours_high = dist['hours_spent']
+        hours_span = hours_high - hours_low
+        window = dist['activity_window_days']
+        random_value = rng.random
+        dates = self._dates
+        sequence = 0
+
+        # Batched per employee: one `choices` call and plain list indexing keep
+        # the per-row cost low enough for tens of millions of rows.
+        for index, count in self._per_employee(rng, 'learning_activities'):
+            employee_id = self._id('employees', index)
+            span = min(window, self._employees[index][1]) + 1
+            for activity_type in types.many(rng, count):
+                yield (f'act_{sequence:09d}', employee_id, activity_type, names[activity_type][int(random_value() * 20)],
+                       round(hours_low + random_value() * hours_span, 1), dates[int(random_value() * span)])
+                sequence += 1
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Build a deterministic synthetic employee dashboard database")
+    parser.add_argument('--db', default="employee_dashboard_staging.db", help="SQLite database path")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed")
+    parser.add_argument('--employees', type=int, help="Number of employees")
+    parser.add_argument('--activities-per-employee', type=float, help="Average learning activities per employee")
+    parser.add_argument('--config', help="JSON file with 'counts' and 'distributions' overrides")
+    parser.add_argument('--base-date', default='2024-06-30', help="Latest generated date (YYYY-MM-DD)")
+    parser.add_argument('--chunk-size', type=int, default=50000, help="Rows per transaction")
+    parser.add_argument('--force', action='store_true', help="Replace an existing database file")
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.db):
+        if not args.force:
+            print(f"[v0] {args.db} already exists; use --force to replace it")
+            return 1
+        os.remove(args.db)
+
+    config = {}
+    if args.config:
+        with open(args.config, encoding='utf-8') as handle:
+            config = json.load(handle)
+    counts = dict(config.get('counts', {}))
+    if args.employees is not None:
+        counts['employees'] = args.employees
+    if args.activities_per_employee is not None:
+        counts['learning_activities'] = args.activities_per_employee
+
+    db = EmployeeDashboardDB(args.db)
+    seeder = SyntheticSeeder(db, args.seed, counts, config.get('distributions'), args.base_date, args.chunk_size)
+    stats = seeder.seed_database()
+
+    for table, table_stats in stats['tables'].items():
+        print(f"[v0] {table}: {table_stats['rows']} rows in {table_stats['seconds']}s")
+    print(f"[v0] Rebuilt indexes and triggers in {stats['index_seconds']}s")
+    if 'change_log_purged_through' in stats:
+        print(f"[v0] Seeded rows were not captured; change log consumers must re-copy "
+              f"(purged through {stats['change_log_purged_through']})")
+    print(f"[v0] Seeded {stats['rows']} rows in {stats['seconds']}s ({stats['rows_per_second']} rows/s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+"""
+Team Formation Optimizer
+Finds small teams that together cover a set of required skills at minimum levels:
+- One query loads every qualifying (employee, skill) pair; each employee
+  becomes a bitmask over the requirements
+- Employees with the same mask are grouped and dominated masks dropped,
+  so the search runs over distinct coverage patterns, not people
+- Greedy set cover from several starting members, then bounded local search
+  (drop redundant members, replace two members by one, swap in stronger ones)
+- Ranked by missing skills, team size and level margin over the requirements
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from employee_data_manager import EmployeeDashboardDB
+
+# Employees kept per distinct coverage mask; more only widen the swap search
+PER_MASK = 3
+
+# Local search moves tried per team before giving up on improving it
+MAX_MOVES = 200
+
+class TeamBuilder:
+    def __init__(self, db: EmployeeDashboardDB):
+        self.db = db
+
+    def build_teams(self, requirements: Dict[str, int], departments: Iterable[str] = None,
+                    max_size: int = None, exclude: Iterable[str] = (), teams: int = 3,
+                    time_budget: float = 1.0) -> Dict:
+        """Ranked teams covering `requirements` ({skill name: minimum level}).
+
+        Members come from `departments` when given and never from `exclude`.
+        Teams have at most `max_size` members; when the skills cannot all be
+        covered, teams cover as many as possible and list the rest as missing.
+        The search stops improving after `time_budget` seconds.
+        """
+        started = time.perf_counter()
+        deadline = started + time_budget
+        skills = list(requirements)
+        candidates, unknown = self._load_candidates(requirements, departments, set(exclude))
+
+        reachable = 0
+        for mask, _, _ in candidates:
+            reachable |= mask
+        missing = [skill for i, skill in enumerate(skills) if not reachable >> i & 1]
+
+        found = {}
+        # Start from the widest coverage patterns, one employee each
+        starts = {}
+        for candidate in sorted(candidates, key=lambda c: (-c[0].bit_count(), -c[2], c[1])):
+            starts.setdefault(candidate[0], candidate)
+        starts = list(starts.values())[:max(teams * 2, 4)]
+        for start in starts:
+            team = self._greedy(candidates, reachable, max_size, start)
+            team = self._local_search(team, candidates, reachable, deadline)
+            found.setdefault(frozenset(member[1] for member in team), team)
+            if time.perf_counter() > deadline:
+                break
+
+        ranked = sorted(found.values(), key=lambda team: (
+            -_union(team).bit_count(), len(team), -sum(member[2] for member in team),
+            sorted(member[1] for member in team)
+        ))[:teams]
+
+        return {
+            'requirements': requirements,
+            'unknown_skills': unknown,
+            'unreachable_skills': missing,
+            'candidates': len(candidates),
+            'teams': [self._describe(rank, team, skills) for rank, team in enumerate(ranked, 1)],
+            'seconds': round(time.perf_counter() - started, 3)
+        }
+
+    def _load_candidates(self, requirements: Dict[str, int], departments: Iterable[str] = None,
+                         exclude: set = frozenset()) -> Tuple[List[Tuple[int, str, int]], List[str]]:
+        """(mask, employee id, level margin) per distinct mask's best employees"""
+        conn = self.db._read_connection()
+        cursor = conn.cursor()
+
+        bits = {}  # skill id -> (requirement bit, minimum level)
+        unknown = []
+        for i, (name, level) in enumerate(requirements.items()):
+            cursor.execute('SELECT id FROM skills WHERE name = ? COLLATE NOCASE', (name,))
+            row = cursor.fetchone()
+            skill_id = row[0] if row else self.db.skill_canonicalizer.resolve(cursor, name, learn=False)
+            if skill_id is None:
+                unknown.append(name)
+            else:
+                bits[skill_id] = (1 << i, level)
+
+        if not bits:
+            conn.close()
+            return [], unknown
+
+        conditions = ' OR '.join('(es.skill_id = ? AND es.current_level >= ?)' for _ in bits)
+        params = [value for skill_id, (_, level) in bits.items() for value in (skill_id, level)]
+        department_filter = ''
+        if departments is not None:
+            departments = list(departments)
+            department_filter = f" AND e.department IN ({', '.join('?' * len(departments))})"
+            params += departments
+        cursor.execute(f'''
+            SELECT es.employee_id, es.skill_id, es.current_level
+            FROM employee_skills es
+            JOIN employees e ON e.id = es.employee_id
+            WHERE ({conditions}){department_filter}
+        ''', params)
+
+        employees = {}  # employee id -> [mask, margin]
+        for employee_id, skill_id, level in cursor:
+            if employee_id in exclude:
+                continue
+            bit, minimum = bits[skill_id]
+            entry = employees.setdefault(employee_id, [0, 0])
+            entry[0] |= bit
+            entry[1] += level - minimum
+        conn.close()
+
+        by_mask = {}
+        for employee_id, (mask, margin) in employees.items():
+            by_mask.setdefault(mask, []).append((margin, employee_id))
+
+        # A mask covered by a wider one whose best employee is at least as
+        # strong can never improve a team
+        best = {mask: max(members) for mask, members in by_mask.items()}
+        masks = sorted(by_mask, key=lambda mask: -mask.bit_count())
+        kept = []
+        for mask in masks:
+            if any(other & mask == mask and other != mask and best[other][0] >= best[mask][0] for other in kept):
+                continue
+            kept.append(mask)
+
+        candidates = []
+        for mask in kept:
+            for margin, employee_id in sorted(by_mask[mask], key=lambda m: (-m[0], m[1]))[:PER_MASK]:
+                candidates.append((mask, employee_id, margin))
+        return candidates, unknown
+
+    def _greedy(self, candidates, reachable: int, max_size: Optional[int], start) -> List[Tuple]:
+        """Add the member covering the most uncovered requirements until done"""
+        team = [start]
+        covered = start[0]
+        while covered != reachable and (max_size is None or len(team) < max_size):
+            members = {member[1] for member in team}
+            pick = max(
+                (c for c in candidates if c[1] not in members),
+                key=lambda c: ((c[0] & ~covered).bit_count(), c[2]),
+                default=None
+            )
+            if pick is None or not pick[0] & ~covered:
+                break
+            team.append(pick)
+            covered |= pick[0]
+        return team
+
+    def _local_search(self, team: List[Tuple], candidates, reachable: int, deadline: float) -> List[Tuple]:
+        """Shrink and strengthen a team without losing coverage"""
+        covered = _union(team)
+        for _ in range(MAX_MOVES):
+            if time.perf_counter() > deadline:
+                break
+            improved = self._drop_redundant(team, covered)
+            improved = improved or self._merge_pair(team, candidates, covered)
+            improved = improved or self._strengthen(team, candidates)
+            if not improved:
+                break
+        return team
+
+    def _drop_redundant(self, team: List[Tuple], covered: int) -> bool:
+        for member in sorted(team, key=lambda m: m[2]):
+            rest = [other for other in team if other is not member]
+            if rest and _union(rest) == covered:
+                team.remove(member)
+                return True
+        return False
+
+    def _merge_pair(self, team: List[Tuple], candidates, covered: int) -> bool:
+        """Replace two members by one employee covering what only they cover"""
+        members = {member[1] for member in team}
+        for i in range(len(team)):
+            for j in range(i + 1, len(team)):
+                rest = _union(team[k] for k in range(len(team)) if k not in (i, j))
+                need = covered & ~rest
+                replacement = max(
+                    (c for c in candidates if c[0] & need == need and c[1] not in members),
+                    key=lambda c: c[2], default=None
+                )
+                if replacement is not None:
+                    pair = (team[i], team[j])
+                    team.remove(pair[0])
+                    team.remove(pair[1])
+                    team.append(replacement)
+                    return True
+        return False
+
+    def _strengthen(self, team: List[Tuple], candidates) -> bool:
+        """Swap a member for a stronger employee covering the same requirements"""
+        members = {member[1] for member in team}
+        for i, member in enumerate(team):
+            need = member[0] & ~_union(team[k] for k in range(len(team)) if k != i)
+            replacement = max(
+                (c for c in candidates if c[0] & need == need and c[1] not in members and c[2] > member[2]),
+                key=lambda c: c[2], default=None
+            )
+            if replacement is not None:
+                team[i] = replacement
+                return True
+        return False
+
+    def _describe(self, rank: int, team: List[Tuple], skills: List[str]) -> Dict:
+        conn = self.db._read_connection()
+        placeholders = ', '.join('?' * len(team))
+        people = {
+            row[0]: row[1:] for row in conn.execute(f'''
+                SELECT id, name, department, position FROM employees WHERE id IN ({placeholders})
+            ''', [member[1] for member in team])
+        }
+        conn.close()
+
+        covered = _union(team)
+        members = []
+        for mask, employee_id, margin in sorted(team, key=lambda m: (-m[0].bit_count(), m[1])):
+            name, department, position = people.get(employee_id, (None, None, None))
+            members.append({
+                'employee_id': employee_id, 'name': name, 'department': department, 'position': position,
+                'covers': [skill for i, skill in enumerate(skills) if mask >> i & 1],
+                'level_margin': margin
+            })
+        return {
+            'rank': rank,
+            'size': len(team),
+            'covered': [skill for i, skill in enumerate(skills) if covered >> i & 1],
+            'missing': [skill for i, skill in enumerate(skills) if not covered >> i & 1],
+            'level_margin': sum(member[2] for member in team),
+            'members': members
+        }
+
+def _union(team) -> int:
+    covered = 0
+    for member in team:
+        covered |= member[0]
+    return covered
+
+def _requirement(text: str) -> Tuple[str, int]:
+    """'Python:80' -> ('Python', 80); a bare name means any level"""
+    name, _, level = text.rpartition(':')
+    if not name or not level.strip().isdigit():
+        return text, 0
+    return name, int(level)
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Find small teams covering required skills")
+    parser.add_argument('--db', default="employee_dashboard.db", help="SQLite database path")
+    parser.add_argument('--require', action='append', required=True, metavar='SKILL[:LEVEL]',
+                        help="Required skill and minimum level (repeatable)")
+    parser.add_argument('--department', action='append', help="Only staff from this department (repeatable)")
+    parser.add_argument('--exclude', action='append', default=[], help="Employee id to leave out (repeatable)")
+    parser.add_argument('--max-size', type=int, help="Largest allowed team")
+    parser.add_argument('--teams', type=int, default=3, help="Number of ranked teams")
+    parser.add_argument('--time-budget', type=float, default=1.0, help="Search time limit in seconds")
+    args = parser.parse_args(argv)
+
+    builder = TeamBuilder(EmployeeDashboardDB(args.db))
+    result = builder.build_teams(dict(map(_requirement, args.require)), args.department, args.max_size,
+                                 args.exclude, args.teams, args.time_budget)
+    print(json.dumps(result, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+"""
+Multi-Tenant Shard Router
+Maps tenant ids to one SQLite file per tenant:
+- A hot tenant only ever locks its own file
+- Bounded LRU of open `EmployeeDashboardDB` handles, closed on eviction
+- Cross-tenant admin queries (statistics, search, leaderboards) fan out
+  across shards in parallel and merge the results
+"""
+
+import heapq
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, List
+
+from employee_data_manager import EmployeeDashboardDB
+from leaderboards import Leaderboards
+
+# Tenant ids become file names, so only a safe character set is accepted
+TENANT_ID_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$')
+
+SHARD_SUFFIX = '.db'
+
+class _Shard:
+    __slots__ = ('db', 'pins', 'lock', '_leaderboards')
+
+    def __init__(self, db: EmployeeDashboardDB):
+        self.db = db
+        self.pins = 0
+        self.lock = threading.Lock()
+        self._leaderboards = None
+
+    def leaderboards(self) -> Leaderboards:
+        with self.lock:
+            if self._leaderboards is None:
+                self._leaderboards = Leaderboards(self.db)
+            return self._leaderboards
+
+class TenantRouter:
+    def __init__(self, shard_dir: str, max_open: int = 32, max_workers: int = 8, db_options: Dict = None):
+        """
+        Shards live in `shard_dir` as `<tenant_id>.db`. At most `max_open`
+        handles stay open; handles in use are never evicted, so the cache
+        can briefly exceed the bound under heavy fan-out. `db_options` are
+        passed to every `EmployeeDashboardDB`.
+        """
+        self.shard_dir = shard_dir
+        self.max_open = max_open
+        self.db_options = db_options or {}
+        os.makedirs(shard_dir, exist_ok=True)
+
+        self._shards = OrderedDict()  # tenant id -> _Shard
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='tenant-fan-out')
+        self._stats = {'hits': 0, 'opens': 0, 'evictions': 0}
+
+    def shard_path(self, tenant_id: str) -> str:
+        """Database file of a tenant"""
+        if not TENANT_ID_PATTERN.match(tenant_id or ''):
+            raise ValueError(f"Invalid tenant id: {tenant_id!r}")
+        return os.path.join(self.shard_dir, tenant_id + SHARD_SUFFIX)
+
+    def tenants(self) -> List[str]:
+        """Tenant ids with a shard file, sorted"""
+        return sorted(
+            name[:-len(SHARD_SUFFIX)] for name in os.listdir(self.shard_dir)
+            if name.endswith(SHARD_SUFFIX) and TENANT_ID_PATTERN.match(name[:-len(SHARD_SUFFIX)])
+        )
+
+    @contextmanager
+    def tenant(self, tenant_id: str):
+        """Yield the tenant's database handle, pinned open for the block"""
+        shard = self._acquire(tenant_id)
+        try:
+            yield shard.db
+        finally:
+            self._release(shard)
+
+    def fan_out(self, query: Callable[[EmployeeDashboardDB], object], tenant_ids: List[str] = None) -> Dict:
+        """Run `query(db)` on every shard in parallel.
+
+        Returns {tenant_id: result}; a shard whose query raised maps to the
+        exception instead, so one broken shard does not fail the whole query.
+        """
+        return self._fan_out(lambda shard: query(shard.db), tenant_ids)
+
+    def _fan_out(self, query: Callable[[_Shard], object], tenant_ids: List[str] = None) -> Dict:
+        tenant_ids = self.tenants() if tenant_ids is None else list(tenant_ids)
+
+        def run(tenant_id):
+            shard = self._acquire(tenant_id)
+            try:
+                return query(shard)
+            finally:
+                self._release(shard)
+
+        futures = {tenant_id: self._executor.submit(run, tenant_id) for tenant_id in tenant_ids}
+        results = {}
+        for tenant_id, future in futures.items():
+            try:
+                results[tenant_id] = future.result()
+            except Exception as e:
+                results[tenant_id] = e
+        return results
+
+    def statistics(self, tenant_ids: List[str] = None) -> Dict:
+        """Org statistics across tenants, plus each tenant's own statistics"""
+        rollups = self.fan_out(lambda db: db.get_statistics_rollups(), tenant_ids)
+        dept_rows = []
+        histogram_rows = []
+        per_tenant = {}
+        for tenant_id, result in self._succeeded(rollups).items():
+            dept_rows.extend(result[0])
+            histogram_rows.extend(result[1])
+            per_tenant[tenant_id] = EmployeeDashboardDB.summarize_statistics(*result)
+
+        merged = EmployeeDashboardDB.summarize_statistics(dept_rows, histogram_rows)
+        merged['tenants'] = per_tenant
+        merged['errors'] = self._errors(rollups)
+        return merged
+
+    def search(self, search_term: str = None, department: str = None, tenant_ids: List[str] = None,
+               limit: int = None) -> Dict:
+        """Employee search across tenants, merged and ordered by name"""
+        results = self.fan_out(lambda db: db.search_employees(search_term, department), tenant_ids)
+        employees = [
+            dict(employee, tenant_id=tenant_id)
+            for tenant_id, rows in self._succeeded(results).items() for employee in rows
+        ]
+        employees.sort(key=lambda employee: (employee['name'], employee['tenant_id']))
+        return {
+            'employees': employees[:limit] if limit is not None else employees,
+            'total': len(employees),
+            'errors': self._errors(results)
+        }
+
+    def leaderboard(self, limit: int = 10, department: str = None, skill: str = None,
+                    tenant_ids: List[str] = None) -> Dict:
+        """Top employees across tenants by competency score, or by level in `skill`.
+
+        Each shard returns its own top `limit`, so the merge only looks at
+        `limit` entries per tenant.
+        """
+        def top(shard):
+            boards = shard.leaderboards()
+            if skill:
+                return boards.top_by_skill(skill, limit, department)
+            return boards.top_employees(limit, department)
+
+        results = self._fan_out(top, tenant_ids)
+        score_key = 'current_level' if skill else 'overall_score'
+        candidates = [
+            dict(entry, tenant_id=tenant_id)
+            for tenant_id, entries in self._succeeded(results).items() for entry in entries
+        ]
+        leaders = heapq.nsmallest(
+            limit, candidates, key=lambda entry: (-entry[score_key], entry['tenant_id'], entry['employee_id'])
+        )
+
+        rank = 0
+        previous = None
+        for place, entry in enumerate(leaders, 1):
+            if entry[score_key] != previous:
+                rank = place
+                previous = entry[score_key]
+            entry['rank'] = rank
+        return {'leaders': leaders, 'errors': self._errors(results)}
+
+    def stats(self) -> Dict:
+        """Handle cache counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['open'] = len(self._shards)
+        return stats
+
+    def close(self):
+        """Close every open handle and stop the fan-out pool"""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            shards = list(self._shards.values())
+            self._shards.clear()
+        for shard in shards:
+            shard.db.close()
+
+    def _acquire(self, tenant_id: str) -> _Shard:
+        path = self.shard_path(tenant_id)
+        with self._lock:
+            shard = self._shards.get(tenant_id)
+            if shard is not None:
+                self._shards.move_to_end(tenant_id)
+                shard.pins += 1
+                self._stats['hits'] += 1
+                return shard
+
+        # Opening runs schema setup, so it happens outside the lock; if two
+        # threads race, the first handle registered wins.
+        db = EmployeeDashboardDB(path, **self.db_options)
+        with self._lock:
+            shard = self._shards.get(tenant_id)
+            if shard is None:
+                shard = self._shards[tenant_id] = _Shard(db)
+                self._stats['opens'] += 1
+                db = None
+            shard.pins += 1
+            evicted = self._evict()
+        if db is not None:
+            db.close()
+        for stale in evicted:
+            stale.db.close()
+        return shard
+
+    def _release(self, shard: _Shard):
+        with self._lock:
+            shard.pins -= 1
+            evicted = self._evict()
+        for stale in evicted:
+            stale.db.close()
+
+    def _evict(self) -> List[_Shard]:
+        # Called with the lock held; least recently used unpinned handles go first
+        evicted = []
+        excess = len(self._shards) - self.max_open
+        for tenant_id in list(self._shards):
+            if excess <= 0:
+                break
+            if self._shards[tenant_id].pins == 0:
+                evicted.append(self._shards.pop(tenant_id))
+                self._stats['evictions'] += 1
+                excess -= 1
+        return evicted
+
+    def _succeeded(self, results: Dict) -> Dict:
+        return {tenant_id: result for tenant_id, result in results.items() if not isinstance(result, Exception)}
+
+    def _errors(self, results: Dict) -> Dict[str, str]:
+        return {tenant_id: str(result) for tenant_id, result in results.items() if isinstance(result, Exception)}
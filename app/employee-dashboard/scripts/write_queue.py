@@ -0,0 +1,175 @@
+"""
+Write-Behind Queue with Group Commit
+Funnels database writes from many threads through a single writer thread:
+- Callers submit operations and get a Future with the outcome
+- Queued operations are coalesced into one transaction (group commit)
+- Each operation runs in its own savepoint, so one failure never sinks the batch
+- Configurable batch size and latency bound
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+class WriteOperation:
+    __slots__ = ('operation', 'tables', 'employee_id', 'future')
+
+    def __init__(self, operation: Callable[[sqlite3.Cursor], object], tables: Iterable[str],
+                 employee_id: str = None):
+        self.operation = operation
+        # A list is kept as is: the operation may add tables it wrote
+        self.tables = tables if isinstance(tables, list) else tuple(tables)
+        self.employee_id = employee_id
+        self.future = Future()
+
+class WriteBehindQueue:
+    _STOP = object()
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection], batch_size: int = 64,
+                 max_latency: float = 0.005, on_commit: Callable[[List[WriteOperation]], None] = None):
+        """
+        `connect` opens the writer's connection, `batch_size` caps the number
+        of operations per transaction and `max_latency` is how long (seconds)
+        the writer waits for more operations after the first one arrives.
+        `on_commit` is called with the successful operations after each
+        commit and before their futures resolve. It runs on the writer
+        thread, as do callbacks added to the returned futures: they may
+        submit more writes but must not wait for one (`.result()`), since
+        the writer cannot run it until they return.
+        """
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self._connect = connect
+        self._on_commit = on_commit
+        self._queue = queue.Queue()
+        self._stats = {'operations': 0, 'failed': 0, 'batches': 0, 'largest_batch': 0}
+        self._closed = False
+        # Makes the closed check and the put atomic, so nothing lands behind _STOP
+        self._submit_lock = threading.Lock()
+
+        self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+        self._thread.start()
+
+    def submit(self, operation: Callable[[sqlite3.Cursor], object], tables: Iterable[str] = (),
+               employee_id: str = None) -> Future:
+        """Queue `operation(cursor)` and return a Future for its return value"""
+        write = WriteOperation(operation, tables, employee_id)
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError("Write queue is closed")
+            self._queue.put(write)
+        return write.future
+
+    def close(self, wait: bool = True):
+        """Stop accepting writes, flush the queue and stop the writer thread"""
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(self._STOP)
+        if wait:
+            self._thread.join()
+
+    def stats(self) -> Dict:
+        """Operation, batch and failure counters"""
+        stats = dict(self._stats)
+        stats['pending'] = self._queue.qsize()
+        stats['average_batch'] = round(stats['operations'] / stats['batches'], 2) if stats['batches'] else 0
+        return stats
+
+    def _run(self):
+        try:
+            conn = self._connect()
+            conn.isolation_level = None  # transactions are managed explicitly below
+            try:
+                while True:
+                    batch, stop = self._next_batch()
+                    if batch:
+                        self._commit_batch(conn, batch)
+                    if stop:
+                        break
+            finally:
+                conn.close()
+        finally:
+            self._fail_pending()
+
+    def _fail_pending(self):
+        # Nothing is queued behind _STOP; this only matters if the writer died
+        with self._submit_lock:
+            self._closed = True
+        while True:
+            try:
+                write = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if write is not self._STOP:
+                write.future.set_exception(RuntimeError("Write queue is closed"))
+
+    def _next_batch(self):
+        first = self._queue.get()
+        if first is self._STOP:
+            return [], True
+
+        batch = [first]
+        deadline = time.monotonic() + self.max_latency
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                write = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if write is self._STOP:
+                return batch, True
+            batch.append(write)
+        return batch, False
+
+    def _commit_batch(self, conn: sqlite3.Connection, batch: List[WriteOperation]):
+        cursor = conn.cursor()
+        outcomes = []
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            for write in batch:
+                cursor.execute('SAVEPOINT write_op')
+                try:
+                    result = write.operation(cursor)
+                except Exception as e:
+                    cursor.execute('ROLLBACK TO write_op')
+                    cursor.execute('RELEASE write_op')
+                    outcomes.append((write, False, e))
+                else:
+                    cursor.execute('RELEASE write_op')
+                    outcomes.append((write, True, result))
+            cursor.execute('COMMIT')
+        except Exception as e:
+            # BEGIN or COMMIT failed (e.g. still locked after the busy timeout):
+            # nothing in this batch was written.
+            if conn.in_transaction:
+                conn.rollback()
+            self._stats['failed'] += len(batch)
+            for write in batch:
+                write.future.set_exception(e)
+            return
+
+        succeeded = [write for write, ok, _ in outcomes if ok]
+        self._stats['operations'] += len(batch)
+        self._stats['failed'] += len(batch) - len(succeeded)
+        self._stats['batches'] += 1
+        self._stats['largest_batch'] = max(self._stats['largest_batch'], len(batch))
+
+        if succeeded and self._on_commit is not None:
+            try:
+                self._on_commit(succeeded)
+            except Exception as e:
+                logger.exception("Write hook failed after commit: %s", e)
+
+        for write, ok, value in outcomes:
+            if ok:
+                write.future.set_result(value)
+            else:
+                write.future.set_exception(value)